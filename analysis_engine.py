@@ -0,0 +1,650 @@
+"""
+Analysis Engine - Single-Pass Textanalyse
+Tokenisiert einen Text genau einmal und berechnet alle Kennzahlen
+von analyze_text und /analyze in einem gemeinsamen Durchlauf
+"""
+
+import codecs
+import hashlib
+import heapq
+import os
+import re
+import struct
+import sys
+import zlib
+from array import array
+from collections import Counter, OrderedDict
+from functools import partial
+from itertools import accumulate
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from functional_utils import timed
+from length_backend import USE_NUMPY, length_array, longest_position, shortest_position, sum_lengths
+from normalizer import DEFAULT_NORMALIZER, PUNCTUATION  # noqa: F401 (PUNCTUATION bleibt hier importierbar)
+from token_index import TokenIndex
+
+
+# Zeichen, die count_sentences als Satzende zählt
+SENTENCE_ENDINGS = '.!?'
+
+# Blockgrösse beim Lesen aus Dateien und Request-Streams
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# Binärformat der Teilergebnisse: Kopf mit allen Zählern, danach ein
+# zlib-komprimierter Block mit Wortlängen, Häufigkeiten und Wörtern (UTF-8)
+PARTIAL_MAGIC = b'TAP1'
+_PARTIAL_HEADER = struct.Struct('<4sqQQQQQQQI')
+
+# Obergrenze für die entpackten Bytes aller Teilergebnisse eines Requests
+# (die Frames kommen ungeprüft von Clients, zlib entpackt bis Faktor ~1000)
+MAX_PARTIAL_BYTES = int(os.environ.get('TEXT_ANALYZER_MAX_PARTIAL_BYTES', 64 * 1024 * 1024))
+
+# Höchstens so viele UTF-8-Bytes entstehen aus einem Zeichen durch die
+# Normalisierung (U+FDFA unter NFKC: 33 Bytes); roh sind es höchstens 4
+_NORMALIZED_BYTES_PER_CHARACTER = 33
+
+_WHITESPACE = re.compile(r'\s')
+
+_encode_utf8 = partial(str.encode, encoding='utf-8', errors='surrogatepass')
+
+
+# ============================================================================
+# Tokenisierung
+# ============================================================================
+
+@timed('tokenize')
+def tokenize(text: str) -> List[str]:
+    """
+    Zerlegt den Text einmal in Wörter (gleiche Semantik wie text.split())
+    Die Token-Tabelle wird von allen Statistiken gemeinsam verwendet
+    """
+    return text.split()
+
+
+def normalize_word(word: str) -> str:
+    """
+    Normalisiert ein Wort für die Frequenzanalyse
+    Standard: text.lower().split() + strip der Satzzeichen (siehe normalizer)
+    """
+    return DEFAULT_NORMALIZER.normalize(word)
+
+
+# ============================================================================
+# Frequenz-Backend: Counter + partielle Auswahl
+# ============================================================================
+
+@timed('count_frequencies')
+def count_frequencies(words: Iterable[str], counter: Optional[Counter] = None) -> Counter:
+    """
+    Zählt normalisierte Wörter mit collections.Counter
+    Die Normalisierung (DEFAULT_NORMALIZER) läuft über map mit str-Methoden
+    und das Zählen in C, es gibt keinen Python-Aufruf pro Wort
+    """
+    if counter is None:
+        counter = Counter()
+    counter.update(DEFAULT_NORMALIZER.normalize_words(words))
+    return counter
+
+
+@timed('top_items')
+def top_items(frequencies: Dict[str, int], top_n: int) -> List[tuple]:
+    """
+    Top N Einträge nach Häufigkeit ohne das ganze Vokabular zu sortieren
+    heapq.nlargest ist stabil wie sorted(): bei gleicher Häufigkeit gewinnt
+    das frühere Vorkommen im Text. Die Einfügereihenfolge eines dict hängt
+    nicht vom Hash-Seed ab, das Ergebnis ist also über Läufe und Worker
+    hinweg deterministisch.
+    """
+    if top_n < 0 or top_n >= len(frequencies):
+        return sorted(frequencies.items(), key=itemgetter(1), reverse=True)[:top_n]
+    return heapq.nlargest(top_n, frequencies.items(), key=itemgetter(1))
+
+
+# ============================================================================
+# Streaming: Chunks statt ganzem Text
+# ============================================================================
+
+def _read_chunks(stream: Any, chunk_size: int) -> Iterator[Any]:
+    """
+    Liest ein Datei-Objekt blockweise bis zum Ende
+    """
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_text_chunks(source: Any, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     encoding: str = 'utf-8') -> Iterator[str]:
+    """
+    Liefert Text-Chunks aus einem String, einem Datei-Objekt (.read)
+    oder einem Iterable von str/bytes
+    Bytes werden inkrementell dekodiert, auch wenn ein Multibyte-Zeichen
+    über eine Chunk-Grenze geht
+    """
+    if isinstance(source, str):
+        if source:
+            yield source
+        return
+
+    if hasattr(source, 'read'):
+        chunks = _read_chunks(source, chunk_size)
+    else:
+        chunks = iter(source)
+
+    decoder = None
+    for chunk in chunks:
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder(encoding)()
+            chunk = decoder.decode(chunk)
+        if chunk:
+            yield chunk
+
+    if decoder is not None:
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+
+
+def iter_word_batches(chunks: Iterable[str]) -> Iterator[List[str]]:
+    """
+    Zerlegt Chunks in Wörter, ohne Wörter an Chunk-Grenzen zu zerschneiden
+    Endet ein Chunk mitten in einem Wort, wird der Rest zurückgehalten und
+    mit dem nächsten Chunk zusammengesetzt. Im Speicher liegt so nie mehr
+    als ein Chunk plus ein angefangenes Wort.
+    """
+    carry = ''
+    for chunk in chunks:
+        data = carry + chunk if carry else chunk
+        words = data.split()
+        if words and not data[-1].isspace():
+            carry = words.pop()
+        else:
+            carry = ''
+        if words:
+            yield words
+    if carry:
+        yield [carry]
+
+
+# ============================================================================
+# Akkumulator für alle Kennzahlen
+# ============================================================================
+
+class TextStatistics:
+    """
+    Sammelt alle Kennzahlen einer Textanalyse
+    Zeichen und Wörter werden separat übergeben, jede Statistik wird
+    im selben Durchlauf über die Token-Tabelle nachgeführt
+    """
+
+    def __init__(self, min_length: int = 5, track_frequencies: bool = True):
+        self.min_length = min_length
+        # False: Frequenz-Tabelle wird nicht aufgebaut (nicht angefragt, siehe fields)
+        self.track_frequencies = track_frequencies
+        self.word_count = 0
+        self.character_count = 0
+        self.space_count = 0
+        self.sentence_marks = 0
+        self.total_length = 0
+        self.long_words_length = 0
+        self.longest_word = ""
+        self.shortest_word = ""
+        self.frequencies: Counter = Counter()
+
+    def add_characters(self, text: str) -> None:
+        """
+        Zählt Zeichen, Leerzeichen und Satzenden eines Textabschnitts
+        str.count läuft in C und braucht keine Python-Schleife pro Zeichen
+        """
+        self.character_count += len(text)
+        self.space_count += text.count(' ')
+        self.sentence_marks += sum(text.count(mark) for mark in SENTENCE_ENDINGS)
+
+    def add_words(self, words: Iterable[str]) -> None:
+        """
+        Wertet eine Token-Tabelle für alle wortbasierten Kennzahlen aus
+        Jeder Schritt läuft in C (map, sum, max, Counter) über dieselbe Liste.
+        Längstes/kürzestes Wort: erstes Vorkommen gewinnt (wie max/min mit key=len)
+        """
+        if not isinstance(words, list):
+            words = list(words)
+        if not words:
+            return
+
+        if USE_NUMPY:
+            lengths = length_array(words)
+            longest = words[longest_position(lengths)]
+            shortest = words[shortest_position(lengths)]
+        else:
+            lengths = list(map(len, words))
+            longest = max(words, key=len)
+            shortest = min(words, key=len)
+        if not self.word_count or len(longest) > len(self.longest_word):
+            self.longest_word = longest
+        if not self.word_count or len(shortest) < len(self.shortest_word):
+            self.shortest_word = shortest
+
+        self.word_count += len(words)
+        self.total_length += sum_lengths(lengths)
+        self.long_words_length += sum_lengths(lengths, self.min_length)
+        self._count_words(words)
+
+    def _count_words(self, words: List[str]) -> None:
+        # Erweiterungspunkt: sketches.ApproximateStatistics zählt näherungsweise
+        if self.track_frequencies:
+            count_frequencies(words, self.frequencies)
+
+    def analysis(self) -> Dict:
+        """
+        Liefert exakt das Dictionary von analyze_text
+        """
+        if self.word_count:
+            average = self.total_length / self.word_count
+            sentence_count = max(1, self.sentence_marks)
+        else:
+            average = 0.0
+            sentence_count = 0
+        return {
+            'word_count': self.word_count,
+            'character_count': self.character_count,
+            'character_count_no_spaces': self.character_count - self.space_count,
+            'sentence_count': sentence_count,
+            'average_word_length': round(average, 2),
+            'longest_word': self.longest_word,
+            'shortest_word': self.shortest_word
+        }
+
+    def top_words(self, top_n: int = 5) -> List[tuple]:
+        """
+        Top N häufigste Wörter - gleiche Reihenfolge wie get_top_words
+        """
+        return top_items(self.frequencies, top_n)
+
+    # ------------------------------------------------------------------------
+    # Teilergebnisse: zusammenführen, kodieren, abschliessen
+    # ------------------------------------------------------------------------
+
+    def merge(self, other: 'TextStatistics') -> 'TextStatistics':
+        """
+        Führt zwei Teilergebnisse zu einem neuen zusammen (Eingaben bleiben unverändert)
+        self muss den Text vor other abdecken: merge ist assoziativ, aber nicht
+        kommutativ, weil bei gleicher Länge bzw. Häufigkeit das frühere Vorkommen
+        gewinnt. Teiltexte müssen an Leerraum getrennt sein (siehe split_shards).
+        """
+        merged = self.copy()
+        merged.absorb(other)
+        return merged
+
+    def absorb(self, other: 'TextStatistics') -> None:
+        """In-place-Variante von merge für Reduktionen"""
+        if other.min_length != self.min_length:
+            raise ValueError('Teilergebnisse mit verschiedener min_length')
+        if other.word_count:
+            if not self.word_count or len(other.longest_word) > len(self.longest_word):
+                self.longest_word = other.longest_word
+            if not self.word_count or len(other.shortest_word) < len(self.shortest_word):
+                self.shortest_word = other.shortest_word
+        self.word_count += other.word_count
+        self.character_count += other.character_count
+        self.space_count += other.space_count
+        self.sentence_marks += other.sentence_marks
+        self.total_length += other.total_length
+        self.long_words_length += other.long_words_length
+        # Counter.update behält die Reihenfolge des ersten Vorkommens
+        self.frequencies.update(other.frequencies)
+
+    def copy(self) -> 'TextStatistics':
+        duplicate = TextStatistics(self.min_length)
+        duplicate.__dict__.update(self.__dict__)
+        duplicate.frequencies = Counter(self.frequencies)
+        return duplicate
+
+    def finalize(self, top_n: int = 5) -> Dict:
+        """
+        Endergebnis: exakt analyze_text(text) und get_top_words(text, top_n)
+        """
+        return {
+            'analysis': self.analysis(),
+            'top_words': self.top_words(top_n)
+        }
+
+    def to_bytes(self) -> bytes:
+        """
+        Kompakte Binärkodierung, Frames lassen sich aneinanderhängen
+        """
+        strings = [self.longest_word, self.shortest_word, *self.frequencies]
+        encoded = list(map(_encode_utf8, strings))
+        lengths = array('Q', map(len, encoded))
+        counts = array('Q', self.frequencies.values())
+        if sys.byteorder == 'big':
+            lengths.byteswap()
+            counts.byteswap()
+        body = zlib.compress(lengths.tobytes() + counts.tobytes() + b''.join(encoded))
+        header = _PARTIAL_HEADER.pack(
+            PARTIAL_MAGIC, self.min_length, self.word_count, self.character_count,
+            self.space_count, self.sentence_marks, self.total_length,
+            self.long_words_length, len(counts), len(body)
+        )
+        return header + body
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'TextStatistics':
+        """Dekodiert genau einen Frame von to_bytes"""
+        statistics, end, _ = cls._decode(memoryview(data), 0, MAX_PARTIAL_BYTES)
+        if end != len(data):
+            raise ValueError('Überzählige Bytes nach dem Teilergebnis')
+        return statistics
+
+    @classmethod
+    def _decode(cls, data: memoryview, offset: int, limit: int) -> tuple:
+        """
+        (TextStatistics, Ende des Frames, entpackte Bytes)
+        Entpackt höchstens so viel, wie der Kopf zulässt (Zähler-Arrays plus
+        Wörter aus höchstens character_count Zeichen), und nie mehr als `limit`
+        """
+        try:
+            (magic, min_length, word_count, character_count, space_count, sentence_marks,
+             total_length, long_words_length, entries, body_size) = _PARTIAL_HEADER.unpack_from(data, offset)
+        except struct.error:
+            raise ValueError('Unvollständiges Teilergebnis') from None
+        if magic != PARTIAL_MAGIC:
+            raise ValueError('Kein Analyse-Teilergebnis')
+        start = offset + _PARTIAL_HEADER.size
+        end = start + body_size
+        if end > len(data):
+            raise ValueError('Unvollständiges Teilergebnis')
+        expected = 8 * (2 * entries + 2) + (2 * 4 + _NORMALIZED_BYTES_PER_CHARACTER) * character_count
+        decompressor = zlib.decompressobj()
+        try:
+            body = decompressor.decompress(data[start:end], min(expected, limit) + 1)
+        except zlib.error:
+            raise ValueError('Beschädigtes Teilergebnis') from None
+        if len(body) > limit:
+            raise ValueError('Teilergebnisse grösser als %d Bytes (entpackt)' % MAX_PARTIAL_BYTES)
+        if len(body) > expected or decompressor.unconsumed_tail:
+            raise ValueError('Teilergebnis grösser als sein Kopf zulässt')
+        if not decompressor.eof or decompressor.unused_data:
+            raise ValueError('Beschädigtes Teilergebnis')
+
+        lengths = array('Q')
+        counts = array('Q')
+        lengths.frombytes(body[:8 * (entries + 2)])
+        counts.frombytes(body[8 * (entries + 2):8 * (2 * entries + 2)])
+        if sys.byteorder == 'big':
+            lengths.byteswap()
+            counts.byteswap()
+        blob = body[8 * (2 * entries + 2):]
+        bounds = list(accumulate(lengths, initial=0))
+        if len(lengths) != entries + 2 or len(counts) != entries or bounds[-1] != len(blob):
+            raise ValueError('Beschädigtes Teilergebnis')
+        strings = [blob[bounds[i]:bounds[i + 1]].decode('utf-8', 'surrogatepass')
+                   for i in range(len(lengths))]
+
+        statistics = cls(min_length)
+        statistics.word_count = word_count
+        statistics.character_count = character_count
+        statistics.space_count = space_count
+        statistics.sentence_marks = sentence_marks
+        statistics.total_length = total_length
+        statistics.long_words_length = long_words_length
+        statistics.longest_word, statistics.shortest_word = strings[0], strings[1]
+        statistics.frequencies = Counter(dict(zip(strings[2:], counts)))
+        return statistics, end, len(body)
+
+
+# ============================================================================
+# Öffentliche Einstiegspunkte
+# ============================================================================
+
+def compute_statistics(text: str, min_length: int = 5,
+                       track_frequencies: bool = True) -> TextStatistics:
+    """
+    Tokenisiert den Text einmal und füllt einen TextStatistics-Akkumulator
+    """
+    statistics = TextStatistics(min_length, track_frequencies)
+    statistics.add_characters(text)
+    statistics.add_words(tokenize(text))
+    return statistics
+
+
+def stream_statistics(source: Any, min_length: int = 5,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      statistics: Optional[TextStatistics] = None) -> TextStatistics:
+    """
+    Wie compute_statistics, aber für Chunk-Iterables und Datei-Objekte
+    Speicherbedarf wächst mit dem Vokabular, nicht mit der Eingabegrösse
+    statistics: vorbereiteter (leerer) Akkumulator, sonst TextStatistics(min_length)
+    """
+    if statistics is None:
+        statistics = TextStatistics(min_length)
+
+    def counted(chunks: Iterable[str]) -> Iterator[str]:
+        for chunk in chunks:
+            statistics.add_characters(chunk)
+            yield chunk
+
+    for words in iter_word_batches(counted(iter_text_chunks(source, chunk_size))):
+        statistics.add_words(words)
+    return statistics
+
+
+def split_shards(text: str, count: int) -> List[str]:
+    """
+    Teilt einen Text in bis zu `count` Teile, geschnitten nur an Leerraum
+    Die Teile ergeben aneinandergehängt wieder den Text, kein Wort wird getrennt
+    """
+    shards = []
+    start = 0
+    for i in range(1, count):
+        match = _WHITESPACE.search(text, max(start, len(text) * i // count))
+        if match is None:
+            break
+        shards.append(text[start:match.start()])
+        start = match.start()
+    shards.append(text[start:])
+    return [shard for shard in shards if shard]
+
+
+def merge_statistics(parts: Iterable[TextStatistics], min_length: int = 5) -> TextStatistics:
+    """
+    Baum-Reduktion über Teilergebnisse in Textreihenfolge
+    Benachbarte Paare werden zusammengeführt, bis eines übrig bleibt
+    """
+    level = list(parts)
+    if not level:
+        return TextStatistics(min_length)
+    if len(level) == 1:
+        return level[0].copy()
+    first_level = True
+    while len(level) > 1:
+        merged = []
+        for i in range(0, len(level) - 1, 2):
+            # Auf der ersten Ebene kopieren, damit die Eingaben unverändert bleiben
+            left = level[i].copy() if first_level else level[i]
+            left.absorb(level[i + 1])
+            merged.append(left)
+        if len(level) % 2:
+            merged.append(level[-1])
+        level = merged
+        first_level = False
+    return level[0]
+
+
+def iter_partials(data: bytes) -> Iterator[TextStatistics]:
+    """
+    Dekodiert aneinandergehängte Frames von TextStatistics.to_bytes
+    Alle Frames zusammen entpacken höchstens MAX_PARTIAL_BYTES (ValueError)
+    """
+    view = memoryview(data)
+    offset = 0
+    remaining = MAX_PARTIAL_BYTES
+    while offset < len(view):
+        statistics, offset, size = TextStatistics._decode(view, offset, remaining)
+        remaining -= size
+        yield statistics
+
+
+def complete_result(statistics: TextStatistics, top_n: int = 5) -> Dict:
+    """
+    Baut das Ergebnis-Dictionary des /analyze-Endpoints aus einem Akkumulator
+    """
+    return {
+        'analysis': statistics.analysis(),
+        'word_frequencies': dict(statistics.top_words(top_n)),
+        'total_word_length': statistics.total_length,
+        'long_words_count': statistics.long_words_length
+    }
+
+
+def analyze_complete(text: str, top_n: int = 5, min_length: int = 5) -> Dict:
+    """
+    Alle Kennzahlen des /analyze-Endpoints aus einem einzigen Durchlauf
+    Ersetzt analyze_text, get_top_words, calculate_total_word_length_reduce
+    und count_long_words_combined, die den Text jeweils neu zerlegen
+    """
+    return complete_result(compute_statistics(text, min_length), top_n)
+
+
+def analyze_complete_stream(source: Any, top_n: int = 5, min_length: int = 5,
+                            chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict:
+    """
+    Streaming-Variante von analyze_complete für beliebig grosse Eingaben
+    """
+    return complete_result(stream_statistics(source, min_length, chunk_size), top_n)
+
+
+# ============================================================================
+# Gemeinsame Zerlegung für mehrere Auswertungen desselben Texts
+# ============================================================================
+
+class SharedText:
+    """
+    Ein Text, einmal zerlegt, für viele Auswertungen (/analyze/all)
+    Wortliste, Frequenz-Tabelle, TokenIndex und Kennzahlen entstehen beim
+    ersten Zugriff und werden danach geteilt; call() merkt sich zusätzlich
+    Ergebnisse beliebiger Funktionen pro Argumentliste.
+    Die gelieferten Objekte sind geteilt und dürfen nicht verändert werden.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self._words: Optional[List[str]] = None
+        self._frequencies: Optional[Counter] = None
+        self._index = None
+        self._statistics: Dict[int, TextStatistics] = {}
+        self._results: Dict[tuple, Any] = {}
+
+    def words(self) -> List[str]:
+        """text.split(), einmal"""
+        if self._words is None:
+            self._words = self.text.split()
+        return self._words
+
+    def frequencies(self) -> Counter:
+        """Frequenz-Tabelle wie analyze_word_frequencies(text)"""
+        if self._frequencies is None:
+            self._frequencies = count_frequencies(self.words())
+        return self._frequencies
+
+    def top_words(self, top_n: int = 5) -> List[tuple]:
+        """Wie get_top_words(text, top_n)"""
+        return top_items(self.frequencies(), top_n)
+
+    def index(self) -> TokenIndex:
+        """TokenIndex aus der vorhandenen Wortliste"""
+        if self._index is None:
+            self._index = TokenIndex(self.text, self.words())
+        return self._index
+
+    def statistics(self, min_length: int = 5) -> TextStatistics:
+        """Wie compute_statistics(text, min_length), Frequenzen aus der geteilten Tabelle"""
+        statistics = self._statistics.get(min_length)
+        if statistics is None:
+            statistics = TextStatistics(min_length, track_frequencies=False)
+            statistics.add_characters(self.text)
+            statistics.add_words(self.words())
+            statistics.frequencies = self.frequencies()
+            self._statistics[min_length] = statistics
+        return statistics
+
+    def call(self, func: Callable, *args: Any) -> Any:
+        """func(*args), pro Funktion und (hashbaren) Argumenten nur einmal ausgeführt"""
+        key = (func,) + args
+        if key not in self._results:
+            self._results[key] = func(*args)
+        return self._results[key]
+
+
+# ============================================================================
+# Batch-Analyse vieler Dokumente
+# ============================================================================
+
+# Ergebnisse so vieler verschiedener Dokumente hält ein Batch für Duplikate bereit
+BATCH_DEDUP_ENTRIES = int(os.environ.get('TEXT_ANALYZER_BATCH_DEDUP_ENTRIES', 128))
+
+
+def document_digest(text: str) -> bytes:
+    """Schlüssel für identische Dokumente eines Batches"""
+    return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+class BatchAnalysis:
+    """
+    Analysiert viele Dokumente mit gemeinsamer Arbeit
+    - identische Dokumente werden nur einmal zerlegt (Digest als Schlüssel);
+      gehalten werden die Ergebnisse der letzten BATCH_DEDUP_ENTRIES
+      verschiedenen Dokumente (LRU), von allen übrigen nur der Digest -
+      der Speicher wächst so nicht mit der Grösse des Batches
+    - die Frequenz-Tabellen aller Dokumente werden zu einem Korpus-Histogramm
+      zusammengeführt (Counter.update, Reihenfolge des ersten Vorkommens)
+    """
+
+    def __init__(self, top_n: int = 5, min_length: int = 5):
+        self.top_n = top_n
+        self.min_length = min_length
+        self.document_count = 0
+        self.word_count = 0
+        self.corpus_frequencies: Counter = Counter()
+        self._results: 'OrderedDict[bytes, tuple]' = OrderedDict()
+        self._seen = set()
+
+    def analyze(self, text: str) -> Dict:
+        """
+        Ergebnis wie analyze_complete für ein einzelnes Dokument
+        """
+        key = document_digest(text)
+        entry = self._results.get(key)
+        if entry is None:
+            statistics = compute_statistics(text, self.min_length)
+            entry = (complete_result(statistics, self.top_n), statistics.frequencies)
+            self._results[key] = entry
+            self._seen.add(key)
+            if len(self._results) > BATCH_DEDUP_ENTRIES:
+                self._results.popitem(last=False)
+        else:
+            self._results.move_to_end(key)
+        result, frequencies = entry
+        self.document_count += 1
+        self.word_count += result['analysis']['word_count']
+        self.corpus_frequencies.update(frequencies)
+        return result
+
+    def aggregate(self, top_n: Optional[int] = None) -> Dict:
+        """
+        Korpus-Kennzahlen über alle bisher analysierten Dokumente
+        Ohne top_n wird die vollständige Frequenz-Tabelle geliefert
+        """
+        if top_n is None:
+            frequencies = dict(self.corpus_frequencies)
+        else:
+            frequencies = dict(top_items(self.corpus_frequencies, top_n))
+        return {
+            'documents': self.document_count,
+            'unique_documents': len(self._seen),
+            'word_count': self.word_count,
+            'word_frequencies': frequencies
+        }
@@ -3,40 +3,137 @@ Flask Text Analyzer Application
 Haupt-Applikation für Textanalyse mit funktionaler Programmierung
 """
 
-from flask import Flask, render_template, request, jsonify
+import json
+import os
+import time
+from collections import OrderedDict
+from functools import partial, wraps
+
+from flask import (
+    Flask,
+    Response,
+    g,
+    render_template,
+    request,
+    jsonify,
+    make_response,
+    stream_with_context
+)
+from flask.json.provider import DefaultJSONProvider
 from text_analyzer import (
     analyze_text,
     count_words,
     count_characters,
     count_sentences,
-    transform_words_map,
-    filter_words_by_length,
     calculate_total_word_length_reduce,
     count_long_words_combined,
     analyze_word_frequencies,
     get_top_words,
-    sort_words_by_criteria,
-    remove_duplicates_sorted,
-    filter_words_with_lambda,
     get_simple_lambda_transformations,
     count_long_words_procedural,
     count_long_words_functional,
     process_text_procedural,
     process_text_functional,
+    build_filter_result,
+    build_transform_result,
     TextProcessor
 )
 from functional_utils import (
     apply_transformations,
-    apply_transformation,
     compose,
     pipe,
     create_text_processor,
     create_word_filter,
     TEXT_TRANSFORMATIONS,
-    get_transformation
+    ALL_FIELDS,
+    METRICS,
+    FieldSelection,
+    Lazy,
+    WordStream,
+    get_transformation,
+    lazy,
+    predicate_stats,
+    sample_metrics,
+    resolve,
+    timed
 )
+from analysis_engine import (
+    BATCH_DEDUP_ENTRIES,
+    BatchAnalysis,
+    SharedText,
+    TextStatistics,
+    compute_statistics,
+    iter_partials,
+    iter_text_chunks,
+    document_digest,
+    merge_statistics,
+    stream_statistics
+)
+from incremental import EditError, SessionStore, apply_edits
+from measurement import BenchmarkBusy, BenchmarkOptions, benchmark_variants
+from sketches import DEFAULT_ERROR, MIN_ERROR, approximate_result
+from result_cache import ResultCache
+from token_index import TokenIndex
+
+
+
+class TextAnalyzerJSONProvider(DefaultJSONProvider):
+    """
+    JSON-Provider, der lazy WordStreams erst bei der Serialisierung auswertet
+    """
+    
+    @staticmethod
+    def default(o):
+        if isinstance(o, WordStream):
+            return o.to_list()
+        return DefaultJSONProvider.default(o)
+
+    # JSON-Serialisierung als eigene Stufe in den Laufzeit-Histogrammen
+    dumps = timed('json_encode')(DefaultJSONProvider.dumps)
+
 
 app = Flask(__name__)
+app.json = TextAnalyzerJSONProvider(app)
+
+# Inhaltsadressierter Cache für alle JSON-POST-Endpoints
+result_cache = ResultCache(
+    max_bytes=int(os.environ.get('TEXT_ANALYZER_CACHE_BYTES', 64 * 1024 * 1024)),
+    directory=os.environ.get('TEXT_ANALYZER_CACHE_DIR') or None,
+    disk_max_bytes=int(os.environ.get('TEXT_ANALYZER_CACHE_DISK_BYTES', 512 * 1024 * 1024))
+)
+
+
+def cached_response(*param_names: str, bypass: str = None):
+    """
+    Decorator: cached die JSON-Antwort eines Endpoints
+    Schlüssel ist ein Hash aus Endpoint, Text und den genannten Parametern.
+    Nur erfolgreiche Antworten (200) werden gespeichert; `fields` gehört
+    immer zum Schlüssel, wenn er angegeben ist.
+    Ist der Parameter `bypass` gesetzt (z.B. Messungen), wird nicht gecached.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            data = request.get_json(silent=True)
+            if not isinstance(data, dict) or not isinstance(data.get('text'), str):
+                return view(*args, **kwargs)
+            if bypass is not None and data.get(bypass):
+                return view(*args, **kwargs)
+            
+            params = {name: data.get(name) for name in param_names}
+            if 'fields' in data:
+                params['fields'] = data['fields']
+            key = ResultCache.make_key(request.path, data['text'], params)
+            cached = result_cache.get(key)
+            if cached is not None:
+                return app.response_class(cached, mimetype='application/json')
+            
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                result_cache.put(key, response.get_data())
+            return response
+        return wrapper
+    return decorator
 
 
 @app.route('/')
@@ -45,11 +142,65 @@ def index():
     return render_template('index.html')
 
 
+def parse_fields(value):
+    """
+    (FieldSelection, Fehlerantwort oder None) aus dem fields-Parameter
+    Liste gepunkteter Pfade oder kommagetrennter String; ohne Angabe alle Felder
+    """
+    try:
+        return FieldSelection.parse(value), None
+    except ValueError as error:
+        return None, (jsonify({'error': str(error)}), 400)
+
+
+def approximation_error(value):
+    """
+    Fehlerparameter für den Näherungsmodus; None bei ungültigem Wert
+    Untergrenze MIN_ERROR: der Speicher der Sketches wächst mit 1/error
+    """
+    if value is None:
+        return DEFAULT_ERROR
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not MIN_ERROR <= value < 1:
+        return None
+    return float(value)
+
+
+def lazy_analysis(statistics: Lazy, top_n: int) -> dict:
+    """Felder von complete_result, jedes erst bei Bedarf aus dem Akkumulator"""
+    return {
+        'analysis': lazy(lambda: statistics().analysis()),
+        'word_frequencies': lazy(lambda: dict(statistics().top_words(top_n))),
+        'total_word_length': lazy(lambda: statistics().total_length),
+        'long_words_count': lazy(lambda: statistics().long_words_length)
+    }
+
+
+def analysis_response(result: dict, fields: FieldSelection = ALL_FIELDS):
+    """JSON-Antwort von /analyze und /analyze/stream (Näherungsfelder nur im Näherungsmodus)"""
+    response = {
+        'success': True,
+        'analysis': result['analysis'],
+        'word_frequencies': result['word_frequencies'],
+        'total_word_length': result['total_word_length'],
+        'long_words_count': result['long_words_count']
+    }
+    if 'approximation' in result:
+        response['word_frequencies_error'] = result['word_frequencies_error']
+        response['approximation'] = result['approximation']
+    return jsonify(fields.project(response))
+
+
 @app.route('/analyze', methods=['POST'])
+@cached_response('approximate', 'error')
 def analyze():
     """
     POST-Endpoint für Textanalyse
     Verwendet funktionale Analyse-Funktionen
+    Optional {"approximate": true, "error": 0.001}: Top-Wörter und Anzahl
+    verschiedener Wörter aus Sketches mit beschränktem Speicher
+    Optional {"fields": ["analysis.word_count", ...]}: nur diese Felder
+    (gilt für alle Text-Endpoints); ohne word_frequencies wird keine
+    Frequenz-Tabelle aufgebaut
     """
     data = request.get_json()
     text = data.get('text', '')
@@ -57,23 +208,63 @@ def analyze():
     if not text.strip():
         return jsonify({'error': 'Bitte geben Sie einen Text ein'}), 400
     
-    # Verwende funktionale Analyse-Funktion
-    analysis = analyze_text(text)
+    fields, error_response = parse_fields(data.get('fields'))
+    if error_response:
+        return error_response
     
-    # Zusätzliche Analysen mit funktionalen Methoden
-    word_frequencies = analyze_word_frequencies(text)
-    top_words = get_top_words(text, top_n=5)
+    if data.get('approximate'):
+        error = approximation_error(data.get('error'))
+        if error is None:
+            return jsonify({'error': 'error muss eine Zahl zwischen %g und 1 sein' % MIN_ERROR}), 400
+        return analysis_response(approximate_result(text, top_n=5, min_length=5, error=error), fields)
     
-    return jsonify({
-        'success': True,
-        'analysis': analysis,
-        'word_frequencies': dict(top_words),
-        'total_word_length': calculate_total_word_length_reduce(text),
-        'long_words_count': count_long_words_combined(text, min_length=5)
-    })
+    # Single-Pass-Engine: Text wird einmal zerlegt, alle Kennzahlen in einem Durchlauf
+    statistics = lazy(lambda: compute_statistics(
+        text, min_length=5, track_frequencies=fields.wants('word_frequencies')))
+    
+    return analysis_response(lazy_analysis(statistics, 5), fields)
+
+
+@app.route('/analyze/stream', methods=['POST'])
+def analyze_stream():
+    """
+    Streaming-Textanalyse für sehr grosse Eingaben
+    Liest den Body (text/plain) chunkweise aus request.stream,
+    statt ihn komplett als JSON in den Speicher zu laden
+    """
+    if request.mimetype not in ('', 'text/plain'):
+        return jsonify({'error': 'Erwartet wird ein text/plain Body'}), 415
+    
+    top_n = request.args.get('top_n', 5, type=int)
+    min_length = request.args.get('min_length', 5, type=int)
+    encoding = request.mimetype_params.get('charset', 'utf-8')
+    approximate = request.args.get('approximate', '0') not in ('', '0', 'false')
+    error = approximation_error(request.args.get('error', DEFAULT_ERROR, type=float))
+    if approximate and error is None:
+        return jsonify({'error': 'error muss eine Zahl zwischen %g und 1 sein' % MIN_ERROR}), 400
+    fields, error_response = parse_fields(request.args.get('fields'))
+    if error_response:
+        return error_response
+    
+    try:
+        chunks = iter_text_chunks(request.stream, encoding=encoding)
+        if approximate:
+            result = approximate_result(chunks, top_n=top_n, min_length=min_length, error=error)
+        else:
+            statistics = stream_statistics(chunks, min_length, statistics=TextStatistics(
+                min_length, track_frequencies=fields.wants('word_frequencies')))
+            result = lazy_analysis(lazy(lambda: statistics), top_n)
+    except (UnicodeDecodeError, LookupError):
+        return jsonify({'error': 'Text konnte nicht dekodiert werden'}), 400
+    
+    if resolve(result['analysis'])['word_count'] == 0:
+        return jsonify({'error': 'Bitte geben Sie einen Text ein'}), 400
+    
+    return analysis_response(result, fields)
 
 
 @app.route('/transform', methods=['POST'])
+@cached_response('type')
 def transform():
     """
     POST-Endpoint für Text-Transformationen
@@ -86,29 +277,21 @@ def transform():
     if not text.strip():
         return jsonify({'error': 'Bitte geben Sie einen Text ein'}), 400
     
+    fields, error_response = parse_fields(data.get('fields'))
+    if error_response:
+        return error_response
+    
     # B2G: Funktion als Objekt aus Dictionary holen
     transform_func = get_transformation(transformation_type)
     
     if not transform_func:
         return jsonify({'error': 'Ungültige Transformation'}), 400
     
-    # B2F: Funktion als Argument verwenden
-    transformed = apply_transformation(text, transform_func)
-    
-    # Zusätzliche Transformationen mit Map
-    words = text.split()
-    transformed_words = transform_words_map(text, transform_func)
-    
-    return jsonify({
-        'success': True,
-        'original': text,
-        'transformed': transformed,
-        'transformed_words': transformed_words,
-        'transformation_type': transformation_type
-    })
+    return jsonify(fields.project(build_transform_result(text, transform_func, transformation_type)))
 
 
 @app.route('/transform/advanced', methods=['POST'])
+@cached_response('config')
 def transform_advanced():
     """
     Erweiterte Transformationen mit Closures und Pipelines
@@ -120,9 +303,12 @@ def transform_advanced():
     if not text.strip():
         return jsonify({'error': 'Bitte geben Sie einen Text ein'}), 400
     
+    fields, error_response = parse_fields(data.get('fields'))
+    if error_response:
+        return error_response
+    
     # B2E: Verwende Closure-basierte Textprozessor-Factory
     processor = create_text_processor(config)
-    processed = processor(text)
     
     # B2F: Verwende Pipeline mit mehreren Funktionen
     pipeline_funcs = [
@@ -130,22 +316,21 @@ def transform_advanced():
         str.lower,
         str.capitalize
     ]
-    piped_result = pipe(text, *pipeline_funcs)
     
     # B2F: Verwende Komposition
     composed = compose(str.strip, str.lower, str.title)
-    composed_result = composed(text)
     
-    return jsonify({
+    return jsonify(fields.project({
         'success': True,
         'original': text,
-        'processed': processed,
-        'piped': piped_result,
-        'composed': composed_result
-    })
+        'processed': lazy(lambda: processor(text)),
+        'piped': lazy(lambda: pipe(text, *pipeline_funcs)),
+        'composed': lazy(lambda: composed(text))
+    }))
 
 
 @app.route('/filter', methods=['POST'])
+@cached_response('min_length', 'max_length', 'remove_duplicates')
 def filter_text():
     """
     POST-Endpoint für Text-Filterung
@@ -160,37 +345,15 @@ def filter_text():
     if not text.strip():
         return jsonify({'error': 'Bitte geben Sie einen Text ein'}), 400
     
-    # B4G: Filter einzeln anwenden
-    filtered_words = filter_words_by_length(text, min_length)
+    fields, error_response = parse_fields(data.get('fields'))
+    if error_response:
+        return error_response
     
-    # B3F: Lambda mit mehreren Argumenten (via Closure)
-    filtered_by_range = filter_words_with_lambda(text, min_length, max_length)
-    
-    # B3E: Lambda für Sortierung
-    sorted_words = sort_words_by_criteria(text, criteria='length')
-    
-    # Entferne Duplikate wenn gewünscht
-    if remove_duplicates:
-        # B3E: Lambda für komplexe Sortierung und Deduplizierung
-        unique_words = remove_duplicates_sorted(text)
-    else:
-        unique_words = text.split()
-    
-    # B4F: Kombinierte Map, Filter, Reduce
-    long_words_total_length = count_long_words_combined(text, min_length)
-    
-    return jsonify({
-        'success': True,
-        'original': text,
-        'filtered_by_min_length': filtered_words,
-        'filtered_by_range': filtered_by_range,
-        'sorted_by_length': sorted_words,
-        'unique_words': unique_words if remove_duplicates else None,
-        'long_words_total_length': long_words_total_length
-    })
+    return jsonify(fields.project(build_filter_result(text, min_length, max_length, remove_duplicates)))
 
 
 @app.route('/lambda/demo', methods=['POST'])
+@cached_response()
 def lambda_demo():
     """
     Demo-Endpoint für Lambda-Ausdrücke
@@ -201,35 +364,45 @@ def lambda_demo():
     if not text.strip():
         return jsonify({'error': 'Bitte geben Sie einen Text ein'}), 400
     
+    fields, error_response = parse_fields(data.get('fields'))
+    if error_response:
+        return error_response
+    
+    return jsonify(fields.project(build_lambda_result(SharedText(text))))
+
+
+def build_lambda_result(shared: SharedText) -> dict:
+    """
+    Ergebnis von /lambda/demo (auch für /analyze/all), Felder als Lazy-Werte
+    """
+    text = shared.text
+    words = shared.words
+    
     # B3G: Einfache Lambda-Ausdrücke
     lambda_transforms = get_simple_lambda_transformations()
     
-    words = text.split()
     results = {}
     
     for name, lambda_func in lambda_transforms.items():
         if name in ['uppercase', 'lowercase']:
-            results[name] = lambda_func(text)
+            results[name] = lazy(partial(lambda_func, text))
         elif name == 'double':
-            results[name] = ' '.join([lambda_func(w) for w in words])
+            results[name] = lazy(partial(lambda f: ' '.join([f(w) for w in words()]), lambda_func))
         elif name == 'square_length':
-            results[name] = [lambda_func(w) for w in words]
+            results[name] = lazy(partial(lambda f: [f(w) for w in words()], lambda_func))
     
     # B3E: Lambda für Sortierung
-    sorted_by_length = sorted(words, key=lambda w: len(w))
-    sorted_by_length_desc = sorted(words, key=lambda w: len(w), reverse=True)
-    sorted_alphabetically = sorted(words, key=lambda w: w.lower())
-    
-    return jsonify({
+    return {
         'success': True,
         'lambda_transformations': results,
-        'sorted_by_length': sorted_by_length,
-        'sorted_by_length_desc': sorted_by_length_desc,
-        'sorted_alphabetically': sorted_alphabetically
-    })
+        'sorted_by_length': lazy(lambda: sorted(words(), key=lambda w: len(w))),
+        'sorted_by_length_desc': lazy(lambda: sorted(words(), key=lambda w: len(w), reverse=True)),
+        'sorted_alphabetically': lazy(lambda: sorted(words(), key=lambda w: w.lower()))
+    }
 
 
 @app.route('/map-filter-reduce/demo', methods=['POST'])
+@cached_response()
 def map_filter_reduce_demo():
     """
     Demo-Endpoint für Map, Filter, Reduce
@@ -241,27 +414,40 @@ def map_filter_reduce_demo():
     if not text.strip():
         return jsonify({'error': 'Bitte geben Sie einen Text ein'}), 400
     
-    words = text.split()
+    fields, error_response = parse_fields(data.get('fields'))
+    if error_response:
+        return error_response
+    
+    return jsonify(fields.project(build_map_filter_reduce_result(SharedText(text))))
+
+
+def build_map_filter_reduce_result(shared: SharedText) -> dict:
+    """
+    Ergebnis von /map-filter-reduce/demo (auch für /analyze/all)
+    """
+    # Lazy Wortstrom über der geteilten Wortliste: map/filter werden erst bei
+    # der JSON-Serialisierung ausgewertet, nicht ausgewählte Ströme gar nicht
+    words = WordStream.from_iterable(shared.words())
     
     # B4G: Map einzeln
-    uppercased_words = list(map(str.upper, words))
-    word_lengths = list(map(len, words))
+    uppercased_words = words.map(str.upper)
+    word_lengths = words.map(len)
     
     # B4G: Filter einzeln
-    long_words = list(filter(lambda w: len(w) > 5, words))
-    short_words = list(filter(lambda w: len(w) <= 3, words))
-    
-    # B4G: Reduce einzeln
-    total_length = calculate_total_word_length_reduce(text)
+    long_words = words.filter(lambda w: len(w) > 5)
+    short_words = words.filter(lambda w: len(w) <= 3)
     
-    # B4F: Kombiniert - Filter -> Map -> Reduce
-    long_words_count = count_long_words_combined(text, min_length=5)
+    # B4G: Reduce einzeln / B4F: Filter -> Map -> Reduce kombiniert
+    # (gleiche Werte wie calculate_total_word_length_reduce und
+    # count_long_words_combined, aus dem Single-Pass-Akkumulator)
+    total_length = lazy(lambda: shared.statistics(5).total_length)
+    long_words_count = lazy(lambda: shared.statistics(5).long_words_length)
     
     # B4E: Komplexe Datenverarbeitung
-    frequencies = analyze_word_frequencies(text)
-    top_words = get_top_words(text, top_n=10)
+    frequencies = lazy(lambda: dict(shared.frequencies()))
+    top_words = lazy(lambda: dict(shared.top_words(10)))
     
-    return jsonify({
+    return {
         'success': True,
         'map_results': {
             'uppercased_words': uppercased_words,
@@ -278,17 +464,46 @@ def map_filter_reduce_demo():
             'long_words_count': long_words_count
         },
         'complex_processing': {
-            'word_frequencies': dict(frequencies),
-            'top_words': dict(top_words)
+            'word_frequencies': frequencies,
+            'top_words': top_words
         }
-    })
+    }
+
+
+def parse_benchmark(data: dict):
+    """(BenchmarkOptions oder None, Fehlerantwort oder None) für den Benchmark-Modus"""
+    try:
+        return BenchmarkOptions.parse(data.get('benchmark')), None
+    except ValueError as error:
+        return None, (jsonify({'error': str(error)}), 400)
+
+
+def benchmark_busy_response(error: BenchmarkBusy):
+    """503 mit Retry-After, wenn in diesem Prozess bereits eine Messung läuft"""
+    response = jsonify({'error': str(error)})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+
+def paradigm_variants(text: str, min_length: int) -> dict:
+    """Prozedurale und funktionale Variante als Funktionen ohne Argumente (Benchmark-Modus)"""
+    return {
+        'procedural': lambda: (count_long_words_procedural(text, min_length),
+                               process_text_procedural(text, min_length)),
+        'functional': lambda: (count_long_words_functional(text, min_length),
+                               process_text_functional(text, min_length))
+    }
 
 
 @app.route('/refactoring/demo', methods=['POST'])
+@cached_response('min_length', bypass='benchmark')
 def refactoring_demo():
     """
     C1G, C1F, C1E: Demonstriert Refactoring von prozedural zu funktional
     Zeigt Unterschiede und Vorteile des Refactorings
+    Optional {"benchmark": true | {"repeat", "warmup", "budget"}}: misst
+    beide Varianten (siehe measurement.py), Antwort unter "benchmark"
     """
     data = request.get_json()
     text = data.get('text', '')
@@ -297,21 +512,44 @@ def refactoring_demo():
     if not text.strip():
         return jsonify({'error': 'Bitte geben Sie einen Text ein'}), 400
     
+    benchmark_options, error_response = parse_benchmark(data)
+    if error_response:
+        return error_response
+    fields, error_response = parse_fields(data.get('fields'))
+    if error_response:
+        return error_response
+    
+    try:
+        return jsonify(fields.project(
+            build_refactoring_result(SharedText(text), min_length, benchmark_options)))
+    except BenchmarkBusy as error:
+        return benchmark_busy_response(error)
+
+
+def build_refactoring_result(shared: SharedText, min_length: int,
+                             benchmark_options: BenchmarkOptions = None) -> dict:
+    """
+    Ergebnis von /refactoring/demo (auch für /analyze/all)
+    Die Varianten zerlegen den Text bewusst selbst - sie sind der Gegenstand
+    des Vergleichs. shared.call teilt ihre Ergebnisse mit /paradigms/compare.
+    """
+    text = shared.text
+    
     # Vergleiche prozedural vs. funktional
-    procedural_count = count_long_words_procedural(text, min_length)
-    functional_count = count_long_words_functional(text, min_length)
+    procedural_count = lazy(lambda: shared.call(count_long_words_procedural, text, min_length))
+    functional_count = lazy(lambda: shared.call(count_long_words_functional, text, min_length))
     
-    procedural_result = process_text_procedural(text, min_length)
-    functional_result = process_text_functional(text, min_length)
+    procedural_result = lazy(lambda: shared.call(process_text_procedural, text, min_length))
+    functional_result = lazy(lambda: shared.call(process_text_functional, text, min_length))
     
-    return jsonify({
+    response = {
         'success': True,
         'text': text,
         'min_length': min_length,
         'count_long_words': {
             'procedural': procedural_count,
             'functional': functional_count,
-            'same_result': procedural_count == functional_count
+            'same_result': lazy(lambda: procedural_count() == functional_count())
         },
         'process_text': {
             'procedural': procedural_result,
@@ -335,14 +573,22 @@ def refactoring_demo():
                 'functional': 'Deklarativ, beschreibt WAS nicht WIE'
             }
         }
-    })
+    }
+    
+    if benchmark_options:
+        response['benchmark'] = lazy(lambda: benchmark_variants(
+            paradigm_variants(text, min_length), len(shared.words()), benchmark_options))
+    
+    return response
 
 
 @app.route('/paradigms/compare', methods=['POST'])
+@cached_response('min_length', bypass='benchmark')
 def compare_paradigms():
     """
     A1E: Vergleicht OO, prozedural und funktional
     Zeigt wie dasselbe Problem in verschiedenen Paradigmen gelöst wird
+    Optional {"benchmark": ...} wie bei /refactoring/demo, für alle drei Paradigmen
     """
     data = request.get_json()
     text = data.get('text', '')
@@ -351,20 +597,41 @@ def compare_paradigms():
     if not text.strip():
         return jsonify({'error': 'Bitte geben Sie einen Text ein'}), 400
     
+    benchmark_options, error_response = parse_benchmark(data)
+    if error_response:
+        return error_response
+    fields, error_response = parse_fields(data.get('fields'))
+    if error_response:
+        return error_response
+    
+    try:
+        return jsonify(fields.project(
+            build_paradigms_result(SharedText(text), min_length, benchmark_options)))
+    except BenchmarkBusy as error:
+        return benchmark_busy_response(error)
+
+
+def build_paradigms_result(shared: SharedText, min_length: int,
+                           benchmark_options: BenchmarkOptions = None) -> dict:
+    """
+    Ergebnis von /paradigms/compare (auch für /analyze/all)
+    """
+    text = shared.text
+    
     # OO-Version
-    processor = TextProcessor(text)
-    oo_count = processor.count_long_words(min_length)
-    oo_result = processor.process(min_length)
+    processor = lazy(lambda: TextProcessor(text))
+    oo_count = lazy(lambda: processor().count_long_words(min_length))
+    oo_result = lazy(lambda: processor().process(min_length))
     
     # Prozedurale Version
-    proc_count = count_long_words_procedural(text, min_length)
-    proc_result = process_text_procedural(text, min_length)
+    proc_count = lazy(lambda: shared.call(count_long_words_procedural, text, min_length))
+    proc_result = lazy(lambda: shared.call(process_text_procedural, text, min_length))
     
     # Funktionale Version
-    func_count = count_long_words_functional(text, min_length)
-    func_result = process_text_functional(text, min_length)
+    func_count = lazy(lambda: shared.call(count_long_words_functional, text, min_length))
+    func_result = lazy(lambda: shared.call(process_text_functional, text, min_length))
     
-    return jsonify({
+    response = {
         'success': True,
         'text': text,
         'min_length': min_length,
@@ -403,11 +670,490 @@ def compare_paradigms():
                 ]
             }
         },
-        'all_same_result': (
-            oo_count == proc_count == func_count and
-            oo_result == proc_result == func_result
+        'all_same_result': lazy(lambda: (
+            oo_count() == proc_count() == func_count() and
+            oo_result() == proc_result() == func_result()
+        ))
+    }
+    
+    if benchmark_options:
+        def object_oriented():
+            text_processor = TextProcessor(text)
+            return text_processor.count_long_words(min_length), text_processor.process(min_length)
+        
+        response['benchmark'] = lazy(lambda: benchmark_variants(
+            dict(object_oriented=object_oriented, **paradigm_variants(text, min_length)),
+            len(shared.words()), benchmark_options))
+    
+    return response
+
+
+# ============================================================================
+# Alle Panels in einem Request: ein Text, eine Zerlegung
+# ============================================================================
+
+def build_analysis_result(shared: SharedText) -> dict:
+    """Ergebnis von /analyze (ohne Näherungsmodus) aus der gemeinsamen Zerlegung"""
+    return dict(lazy_analysis(lazy(lambda: shared.statistics(5)), 5), success=True)
+
+
+def _panel_int(options: dict, name: str, default: int) -> int:
+    value = options.get(name, default)
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError('%s muss eine ganze Zahl sein' % name)
+    return value
+
+
+def build_panel(name: str, shared: SharedText, options: dict) -> dict:
+    """
+    Ergebnis eines Panels von /analyze/all mit den Parametern des Endpoints
+    (gleiche Standardwerte); ValueError bei ungültigen Parametern
+    """
+    text = shared.text
+    if name == 'analysis':
+        return build_analysis_result(shared)
+    if name == 'transform':
+        transformation_type = options.get('type', 'uppercase')
+        transform_func = get_transformation(transformation_type)
+        if not transform_func:
+            raise ValueError('Ungültige Transformation')
+        return build_transform_result(text, transform_func, transformation_type, shared)
+    if name == 'filter':
+        return build_filter_result(text, _panel_int(options, 'min_length', 0),
+                                   _panel_int(options, 'max_length', 100),
+                                   bool(options.get('remove_duplicates', False)), shared)
+    if name == 'lambda':
+        return build_lambda_result(shared)
+    if name == 'map_filter_reduce':
+        return build_map_filter_reduce_result(shared)
+    if name == 'refactoring':
+        return build_refactoring_result(shared, _panel_int(options, 'min_length', 5))
+    return build_paradigms_result(shared, _panel_int(options, 'min_length', 5))
+
+
+ALL_PANELS = ('analysis', 'transform', 'filter', 'lambda', 'map_filter_reduce',
+              'refactoring', 'paradigms')
+
+
+@app.route('/analyze/all', methods=['POST'])
+@cached_response('panels')
+def analyze_all():
+    """
+    Alle Auswertungen des Web-Interfaces in einem Request
+    {"text": ..., "panels": {"transform": {"type": "title"}, "filter": {...}, ...}}
+    Ohne panels alle Panels mit Standardwerten. Jedes Panel liefert dieselbe
+    Antwort wie sein Endpoint (ohne Benchmark-Modus); der Text wird dafür
+    nur einmal zerlegt (SharedText). fields gilt für die ganze Antwort,
+    z.B. ["filter.unique_words", "analysis"].
+    """
+    data = request.get_json()
+    text = data.get('text', '')
+    panels = data.get('panels')
+    
+    if not text.strip():
+        return jsonify({'error': 'Bitte geben Sie einen Text ein'}), 400
+    
+    if panels is None:
+        panels = {name: {} for name in ALL_PANELS}
+    if not isinstance(panels, dict):
+        return jsonify({'error': 'panels muss ein Objekt sein'}), 400
+    for name, options in panels.items():
+        if name not in ALL_PANELS:
+            return jsonify({'error': 'Unbekanntes Panel: %s' % name}), 400
+        if not isinstance(options, dict):
+            return jsonify({'error': 'Parameter für %s müssen ein Objekt sein' % name}), 400
+    
+    fields, error_response = parse_fields(data.get('fields'))
+    if error_response:
+        return error_response
+    
+    shared = SharedText(text)
+    response = {'success': True}
+    try:
+        for name in ALL_PANELS:
+            if name in panels:
+                response[name] = build_panel(name, shared, panels[name])
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+    
+    return jsonify(fields.project(response))
+
+
+# ============================================================================
+# Batch-Endpoints: viele Dokumente pro Request, Ergebnisse als NDJSON
+# ============================================================================
+
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/jsonl')
+
+
+def _read_batch_request():
+    """
+    Liest Dokumente und Parameter eines Batch-Requests
+    - JSON: Liste oder {"documents": [...], <Parameter>} (wird vorab geparst)
+    - NDJSON: ein Dokument pro Zeile, lazy aus request.stream gelesen;
+      Parameter kommen dann aus dem Query-String
+    Ein Dokument ist ein String oder ein Objekt mit "text" und optional "id".
+    """
+    params = request.args.to_dict()
+    
+    if request.mimetype in NDJSON_MIMETYPES:
+        def ndjson_documents():
+            for line in request.stream:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    yield None
+        return ndjson_documents(), params
+    
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        params.update({k: v for k, v in data.items() if k != 'documents'})
+        data = data.get('documents')
+    if not isinstance(data, list):
+        raise ValueError('Erwartet wird eine Liste von Dokumenten')
+    return data, params
+
+
+def _document_fields(item, position: int):
+    """(id, text) eines Batch-Dokuments, text ist None bei ungültigem Dokument"""
+    if isinstance(item, str):
+        return position, item
+    if isinstance(item, dict) and isinstance(item.get('text', ''), str):
+        return item.get('id', position), item.get('text', '')
+    return position, None
+
+
+def _int_parameter(params: dict, name: str, default):
+    value = params.get(name, default)
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return default
+
+
+def shared_processor(process_document):
+    """
+    Verarbeitet identische Dokumente eines Batches nur einmal
+    Ergebnisse der letzten BATCH_DEDUP_ENTRIES verschiedenen Dokumente
+    bleiben erhalten (LRU), von allen anderen nur der Digest
+    Liefert (process, summarize) für batch_response
+    """
+    results = OrderedDict()
+    seen = set()
+    summary = {'documents': 0, 'unique_documents': 0}
+    
+    def process(text: str) -> dict:
+        key = document_digest(text)
+        summary['documents'] += 1
+        result = results.get(key)
+        if result is None:
+            result = results[key] = process_document(text)
+            seen.add(key)
+            summary['unique_documents'] = len(seen)
+            if len(results) > BATCH_DEDUP_ENTRIES:
+                results.popitem(last=False)
+        else:
+            results.move_to_end(key)
+        return result
+    
+    return process, lambda: summary
+
+
+def batch_response(make_processor):
+    """
+    Gemeinsamer Ablauf aller Batch-Endpoints
+    make_processor(params, fields) liefert (process_document, summarize):
+    eine Funktion pro Dokument und eine für die abschliessende Zusammenfassung.
+    Jedes Ergebnis wird sofort als NDJSON-Zeile gestreamt.
+    Der Parameter fields (wie bei den Einzel-Endpoints) gilt für jedes Dokument.
+    """
+    try:
+        documents, params = _read_batch_request()
+        fields = FieldSelection.parse(params.get('fields'))
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+    
+    process_document, summarize = make_processor(params, fields)
+    
+    def generate():
+        for position, item in enumerate(documents):
+            doc_id, text = _document_fields(item, position)
+            if text is None:
+                payload = {'error': 'Ungültiges Dokument'}
+            elif not text.strip():
+                payload = {'error': 'Bitte geben Sie einen Text ein'}
+            else:
+                payload = process_document(text)
+            yield app.json.dumps(dict(payload, id=doc_id)) + '\n'
+        yield app.json.dumps({'summary': summarize()}) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+@app.route('/analyze/batch', methods=['POST'])
+def analyze_batch():
+    """
+    Analysiert viele Dokumente in einem Request
+    Pro Dokument eine NDJSON-Zeile wie /analyze (plus "id"), am Ende eine
+    Zeile mit den aus allen Dokumenten zusammengeführten Korpus-Frequenzen
+    (vollständig oder die aggregate_top häufigsten)
+    """
+    def make_processor(params, fields):
+        batch = BatchAnalysis(
+            top_n=_int_parameter(params, 'top_n', 5),
+            min_length=_int_parameter(params, 'min_length', 5)
+        )
+        aggregate_top = _int_parameter(params, 'aggregate_top', None)
+        return (
+            lambda text: fields.project(dict(batch.analyze(text), success=True)),
+            lambda: batch.aggregate(aggregate_top)
+        )
+    
+    return batch_response(make_processor)
+
+
+@app.route('/filter/batch', methods=['POST'])
+def filter_batch():
+    """
+    Filtert viele Dokumente in einem Request (Ergebnis pro Dokument wie /filter)
+    """
+    def make_processor(params, fields):
+        min_length = _int_parameter(params, 'min_length', 0)
+        max_length = _int_parameter(params, 'max_length', 100)
+        remove_duplicates = params.get('remove_duplicates', False) in (True, 'true', '1')
+        return shared_processor(
+            lambda text: fields.project(build_filter_result(text, min_length, max_length, remove_duplicates))
         )
-    })
+    
+    return batch_response(make_processor)
+
+
+@app.route('/transform/batch', methods=['POST'])
+def transform_batch():
+    """
+    Transformiert viele Dokumente in einem Request (Ergebnis pro Dokument wie /transform)
+    """
+    def make_processor(params, fields):
+        transformation_type = params.get('type', 'uppercase')
+        transform_func = get_transformation(transformation_type)
+        return shared_processor(
+            lambda text: fields.project(build_transform_result(text, transform_func, transformation_type))
+        )
+    
+    return batch_response(make_processor)
+
+
+# ============================================================================
+# Verteilte Analyse: Teilergebnisse pro Shard, Zusammenführung als Baum
+# ============================================================================
+
+PARTIAL_MIMETYPE = 'application/x-text-analyzer-partial'
+
+
+@app.route('/analyze/partial', methods=['POST'])
+def analyze_partial():
+    """
+    Teilergebnis für einen Shard (an Leerraum geschnittener Textteil)
+    Body: {"text": ..., "min_length"?: 5}, Antwort: Binärformat (TextStatistics.to_bytes)
+    """
+    data = request.get_json(silent=True) or {}
+    text = data.get('text', '')
+    if not isinstance(text, str):
+        return jsonify({'error': 'text muss ein String sein'}), 400
+    statistics = compute_statistics(text, _int_parameter(data, 'min_length', 5))
+    return Response(statistics.to_bytes(), mimetype=PARTIAL_MIMETYPE)
+
+
+@app.route('/analyze/merge', methods=['POST'])
+def analyze_merge():
+    """
+    Führt aneinandergehängte Teilergebnisse (in Textreihenfolge) zusammen
+    ?format=json (Standard): Endergebnis wie analyze_text + get_top_words
+    ?format=binary: zusammengeführtes Teilergebnis für die nächste Baum-Ebene
+    """
+    top_n = _int_parameter(request.args, 'top_n', 5)
+    fields, error_response = parse_fields(request.args.get('fields'))
+    if error_response:
+        return error_response
+    try:
+        merged = merge_statistics(iter_partials(request.get_data()))
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+    
+    if request.args.get('format') == 'binary':
+        return Response(merged.to_bytes(), mimetype=PARTIAL_MIMETYPE)
+    return jsonify(fields.project({
+        'success': True,
+        'analysis': lazy(merged.analysis),
+        'top_words': lazy(lambda: merged.top_words(top_n))
+    }))
+
+
+# ============================================================================
+# Inkrementelle Analyse: Sitzungen pro Dokument
+# ============================================================================
+
+# Sitzungen leben im Speicher des Prozesses (bei mehreren Workern: Sticky Sessions)
+analysis_sessions = SessionStore(
+    max_sessions=int(os.environ.get('TEXT_ANALYZER_MAX_SESSIONS', 256)),
+    ttl=float(os.environ.get('TEXT_ANALYZER_SESSION_TTL', 3600))
+)
+
+
+def session_response(document_id: str, session, top_n: int, status: int = 200,
+                     fields: FieldSelection = ALL_FIELDS):
+    """Antwort wie session.result(top_n); nicht ausgewählte Felder werden nicht berechnet"""
+    statistics = session.statistics
+    return jsonify(fields.project({
+        'success': True,
+        'document_id': document_id,
+        'version': session.version,
+        'analysis': lazy(statistics.analysis),
+        'word_frequencies': lazy(lambda: dict(session.top_words(top_n))),
+        'total_word_length': statistics.total_length,
+        'long_words_count': statistics.long_words_length
+    })), status
+
+
+@app.route('/sessions', methods=['POST'])
+def create_session():
+    """
+    Legt eine Analyse-Sitzung für ein Dokument an
+    Body: {"text": ..., "document_id"?: ..., "min_length"?: 5, "top_n"?: 5}
+    """
+    data = request.get_json(silent=True) or {}
+    text = data.get('text', '')
+    if not isinstance(text, str):
+        return jsonify({'error': 'text muss ein String sein'}), 400
+    document_id = data.get('document_id')
+    if document_id is not None and not isinstance(document_id, str):
+        return jsonify({'error': 'document_id muss ein String sein'}), 400
+    fields, error_response = parse_fields(data.get('fields'))
+    if error_response:
+        return error_response
+    
+    document_id, session = analysis_sessions.create(
+        text, _int_parameter(data, 'min_length', 5), document_id
+    )
+    return session_response(document_id, session, _int_parameter(data, 'top_n', 5), 201, fields)
+
+
+@app.route('/sessions/<document_id>', methods=['GET'])
+def get_session(document_id):
+    """Aktuelles Analyseergebnis einer Sitzung"""
+    fields, error_response = parse_fields(request.args.get('fields'))
+    if error_response:
+        return error_response
+    session = analysis_sessions.get(document_id)
+    if session is None:
+        return jsonify({'error': 'Unbekannte Sitzung'}), 404
+    with session.lock:
+        return session_response(document_id, session, _int_parameter(request.args, 'top_n', 5),
+                                fields=fields)
+
+
+@app.route('/sessions/<document_id>/edits', methods=['POST'])
+def edit_session(document_id):
+    """
+    Wendet Änderungen an und liefert das aktualisierte Ergebnis
+    Body: {"edits": [{"offset", "deleted", "inserted"}, ...], "base_version"?: n}
+    oder eine einzelne Änderung direkt als Objekt. Mit base_version wird
+    abgelehnt (409), wenn das Dokument inzwischen eine andere Version hat.
+    Neu ausgewertet werden nur die betroffenen Blöcke (siehe incremental.py):
+    Aufwand wächst mit der Änderung und der Blockgrösse, dazu kommt ein
+    Durchlauf über die Blockliste, nicht über den Text.
+    """
+    session = analysis_sessions.get(document_id)
+    if session is None:
+        return jsonify({'error': 'Unbekannte Sitzung'}), 404
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Erwartet wird ein JSON-Objekt'}), 400
+    edits = data.get('edits', [data])
+    if not isinstance(edits, list):
+        return jsonify({'error': 'edits muss eine Liste sein'}), 400
+    fields, error_response = parse_fields(data.get('fields'))
+    if error_response:
+        return error_response
+    
+    with session.lock:
+        base_version = data.get('base_version')
+        if base_version is not None and base_version != session.version:
+            return jsonify({'error': 'Version passt nicht', 'version': session.version}), 409
+        try:
+            apply_edits(session, edits)
+        except EditError as error:
+            return jsonify({'error': str(error), 'version': session.version}), 400
+        return session_response(document_id, session, _int_parameter(data, 'top_n', 5),
+                                fields=fields)
+
+
+@app.route('/sessions/<document_id>', methods=['DELETE'])
+def delete_session(document_id):
+    """Beendet eine Sitzung"""
+    if not analysis_sessions.delete(document_id):
+        return jsonify({'error': 'Unbekannte Sitzung'}), 404
+    return jsonify({'success': True})
+
+
+# ============================================================================
+# Metriken: Laufzeit pro Endpoint und pro Stufe
+# ============================================================================
+
+@app.before_request
+def start_request_timer():
+    # Gemessen wird nur der Anteil METRICS_SAMPLE_RATE, gezählt werden alle Requests
+    g.request_started = time.perf_counter() if sample_metrics() else None
+
+
+@app.after_request
+def record_request_time(response):
+    """
+    Misst die Zeit bis zur fertigen Antwort pro Route
+    Bei Streaming-Antworten nur bis zum Beginn des Sendens
+    """
+    if 'request_started' not in g:
+        return response
+    started = g.pop('request_started')
+    # Route-Muster statt Pfad, damit unbekannte URLs keine neuen Labels erzeugen
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    histogram = METRICS.histogram(
+        'text_analyzer_request_seconds', 'Laufzeit pro Endpoint',
+        endpoint=endpoint, method=request.method
+    )
+    histogram.count_call()
+    if started is not None:
+        histogram.observe(time.perf_counter() - started)
+    return response
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Laufzeit-Histogramme im Prometheus-Textformat
+    """
+    return Response(METRICS.render_prometheus(),
+                    content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    """
+    Trefferzähler und Füllstand des Result-Caches
+    """
+    return jsonify(result_cache.stats())
+
+
+@app.route('/pipeline/stats', methods=['GET'])
+def pipeline_stats():
+    """
+    Reihenfolge, Trefferquote und Kosten der adaptiven Prädikate
+    (Validatoren und Filter von process_text_with_pipeline)
+    """
+    return jsonify({'pipelines': predicate_stats()})
 
 
 if __name__ == '__main__':
@@ -0,0 +1,229 @@
+"""
+ASGI Serving - Asynchroner Betriebsmodus für dieselben Flask-Routen
+Die Flask-App bleibt unverändert; jeder Request läuft in einem begrenzten
+Thread-Pool, der Event-Loop bleibt frei für andere Clients. Ist die
+Warteschlange voll, wird sofort mit 503 und Retry-After geantwortet.
+
+Entwicklung:  python app.py                 (Flask-Dev-Server wie bisher)
+Produktion:   python asgi.py --workers 4    (uvicorn, mehrere Prozesse)
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from app import app as flask_app
+
+
+# Threads pro Worker-Prozess für die CPU-Arbeit von text_analyzer
+EXECUTOR_WORKERS = int(os.environ.get('TEXT_ANALYZER_EXECUTOR_WORKERS', 4))
+
+# Laufende + wartende Requests pro Prozess, darüber gibt es 503
+MAX_PENDING = int(os.environ.get('TEXT_ANALYZER_MAX_PENDING', EXECUTOR_WORKERS * 8))
+
+# Sekunden, die ein abgewiesener Client warten soll
+RETRY_AFTER = int(os.environ.get('TEXT_ANALYZER_RETRY_AFTER', 1))
+
+
+class _RequestBody(io.RawIOBase):
+    """
+    wsgi.input für den Worker-Thread
+    Liest den Body stückweise über receive() vom Event-Loop, damit auch
+    /analyze/stream und NDJSON-Batches nicht komplett gepuffert werden
+    """
+
+    def __init__(self, receive: Callable, loop: asyncio.AbstractEventLoop):
+        self._receive = receive
+        self._loop = loop
+        self._buffer = b''
+        self._done = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, target: Any) -> int:
+        while not self._buffer and not self._done:
+            message = asyncio.run_coroutine_threadsafe(self._receive(), self._loop).result()
+            if message['type'] == 'http.disconnect':
+                self._done = True
+                break
+            self._buffer += message.get('body', b'')
+            self._done = not message.get('more_body', False)
+        count = min(len(target), len(self._buffer))
+        target[:count] = self._buffer[:count]
+        self._buffer = self._buffer[count:]
+        return count
+
+
+def build_environ(scope: Dict[str, Any], body: Any) -> Dict[str, Any]:
+    """
+    Übersetzt einen ASGI-HTTP-Scope in ein WSGI-environ
+    """
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': 'HTTP/' + scope.get('http_version', '1.1'),
+        'REMOTE_ADDR': (scope.get('client') or ('', 0))[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.input_terminated': True,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for raw_name, raw_value in scope.get('headers', []):
+        name = raw_name.decode('latin-1').upper().replace('-', '_')
+        value = raw_value.decode('latin-1')
+        if name in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            environ[name] = value
+            continue
+        key = 'HTTP_' + name
+        environ[key] = environ[key] + ',' + value if key in environ else value
+    return environ
+
+
+class AsgiAdapter:
+    """
+    ASGI-Anwendung um eine WSGI-App
+    - jeder Request läuft komplett im Thread-Pool (max_workers Threads)
+    - höchstens max_pending Requests gleichzeitig, sonst 503 + Retry-After
+    - Antworten werden chunkweise gesendet (Streaming bleibt erhalten)
+    """
+
+    def __init__(self, wsgi_app: Callable, max_workers: int = EXECUTOR_WORKERS,
+                 max_pending: int = MAX_PENDING, retry_after: int = RETRY_AFTER):
+        self.wsgi_app = wsgi_app
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self.pending = 0
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='text-analyzer')
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        # Event-Loop ist single-threaded: der Zähler braucht kein Lock
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            await self._send_overloaded(send)
+            return
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                self._executor, self._run_wsgi, scope, receive, send, loop
+            )
+        finally:
+            self.pending -= 1
+
+    def _run_wsgi(self, scope: Dict[str, Any], receive: Callable, send: Callable,
+                  loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Läuft im Worker-Thread; send() wird auf dem Event-Loop ausgeführt
+        """
+        def call_soon(message: Dict[str, Any]) -> None:
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        response: Dict[str, Any] = {}
+
+        def start_response(status: str, headers: List[tuple], exc_info: Optional[tuple] = None):
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [
+                (name.lower().encode('latin-1'), value.encode('latin-1'))
+                for name, value in headers
+            ]
+            return lambda data: None
+
+        body = io.BufferedReader(_RequestBody(receive, loop))
+        started = False
+        try:
+            result = self.wsgi_app(build_environ(scope, body), start_response)
+            try:
+                for chunk in result:
+                    if not chunk:
+                        continue
+                    if not started:
+                        call_soon({'type': 'http.response.start', 'status': response['status'],
+                                   'headers': response['headers']})
+                        started = True
+                    call_soon({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            finally:
+                if hasattr(result, 'close'):
+                    result.close()
+        except Exception:
+            if started:
+                raise
+            response = {'status': 500, 'headers': [(b'content-type', b'text/plain')]}
+            call_soon({'type': 'http.response.start', **response})
+            call_soon({'type': 'http.response.body', 'body': b'Internal Server Error'})
+            return
+
+        if not started:
+            call_soon({'type': 'http.response.start', 'status': response['status'],
+                       'headers': response['headers']})
+        call_soon({'type': 'http.response.body', 'body': b'', 'more_body': False})
+
+    async def _send_overloaded(self, send: Callable) -> None:
+        body = flask_app.json.dumps({'error': 'Server ausgelastet, bitte später erneut versuchen'})
+        await send({
+            'type': 'http.response.start',
+            'status': 503,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'retry-after', str(self.retry_after).encode('latin-1')),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': body.encode('utf-8')})
+
+    async def _lifespan(self, receive: Callable, send: Callable) -> None:
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self._executor.shutdown(wait=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+# ASGI-Einstiegspunkt, z.B. für: uvicorn asgi:application
+application = AsgiAdapter(flask_app)
+
+
+def main() -> None:
+    """
+    Produktions-Einstiegspunkt: startet uvicorn mit mehreren Worker-Prozessen
+    """
+    parser = argparse.ArgumentParser(description='Text Analyzer im ASGI-Modus starten')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    try:
+        import uvicorn
+    except ImportError:
+        sys.exit('uvicorn ist nicht installiert: pip install -r requirements.txt')
+
+    uvicorn.run('asgi:application', host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Micro-Benchmark - Frequenz-Backend
+Vergleicht die frühere reduce-über-dict-Version von analyze_word_frequencies
+und die Vollsortierung von get_top_words mit dem Counter/Heap-Backend
+
+Aufruf: python benchmarks/bench_frequencies.py [--tokens 1000000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from functools import reduce
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from text_analyzer import analyze_word_frequencies, get_top_words  # noqa: E402
+
+
+# ============================================================================
+# Referenz: bisherige Implementierung
+# ============================================================================
+
+def reference_word_frequencies(text: str) -> Dict[str, int]:
+    """Frühere Version: map/filter mit Lambdas und reduce über ein dict"""
+    words = text.lower().split()
+    if not words:
+        return {}
+    normalized = map(lambda w: w.strip('.,!?;:()[]{}"\''), words)
+    valid_words = filter(lambda w: len(w) > 0, normalized)
+
+    def update_freq(acc: Dict, word: str) -> Dict:
+        acc[word] = acc.get(word, 0) + 1
+        return acc
+
+    return reduce(update_freq, valid_words, {})
+
+
+def reference_top_words(text: str, top_n: int = 5) -> List[tuple]:
+    """Frühere Version: sortiert das ganze Vokabular"""
+    frequencies = reference_word_frequencies(text)
+    if not frequencies:
+        return []
+    sorted_items = sorted(frequencies.items(), key=lambda x: x[1], reverse=True)
+    return sorted_items[:top_n]
+
+
+# ============================================================================
+# Messung
+# ============================================================================
+
+def generate_text(token_count: int, vocabulary_size: int, seed: int = 323) -> str:
+    """Zipf-ähnlich verteilter Text mit Satzzeichen und gemischter Gross-/Kleinschreibung"""
+    rng = random.Random(seed)
+    vocabulary = ['wort%d' % i for i in range(vocabulary_size)]
+    decorations = ['{}', '{}', '{}', '{}.', '{},', '({})', '{}!', '{}']
+    weights = [1.0 / (rank + 1) for rank in range(vocabulary_size)]
+    words = rng.choices(vocabulary, weights=weights, k=token_count)
+    return ' '.join(
+        rng.choice(decorations).format(word.capitalize() if rng.random() < 0.1 else word)
+        for word in words
+    )
+
+
+def best_of(func: Callable, *args, repeat: int = 3) -> float:
+    """Minimale Laufzeit über mehrere Wiederholungen"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tokens', type=int, default=1_000_000)
+    parser.add_argument('--vocabulary', type=int, default=50_000)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    text = generate_text(args.tokens, args.vocabulary)
+
+    assert analyze_word_frequencies(text) == reference_word_frequencies(text)
+    assert get_top_words(text, args.top) == reference_top_words(text, args.top)
+
+    cases = [
+        ('analyze_word_frequencies', reference_word_frequencies, analyze_word_frequencies, (text,)),
+        ('get_top_words', reference_top_words, get_top_words, (text, args.top)),
+    ]
+
+    print('%d Tokens, Vokabular %d, top_n=%d' % (args.tokens, args.vocabulary, args.top))
+    print('%-26s %12s %12s %9s' % ('Funktion', 'reduce [s]', 'Counter [s]', 'Speedup'))
+    for name, reference, current, call_args in cases:
+        before = best_of(reference, *call_args, repeat=args.repeat)
+        after = best_of(current, *call_args, repeat=args.repeat)
+        print('%-26s %12.3f %12.3f %8.2fx' % (name, before, after, before / after))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Micro-Benchmark - required_words: Substring-Suche gegen Aho-Corasick
+Prüft, dass KeywordAutomaton dieselben Wörter findet wie die Substring-Suche,
+und misst beide über wachsende Regelsätze - Grundlage für AUTOMATON_THRESHOLD
+
+Aufruf: python benchmarks/bench_keywords.py [--tokens 200000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpora import CHARSETS, generate_corpus  # noqa: E402
+from functional_utils import AUTOMATON_THRESHOLD, KeywordAutomaton  # noqa: E402
+
+
+WORD_COUNTS = (8, 16, 32, 64, 128, 256, 512, 1024, 2048)
+
+
+# ============================================================================
+# Parität: Automat gegen Substring-Suche
+# ============================================================================
+
+def substring_found(words: List[str], text: str) -> List[bool]:
+    return [word in text for word in words]
+
+
+def automaton_found(words: List[str], text: str) -> List[bool]:
+    found = KeywordAutomaton(words).found(text)
+    return [bool(found >> position & 1) for position in range(len(words))]
+
+
+def check_parity(tokens: int) -> int:
+    """Vorhandene, fehlende, überlappende und leere Wörter; liefert die Anzahl Abweichungen"""
+    failures = 0
+    rng = random.Random(7)
+    for charset in CHARSETS:
+        text = generate_corpus(tokens, 'zipf', charset).lower()
+        vocabulary = sorted(set(text.split()))
+        words = rng.sample(vocabulary, min(50, len(vocabulary)))
+        words += [word[1:] for word in words[:10]] + ['', 'zzqqxx', text[5:40]]
+        for sample in (words, words[:3], []):
+            if automaton_found(sample, text) != substring_found(sample, text):
+                failures += 1
+                print('ABWEICHUNG %s (%d Wörter)' % (charset, len(sample)))
+    for words, text in ((['he', 'she', 'his', 'hers'], 'ushers'), (['a', 'aa', 'aaa'], 'aa')):
+        if automaton_found(words, text) != substring_found(words, text):
+            failures += 1
+            print('ABWEICHUNG %r in %r' % (words, text))
+    return failures
+
+
+# ============================================================================
+# Messung
+# ============================================================================
+
+def best_of(func: Callable, *args, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tokens', type=int, default=200_000)
+    parser.add_argument('--parity-tokens', type=int, default=5_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    failures = check_parity(args.parity_tokens)
+    print('Parität: %s' % ('ok' if not failures else '%d Abweichungen' % failures))
+
+    # Wörter aus der zweiten Hälfte des Vokabulars: die Substring-Suche
+    # findet sie spät, der Automat liest den Text fast ganz
+    text = generate_corpus(args.tokens, 'zipf', 'mixed').lower()
+    vocabulary = list(dict.fromkeys(text.split()))
+    late = vocabulary[len(vocabulary) // 2:]
+    rng = random.Random(1)
+
+    print('\n%d Zeichen, AUTOMATON_THRESHOLD = %d' % (len(text), AUTOMATON_THRESHOLD))
+    print('%7s %-9s %15s %15s' % ('Wörter', 'Fall', 'Substring [ms]', 'Automat [ms]'))
+    for count in WORD_COUNTS:
+        present = rng.sample(late, min(count, len(late)))
+        cases = (('vorhanden', present), ('fehlend', present[:-1] + ['zzqqxx']))
+        for label, words in cases:
+            automaton = KeywordAutomaton(words)
+            substring = best_of(lambda: all(word in text for word in words), repeat=args.repeat)
+            automatic = best_of(automaton.contains_all, text, repeat=args.repeat)
+            print('%7d %-9s %15.3f %15.3f' % (count, label, substring * 1000, automatic * 1000))
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
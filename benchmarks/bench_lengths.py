@@ -0,0 +1,140 @@
+"""
+Micro-Benchmark und Paritätsprüfung - Längen-Backend
+Prüft, dass die Längen-Funktionen aus text_analyzer mit den bisherigen
+Lambda-Implementierungen übereinstimmen, und vergleicht das NumPy-Backend
+mit dem reinen Python-Backend (falls NumPy installiert ist)
+
+Aufruf: python benchmarks/bench_lengths.py [--tokens 500000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from functools import reduce
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import length_backend  # noqa: E402
+import text_analyzer as ta  # noqa: E402
+from corpora import CHARSETS, DISTRIBUTIONS, generate_corpus  # noqa: E402
+from token_index import TokenIndex  # noqa: E402
+
+
+# ============================================================================
+# Referenz: bisherige Implementierungen mit Lambdas pro Token
+# ============================================================================
+
+def reference_results(text: str, min_length: int, max_length: int) -> Dict[str, Any]:
+    words = text.split()
+    return {
+        'average_word_length': sum(len(w) for w in words) / len(words) if words else 0.0,
+        'find_longest_word': max(words, key=len) if words else "",
+        'find_shortest_word': min(words, key=len) if words else "",
+        'calculate_total_word_length_reduce': reduce(lambda acc, w: acc + len(w), words, 0),
+        'count_long_words_combined': reduce(
+            lambda acc, n: acc + n, map(len, filter(lambda w: len(w) >= min_length, words)), 0),
+        'count_long_words_functional': reduce(
+            lambda acc, w: acc + 1, filter(lambda w: len(w) >= min_length, words), 0),
+        'filter_words_by_length': [w for w in words if len(w) >= min_length],
+        'filter_words_with_lambda': [w for w in words if min_length <= len(w) <= max_length],
+    }
+
+
+def current_results(text: str, min_length: int, max_length: int) -> Dict[str, Any]:
+    index = TokenIndex(text)
+    return {
+        'average_word_length': ta.average_word_length(text),
+        'find_longest_word': ta.find_longest_word(text),
+        'find_shortest_word': ta.find_shortest_word(text),
+        'calculate_total_word_length_reduce': ta.calculate_total_word_length_reduce(text),
+        'count_long_words_combined': ta.count_long_words_combined(text, min_length),
+        'count_long_words_combined[index]': ta.count_long_words_combined(index, min_length),
+        'count_long_words_functional': ta.count_long_words_functional(text, min_length),
+        'filter_words_by_length': ta.filter_words_by_length(text, min_length),
+        'filter_words_by_length[index]': ta.filter_words_by_length(index, min_length),
+        'filter_words_with_lambda': ta.filter_words_with_lambda(text, min_length, max_length),
+        'filter_words_with_lambda[index]': ta.filter_words_with_lambda(index, min_length, max_length),
+    }
+
+
+def check_parity(tokens: int) -> int:
+    """Vergleicht alle Korpus-Varianten und Schwellen; liefert die Anzahl Abweichungen"""
+    failures = 0
+    texts = [generate_corpus(tokens, d, c) for d in DISTRIBUTIONS for c in CHARSETS]
+    texts += ['', '   ', 'eins', 'a bb a bb ccc ccc']
+    for text in texts:
+        for min_length, max_length in ((0, 100), (1, 1), (5, 8), (-3, 4), (7, 3), (30, 40),
+                                         (2.5, 4.5), (3, 4.5), (0.5, 7), (-1.5, 2.0)):
+            expected = reference_results(text, min_length, max_length)
+            actual = current_results(text, min_length, max_length)
+            for name, value in actual.items():
+                if value != expected[name.split('[')[0]]:
+                    failures += 1
+                    print('ABWEICHUNG %s (min=%s, max=%s, %d Zeichen)' % (
+                        name, min_length, max_length, len(text)))
+    return failures
+
+
+# ============================================================================
+# Messung: Vektor gegen Liste
+# ============================================================================
+
+def best_of(func: Callable, *args, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tokens', type=int, default=500_000)
+    parser.add_argument('--parity-tokens', type=int, default=5_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    failures = check_parity(args.parity_tokens)
+    print('Parität (%s-Backend): %s' % (
+        length_backend.BACKEND, 'ok' if not failures else '%d Abweichungen' % failures))
+
+    words = generate_corpus(args.tokens, 'zipf', 'ascii').split()
+    numpy = length_backend.numpy
+    python_lengths = list(map(len, words))
+    operations = [
+        ('Aufbau', lambda lengths: None),
+        ('Summe', length_backend.sum_lengths),
+        ('Summe >= 5', lambda lengths: length_backend.sum_lengths(lengths, 5)),
+        ('Mittelwert', length_backend.mean_length),
+        ('Anzahl >= 5', lambda lengths: length_backend.count_at_least(lengths, 5)),
+        ('Bereich 3..8', lambda lengths: list(length_backend.positions_in_range(lengths, 3, 8))),
+        ('argmax', length_backend.longest_position),
+        ('argmin', length_backend.shortest_position),
+    ]
+
+    print('\n%d Tokens' % len(words))
+    print('%-14s %12s %12s %9s' % ('Operation', 'Python [ms]', 'NumPy [ms]', 'Speedup'))
+    for name, operation in operations:
+        if name == 'Aufbau':
+            before = best_of(lambda: list(map(len, words)), repeat=args.repeat)
+            after = best_of(lambda: numpy.fromiter(map(len, words), dtype=numpy.int64,
+                                                   count=len(words)),
+                            repeat=args.repeat) if numpy else None
+        else:
+            before = best_of(operation, python_lengths, repeat=args.repeat)
+            after = best_of(operation, numpy.array(python_lengths, dtype=numpy.int64),
+                            repeat=args.repeat) if numpy else None
+        if after is None:
+            print('%-14s %12.3f %12s %9s' % (name, before * 1000, '-', '-'))
+        else:
+            print('%-14s %12.3f %12.3f %8.2fx' % (name, before * 1000, after * 1000, before / after))
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Micro-Benchmark - parallel_map_reduce gegen den seriellen Pfad
+Prüft, dass der Prozess-Pool dieselben Ergebnisse liefert, und misst
+Gesamtlänge, Länge langer Wörter und Wortfrequenzen seriell gegen parallel,
+dazu die Kosten fürs Pickeln der Tokens (fällt im aufrufenden Prozess an)
+
+Aufruf: python benchmarks/bench_parallel.py [--tokens 1000000] [--workers 4]
+"""
+
+import argparse
+import operator
+import os
+import pickle
+import sys
+import time
+from collections import Counter
+from functools import partial, reduce
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis_engine import count_frequencies  # noqa: E402
+from corpora import generate_corpus  # noqa: E402
+from functional_utils import (  # noqa: E402
+    PARALLEL_START_METHOD,
+    parallel_map_reduce,
+    parallel_reduce,
+    start_process_pool
+)
+
+
+# Reducer auf Modulebene, damit sie an Worker-Prozesse übergeben werden können
+
+def add_length(acc: int, word: str) -> int:
+    return acc + len(word)
+
+
+def add_long_length(min_length: int, acc: int, word: str) -> int:
+    length = len(word)
+    return acc + length if length >= min_length else acc
+
+
+def best_of(func: Callable, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tokens', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    words = generate_corpus(args.tokens, 'zipf', 'mixed').split()
+    start_process_pool(args.workers)
+
+    cases = [
+        ('total_length',
+         lambda: reduce(add_length, words, 0),
+         lambda: parallel_reduce(add_length, words, 0, operator.add)),
+        ('long_words_length',
+         lambda: reduce(partial(add_long_length, 5), words, 0),
+         lambda: parallel_reduce(partial(add_long_length, 5), words, 0, operator.add)),
+        ('word_frequencies',
+         lambda: count_frequencies(words),
+         lambda: parallel_map_reduce(count_frequencies, words, operator.iadd, Counter())),
+    ]
+
+    failures = 0
+    for name, serial, parallel in cases:
+        expected, result = serial(), parallel()
+        same_order = not isinstance(expected, dict) or list(expected) == list(result)
+        if expected != result or not same_order:
+            failures += 1
+            print('ABWEICHUNG %s' % name)
+    print('Parität: %s' % ('ok' if not failures else '%d Abweichungen' % failures))
+
+    pickling = best_of(lambda: pickle.loads(pickle.dumps(words, pickle.HIGHEST_PROTOCOL)), args.repeat)
+    print('\n%d Tokens, %d Worker (%s), %d Kerne' % (
+        len(words), args.workers, PARALLEL_START_METHOD, os.cpu_count() or 1))
+    print('Tokens pickeln: %.3f ms' % (pickling * 1000))
+    print('%-18s %12s %14s %9s' % ('Fall', 'seriell [ms]', 'parallel [ms]', 'Speedup'))
+    for name, serial, parallel in cases:
+        before = best_of(serial, args.repeat)
+        after = best_of(parallel, args.repeat)
+        print('%-18s %12.3f %14.3f %8.2fx' % (name, before * 1000, after * 1000, before / after))
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
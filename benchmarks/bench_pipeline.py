@@ -0,0 +1,101 @@
+"""
+Micro-Benchmark - Pipeline-Compiler
+Prüft, dass compile_pipeline dasselbe liefert wie die Schritte einzeln
+nacheinander (auch wenn frühere Schritte Nicht-ASCII-Zeichen erzeugen),
+und vergleicht die Laufzeit kompiliert gegen unkompiliert
+
+Aufruf: python benchmarks/bench_pipeline.py [--tokens 200000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpora import CHARSETS, generate_corpus  # noqa: E402
+from functional_utils import compile_pipeline, compose, filter_words, map_words  # noqa: E402
+
+
+# ============================================================================
+# Parität: kompiliert gegen Schritt für Schritt
+# ============================================================================
+
+def run_steps(steps: List[Callable], text: str) -> str:
+    """Referenz: jeder Schritt einzeln, ohne Vereinfachung oder Fusion"""
+    for step in steps:
+        text = step(text)
+    return text
+
+
+CHAINS = [
+    [str.lower, str.upper],
+    [str.upper, str.lower, str.title],
+    [str.strip, str.strip, str.capitalize],
+    [lambda s: s + 'ß', str.upper, str.lower],
+    [map_words(lambda w: w + 'ß'), str.upper, str.lower],
+    [str.upper, map_words(lambda w: w + 'ß'), str.lower, str.upper],
+    [map_words(str.lower), filter_words(lambda w: len(w) > 2), map_words(lambda w: w + ' x')],
+    [filter_words(str.isalpha), str.title, str.lower, str.strip],
+]
+
+
+def check_parity(tokens: int) -> int:
+    """Alle Ketten über ASCII- und Unicode-Texte; liefert die Anzahl Abweichungen"""
+    failures = 0
+    texts = [generate_corpus(tokens, 'zipf', charset) for charset in CHARSETS]
+    texts += ['', 'a', 'a b', 'straße STRASSE', '  ǅ ﬁ İ  ']
+    for position, steps in enumerate(CHAINS):
+        for text in texts:
+            if compile_pipeline(steps)(text) != run_steps(steps, text):
+                failures += 1
+                print('ABWEICHUNG Kette %d (%r...)' % (position, text[:20]))
+    # compose kompiliert dieselben Ketten
+    if compose(lambda s: s + 'ß', str.upper, str.lower)('a') != 'ass':
+        failures += 1
+        print('ABWEICHUNG compose mit Nicht-ASCII-Zwischenwert')
+    return failures
+
+
+# ============================================================================
+# Messung
+# ============================================================================
+
+def best_of(func: Callable, *args, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tokens', type=int, default=200_000)
+    parser.add_argument('--parity-tokens', type=int, default=2_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    failures = check_parity(args.parity_tokens)
+    print('Parität: %s' % ('ok' if not failures else '%d Abweichungen' % failures))
+
+    print('\n%d Tokens' % args.tokens)
+    print('%-8s %-6s %14s %14s %9s' % ('Zeichen', 'Kette', 'einzeln [ms]', 'kompiliert [ms]', 'Speedup'))
+    for charset in CHARSETS:
+        text = generate_corpus(args.tokens, 'zipf', charset)
+        for position, steps in enumerate(CHAINS):
+            pipeline = compile_pipeline(steps)
+            before = best_of(run_steps, steps, text, repeat=args.repeat)
+            after = best_of(pipeline, text, repeat=args.repeat)
+            print('%-8s %-6d %14.3f %14.3f %8.2fx' % (
+                charset, position, before * 1000, after * 1000, before / after))
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
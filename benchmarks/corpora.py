@@ -0,0 +1,98 @@
+"""
+Synthetische Korpora für die Benchmarks
+Deterministisch (fester Seed) in verschiedenen Grössen, Vokabular-Verteilungen
+und Zeichensätzen, damit Messungen zwischen Commits vergleichbar sind
+"""
+
+import random
+from typing import Dict, List, Tuple
+
+
+# Anzahl Tokens pro Grössenstufe
+SIZES: Dict[str, int] = {
+    'small': 1_000,
+    'medium': 50_000,
+    'large': 500_000,
+}
+
+# Vokabular-Verteilungen: Zipf (natürliche Sprache), gleichverteilt, stark repetitiv
+DISTRIBUTIONS = ('zipf', 'uniform', 'repetitive')
+
+# Zeichensätze der Wörter
+CHARSETS = ('ascii', 'german', 'mixed')
+
+_ALPHABETS: Dict[str, str] = {
+    'ascii': 'abcdefghijklmnopqrstuvwxyz',
+    'german': 'abcdefghijklmnopqrstuvwxyzäöüß',
+    # Latein mit Akzenten, Kyrillisch, Griechisch, CJK und Emoji
+    'mixed': 'abcdefghijklmnopqrstuvwxyzéèñçåøłабвгдежзийклαβγδεζηθ日本語文字中国한국어😀🚀✨',
+}
+
+# Wortdekorationen: Satzzeichen an den Wortgrenzen wie in echtem Text
+_DECORATIONS = ('{}', '{}', '{}', '{}', '{}', '{},', '{}.', '({})', '"{}"', '{}!', '{}?', '{};')
+
+# Trennzeichen zwischen Wörtern; 'mixed' enthält auch Tab, Zeilenumbruch und NBSP
+_SEPARATORS: Dict[str, Tuple[str, ...]] = {
+    'ascii': (' ',),
+    'german': (' ',) * 19 + ('\n',),
+    'mixed': (' ',) * 16 + ('\t', '\n', '\u00a0', '\u3000'),
+}
+
+
+def build_vocabulary(size: int, charset: str, rng: random.Random) -> List[str]:
+    """
+    Verschiedene Wörter mit Längen 1-14, Längen gehäuft um 4-7 Zeichen
+    Im Zeichensatz 'mixed' tragen einige Wörter kombinierende Akzente
+    """
+    alphabet = _ALPHABETS[charset]
+    vocabulary = []
+    seen = set()
+    while len(vocabulary) < size:
+        length = max(1, min(14, int(rng.gauss(5.5, 2.5))))
+        word = ''.join(rng.choice(alphabet) for _ in range(length))
+        if charset == 'mixed' and rng.random() < 0.05:
+            word += '\u0301'
+        if rng.random() < 0.1:
+            word = word.capitalize()
+        if word not in seen:
+            seen.add(word)
+            vocabulary.append(word)
+    return vocabulary
+
+
+def generate_corpus(tokens: int, distribution: str = 'zipf', charset: str = 'ascii',
+                    seed: int = 323) -> str:
+    """
+    Erzeugt einen Text mit genau `tokens` Wörtern (gemessen mit str.split())
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError('Unbekannte Verteilung: %s' % distribution)
+    if charset not in CHARSETS:
+        raise ValueError('Unbekannter Zeichensatz: %s' % charset)
+
+    rng = random.Random('%d:%s:%s:%d' % (seed, distribution, charset, tokens))
+    if distribution == 'repetitive':
+        vocabulary_size = 50
+    else:
+        vocabulary_size = max(10, min(50_000, tokens // 5))
+    vocabulary = build_vocabulary(vocabulary_size, charset, rng)
+
+    if distribution == 'zipf':
+        weights = [1.0 / (rank + 1) for rank in range(vocabulary_size)]
+        words = rng.choices(vocabulary, weights=weights, k=tokens)
+    else:
+        words = rng.choices(vocabulary, k=tokens)
+
+    separators = _SEPARATORS[charset]
+    parts = []
+    for word in words:
+        parts.append(rng.choice(_DECORATIONS).format(word))
+        parts.append(rng.choice(separators))
+    if parts:
+        parts.pop()
+    return ''.join(parts)
+
+
+def corpus_name(size: str, distribution: str, charset: str) -> str:
+    """Stabiler Name einer Korpus-Variante, z.B. 'medium-zipf-mixed'"""
+    return '%s-%s-%s' % (size, distribution, charset)
@@ -0,0 +1,410 @@
+"""
+Benchmark-Suite - alle Analysefunktionen, Paradigmen-Varianten und Flask-Routen
+Misst jede Funktion über synthetische Korpora (Grösse x Verteilung x Zeichensatz)
+und schreibt maschinenlesbare Ergebnisse, die zwischen Commits verglichen werden
+
+Aufruf:
+    python benchmarks/suite.py                          (Standard-Matrix)
+    python benchmarks/suite.py --sizes small,medium,large --charsets ascii,mixed
+    python benchmarks/suite.py --only 'get_top_words|/analyze'
+    python benchmarks/suite.py --compare benchmarks/results/<commit>.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Festplatten-Cache aus, sonst misst die Suite Treffer früherer Läufe
+os.environ.pop('TEXT_ANALYZER_CACHE_DIR', None)
+
+import app as app_module  # noqa: E402
+import functional_utils  # noqa: E402
+import length_backend  # noqa: E402
+import text_analyzer  # noqa: E402
+from corpora import CHARSETS, DISTRIBUTIONS, SIZES, corpus_name, generate_corpus  # noqa: E402
+from functional_utils import (  # noqa: E402
+    apply_transformations,
+    compose,
+    create_text_processor,
+    create_text_validator,
+    create_transformation_chain,
+    create_word_filter,
+    filter_with_predicate,
+    map_with_function,
+    pipe,
+    process_text_with_pipeline,
+    WordStream
+)
+from text_analyzer import TextProcessor  # noqa: E402
+
+
+RESULTS_DIRECTORY = os.path.join(ROOT, 'benchmarks', 'results')
+
+# Relative Verschlechterung des Medians, ab der --compare eine Regression meldet
+DEFAULT_THRESHOLD = 0.10
+
+
+class Case(NamedTuple):
+    """Ein Messfall: run(text) wird pro Korpus gemessen"""
+    name: str
+    group: str
+    run: Callable[[str], Any]
+
+
+# ============================================================================
+# Messfälle
+# ============================================================================
+
+def analyzer_cases() -> List[Case]:
+    """Alle öffentlichen Funktionen aus text_analyzer mit Standard-Parametern"""
+    ta = text_analyzer
+    calls = [
+        ('count_words', ta.count_words),
+        ('count_characters', ta.count_characters),
+        ('count_characters_no_spaces', ta.count_characters_no_spaces),
+        ('count_sentences', ta.count_sentences),
+        ('average_word_length', ta.average_word_length),
+        ('uppercase_text', ta.uppercase_text),
+        ('lowercase_text', ta.lowercase_text),
+        ('capitalize_text', ta.capitalize_text),
+        ('transform_text', lambda text: ta.transform_text(text, str.swapcase)),
+        ('analyze_text', ta.analyze_text),
+        ('find_longest_word', ta.find_longest_word),
+        ('find_shortest_word', ta.find_shortest_word),
+        ('transform_words_map', lambda text: ta.transform_words_map(text, str.upper)),
+        ('filter_words_by_length', lambda text: ta.filter_words_by_length(text, 5)),
+        ('calculate_total_word_length_reduce', ta.calculate_total_word_length_reduce),
+        ('count_long_words_combined', lambda text: ta.count_long_words_combined(text, 5)),
+        ('analyze_word_frequencies', ta.analyze_word_frequencies),
+        ('get_top_words', lambda text: ta.get_top_words(text, 10)),
+        ('analyze_text_stream', ta.analyze_text_stream),
+        ('get_top_words_stream', lambda text: ta.get_top_words_stream(text, 10)),
+        ('filter_words_with_lambda', lambda text: ta.filter_words_with_lambda(text, 3, 8)),
+        ('sort_words_by_criteria[length]', lambda text: ta.sort_words_by_criteria(text, 'length')),
+        ('sort_words_by_criteria[alphabetical]',
+         lambda text: ta.sort_words_by_criteria(text, 'alphabetical')),
+        ('remove_duplicates_sorted', ta.remove_duplicates_sorted),
+    ]
+    return [Case(name, 'text_analyzer', func) for name, func in calls]
+
+
+def paradigm_cases() -> List[Case]:
+    """Dieselbe Aufgabe prozedural, funktional und objektorientiert"""
+    ta = text_analyzer
+    calls = [
+        ('count_long_words_procedural', lambda text: ta.count_long_words_procedural(text, 5)),
+        ('count_long_words_functional', lambda text: ta.count_long_words_functional(text, 5)),
+        ('TextProcessor.count_long_words', lambda text: TextProcessor(text).count_long_words(5)),
+        ('process_text_procedural', lambda text: ta.process_text_procedural(text, 5)),
+        ('process_text_functional', lambda text: ta.process_text_functional(text, 5)),
+        ('TextProcessor.process', lambda text: TextProcessor(text).process(5)),
+    ]
+    return [Case(name, 'paradigms', func) for name, func in calls]
+
+
+def combinator_cases() -> List[Case]:
+    """Kombinatoren und Closures aus functional_utils"""
+    word_filter = create_word_filter(3, 8)
+    processor = create_text_processor({'case': 'lower', 'remove_spaces': False, 'min_length': 4})
+    validator = create_text_validator({'min_words': 10, 'max_words': 10_000_000,
+                                       'forbidden_words': ['spam', 'scam']})
+    chain = create_transformation_chain([str.strip, str.lower, str.title])
+    composed = compose(str.strip, str.lower, str.title)
+    calls = [
+        ('apply_transformations', lambda text: apply_transformations(text, [str.strip, str.lower])),
+        ('compose', composed),
+        ('pipe', lambda text: pipe(text, str.strip, str.lower, str.capitalize)),
+        ('create_transformation_chain', chain),
+        ('create_text_processor', processor),
+        ('create_word_filter', word_filter),
+        ('create_text_validator', validator),
+        ('filter_with_predicate', lambda text: filter_with_predicate(text.split(), str.isalpha)),
+        ('map_with_function', lambda text: map_with_function(text.split(), len)),
+        ('WordStream.map.filter', lambda text: WordStream(text).map(str.lower)
+         .filter(lambda w: len(w) > 3).to_list()),
+        ('process_text_with_pipeline', lambda text: process_text_with_pipeline(
+            text, [lambda t: len(t) > 0, lambda t: '\x00' not in t],
+            [str.strip, str.lower], [lambda w: len(w) > 2, str.isalpha])),
+    ]
+    return [Case(name, 'functional_utils', func) for name, func in calls]
+
+
+def route_cases() -> List[Case]:
+    """Flask-Routen über den Test-Client, inklusive JSON-Serialisierung"""
+    client = app_module.app.test_client()
+
+    def finish(path: str, response: Any) -> int:
+        # Antwort vollständig lesen (Streaming) und Fehler nicht als Messung werten
+        response.get_data()
+        if response.status_code != 200:
+            raise RuntimeError('%s antwortet mit %d' % (path, response.status_code))
+        return response.status_code
+
+    def post_json(path: str, **payload) -> Callable[[str], Any]:
+        def run(text: str) -> Any:
+            return finish(path, client.post(path, json=dict(payload, text=text)))
+        return run
+
+    def post_raw(path: str, mimetype: str, encode: Callable[[str], bytes]) -> Callable[[str], Any]:
+        def run(text: str) -> Any:
+            return finish(path, client.post(path, data=encode(text), content_type=mimetype))
+        return run
+
+    def as_documents(text: str) -> List[str]:
+        # Korpus in zehn Dokumente teilen, eines davon doppelt
+        words = text.split(' ')
+        step = max(1, len(words) // 10)
+        documents = [' '.join(words[i:i + step]) for i in range(0, len(words), step)]
+        return documents + documents[:1]
+
+    def batch(path: str, **params) -> Callable[[str], Any]:
+        def run(text: str) -> Any:
+            return finish(path, client.post(path, json=dict(params, documents=as_documents(text))))
+        return run
+
+    calls = [
+        ('/analyze', post_json('/analyze')),
+        ('/analyze/stream', post_raw('/analyze/stream', 'text/plain; charset=utf-8',
+                                     lambda text: text.encode('utf-8'))),
+        ('/transform', post_json('/transform', type='uppercase')),
+        ('/transform/advanced', post_json('/transform/advanced',
+                                          config={'case': 'lower', 'min_length': 3})),
+        ('/filter', post_json('/filter', min_length=3, max_length=10, remove_duplicates=True)),
+        ('/lambda/demo', post_json('/lambda/demo')),
+        ('/map-filter-reduce/demo', post_json('/map-filter-reduce/demo')),
+        ('/refactoring/demo', post_json('/refactoring/demo', min_length=5)),
+        ('/paradigms/compare', post_json('/paradigms/compare', min_length=5)),
+        ('/analyze/batch', batch('/analyze/batch', top_n=5)),
+        ('/filter/batch', batch('/filter/batch', min_length=3)),
+        ('/transform/batch', batch('/transform/batch', type='lowercase')),
+    ]
+    return [Case(name, 'routes', func) for name, func in calls]
+
+
+def all_cases(include_routes: bool = True) -> List[Case]:
+    cases = analyzer_cases() + paradigm_cases() + combinator_cases()
+    if include_routes:
+        cases += route_cases()
+    return cases
+
+
+# ============================================================================
+# Messung
+# ============================================================================
+
+def reset_caches() -> None:
+    """
+    Leert memoize- und Result-Cache, damit jede Wiederholung die volle Arbeit
+    misst und nicht einen Cache-Treffer der vorherigen
+    """
+    for value in vars(text_analyzer).values():
+        cache_clear = getattr(value, 'cache_clear', None)
+        if callable(cache_clear):
+            cache_clear()
+    app_module.result_cache.clear()
+
+
+def measure(case: Case, text: str, repeat: int, warmup: int, keep_caches: bool) -> List[float]:
+    """
+    Laufzeiten einer Funktion in Sekunden
+    Garbage Collection ist während der Messung aus (wie bei timeit)
+    """
+    for _ in range(warmup):
+        case.run(text)
+
+    timings = []
+    for _ in range(repeat):
+        if not keep_caches:
+            reset_caches()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            case.run(text)
+            timings.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return timings
+
+
+def summarize(timings: List[float], tokens: int) -> Dict[str, float]:
+    median = statistics.median(timings)
+    return {
+        'min': min(timings),
+        'median': median,
+        'mean': statistics.fmean(timings),
+        'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        'tokens_per_s': tokens / median if median > 0 else 0.0,
+    }
+
+
+def git_revision() -> Dict[str, Any]:
+    def git(*args: str) -> str:
+        try:
+            return subprocess.run(('git',) + args, cwd=ROOT, capture_output=True,
+                                  text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return ''
+    return {
+        'commit': git('rev-parse', 'HEAD'),
+        'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+    }
+
+
+def run_suite(cases: List[Case], corpora: List[tuple], repeat: int, warmup: int,
+              keep_caches: bool, progress: Callable[[str], None] = print) -> Dict[str, Any]:
+    results = []
+    for name, size_name, distribution, charset in corpora:
+        text = generate_corpus(SIZES[size_name], distribution, charset)
+        tokens = len(text.split())
+        for case in cases:
+            timings = measure(case, text, repeat, warmup, keep_caches)
+            entry = {
+                'case': case.name,
+                'group': case.group,
+                'corpus': name,
+                'tokens': tokens,
+                'characters': len(text),
+                'repeat': repeat,
+            }
+            entry.update(summarize(timings, tokens))
+            results.append(entry)
+            progress('%-24s %-40s %10.3f ms  %12.0f tok/s' % (
+                name, case.name, entry['median'] * 1000, entry['tokens_per_s']))
+
+    return {
+        'meta': {
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'parallel_workers': functional_utils.PARALLEL_WORKERS,
+            'length_backend': length_backend.BACKEND,
+            'repeat': repeat,
+            'warmup': warmup,
+            'keep_caches': keep_caches,
+            **git_revision(),
+        },
+        'results': results,
+    }
+
+
+# ============================================================================
+# Vergleich zwischen Commits
+# ============================================================================
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any],
+                    threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Vergleicht die Mediane je (Fall, Korpus)
+    ratio > 1 heisst langsamer als die Baseline
+    """
+    previous = {(r['case'], r['corpus']): r for r in baseline['results']}
+    rows = []
+    for result in current['results']:
+        before = previous.get((result['case'], result['corpus']))
+        if before is None or before['median'] <= 0:
+            continue
+        ratio = result['median'] / before['median']
+        rows.append({
+            'case': result['case'],
+            'corpus': result['corpus'],
+            'baseline': before['median'],
+            'current': result['median'],
+            'ratio': ratio,
+            'regression': ratio > 1 + threshold,
+            'improvement': ratio < 1 / (1 + threshold),
+        })
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]]) -> None:
+    print()
+    print('%-24s %-40s %11s %11s %8s' % ('Korpus', 'Fall', 'vorher [ms]', 'jetzt [ms]', 'Faktor'))
+    for row in sorted(rows, key=lambda r: r['ratio'], reverse=True):
+        marker = ' REGRESSION' if row['regression'] else (' besser' if row['improvement'] else '')
+        print('%-24s %-40s %11.3f %11.3f %7.2fx%s' % (
+            row['corpus'], row['case'], row['baseline'] * 1000, row['current'] * 1000,
+            row['ratio'], marker))
+
+
+# ============================================================================
+# Kommandozeile
+# ============================================================================
+
+def _choices(value: str, allowed) -> List[str]:
+    selected = [item.strip() for item in value.split(',') if item.strip()]
+    unknown = [item for item in selected if item not in allowed]
+    if unknown:
+        raise argparse.ArgumentTypeError('unbekannt: %s' % ', '.join(unknown))
+    return selected
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='small,medium',
+                        type=lambda v: _choices(v, SIZES))
+    parser.add_argument('--distributions', default='zipf,uniform',
+                        type=lambda v: _choices(v, DISTRIBUTIONS))
+    parser.add_argument('--charsets', default='ascii,mixed',
+                        type=lambda v: _choices(v, CHARSETS))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--only', help='Regex auf Fallnamen, z.B. "get_top_words|/analyze"')
+    parser.add_argument('--no-routes', action='store_true', help='Flask-Routen nicht messen')
+    parser.add_argument('--keep-caches', action='store_true',
+                        help='Caches zwischen Wiederholungen nicht leeren (misst Treffer)')
+    parser.add_argument('--output', help='JSON-Datei (Standard: benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', help='Ergebnisdatei eines anderen Commits als Baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='relative Verschlechterung, ab der eine Regression gemeldet wird')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help='Exit-Code 1, wenn --compare eine Regression findet')
+    args = parser.parse_args(argv)
+
+    cases = all_cases(include_routes=not args.no_routes)
+    if args.only:
+        pattern = re.compile(args.only)
+        cases = [case for case in cases if pattern.search(case.name)]
+    corpora = [
+        (corpus_name(size, distribution, charset), size, distribution, charset)
+        for size in args.sizes for distribution in args.distributions for charset in args.charsets
+    ]
+
+    report = run_suite(cases, corpora, args.repeat, args.warmup, args.keep_caches)
+
+    output = args.output
+    if output is None:
+        revision = (report['meta']['commit'] or 'unknown')[:12]
+        suffix = '-dirty' if report['meta']['dirty'] else ''
+        output = os.path.join(RESULTS_DIRECTORY, revision + suffix + '.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as handle:
+        json.dump(report, handle, indent=2)
+    print('\nErgebnisse: %s' % output)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as handle:
+            baseline = json.load(handle)
+        rows = compare_results(baseline, report, args.threshold)
+        print_comparison(rows)
+        if args.fail_on_regression and any(row['regression'] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
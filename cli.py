@@ -0,0 +1,225 @@
+"""
+Kommandozeile - Analyse lokaler Dateien ohne HTTP-Umweg
+Dateien werden per mmap eingeblendet und als memoryview-Abschnitte
+inkrementell dekodiert: die Analyse hält nie den ganzen Text als String,
+nur den aktuellen Chunk. Verzeichnisse werden rekursiv durchsucht und die
+Dateien in einem Prozess-Pool verarbeitet.
+
+Ausgabe: eine JSON-Zeile pro Datei (NDJSON) im Format des jeweiligen
+HTTP-Endpoints, ergänzt um "path".
+
+    python cli.py analyze texte/ --top-n 10
+    python cli.py filter brief.txt --min-length 4 --max-length 8
+    python cli.py transform brief.txt --type title
+"""
+
+import argparse
+import fnmatch
+import json
+import mmap
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from analysis_engine import DEFAULT_CHUNK_SIZE, complete_result, iter_text_chunks, stream_statistics
+from functional_utils import get_transformation, resolve
+from sketches import DEFAULT_ERROR, MIN_ERROR, approximate_result
+from text_analyzer import build_filter_result, build_transform_result
+
+
+EMPTY_TEXT_ERROR = 'Bitte geben Sie einen Text ein'
+DECODE_ERROR = 'Text konnte nicht dekodiert werden'
+
+
+# ============================================================================
+# Dateien einblenden
+# ============================================================================
+
+@contextmanager
+def mapped_file(path: str) -> Iterator[memoryview]:
+    """
+    Datei als schreibgeschützte memoryview (leere Dateien: leere Sicht)
+    Die Sicht ist nur innerhalb des with-Blocks gültig
+    """
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield memoryview(b'')
+            return
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        try:
+            yield view
+        finally:
+            try:
+                view.release()
+                mapped.close()
+            except BufferError:
+                # Nach einem Fehler hält der Traceback noch einen Abschnitt;
+                # die Abbildung wird dann beim Aufräumen des Objekts geschlossen
+                pass
+
+
+def iter_view_chunks(view: memoryview, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[memoryview]:
+    """
+    Abschnitte einer memoryview ohne Kopie
+    Jeder Abschnitt wird freigegeben, sobald der Decoder ihn gelesen hat
+    """
+    for start in range(0, len(view), chunk_size):
+        with view[start:start + chunk_size] as chunk:
+            yield chunk
+
+
+def read_text(view: memoryview, encoding: str) -> str:
+    """Ganzer Text, direkt aus dem Puffer dekodiert (ohne Zwischenkopie als bytes)"""
+    return str(view, encoding)
+
+
+# ============================================================================
+# Befehle: ein Ergebnis-Dictionary pro Datei
+# ============================================================================
+
+def analyze_file(path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Ergebnis wie /analyze (analyze_text + get_top_words in einem Durchlauf)
+    Der Text wird chunkweise aus der Datei dekodiert
+    """
+    with mapped_file(path) as view:
+        chunks = iter_text_chunks(iter_view_chunks(view), encoding=options['encoding'])
+        if options['approximate']:
+            result = approximate_result(chunks, options['top_n'], options['min_length'],
+                                        options['error'])
+        else:
+            statistics = stream_statistics(chunks, options['min_length'])
+            result = complete_result(statistics, options['top_n'])
+    if result['analysis']['word_count'] == 0:
+        return {'error': EMPTY_TEXT_ERROR}
+    return dict(result, success=True)
+
+
+def filter_file(path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Ergebnis wie /filter (filter_words_with_lambda, Sortierung, Duplikate)
+    Die Antwort enthält den Originaltext, er wird deshalb ganz dekodiert
+    """
+    with mapped_file(path) as view:
+        text = read_text(view, options['encoding'])
+    if not text.strip():
+        return {'error': EMPTY_TEXT_ERROR}
+    return resolve(build_filter_result(text, options['min_length'], options['max_length'],
+                                       options['remove_duplicates']))
+
+
+def transform_file(path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Ergebnis wie /transform"""
+    with mapped_file(path) as view:
+        text = read_text(view, options['encoding'])
+    if not text.strip():
+        return {'error': EMPTY_TEXT_ERROR}
+    return resolve(build_transform_result(text, get_transformation(options['type']), options['type']))
+
+
+COMMANDS: Dict[str, Callable[[str, Dict[str, Any]], Dict[str, Any]]] = {
+    'analyze': analyze_file,
+    'filter': filter_file,
+    'transform': transform_file,
+}
+
+
+def run_command(command: str, path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Führt einen Befehl für eine Datei aus; Fehler werden Teil des Ergebnisses
+    (Top-Level-Funktion, damit der Prozess-Pool sie per Referenz überträgt)
+    """
+    try:
+        result = COMMANDS[command](path, options)
+    except UnicodeDecodeError:
+        result = {'error': DECODE_ERROR}
+    except (OSError, ValueError) as error:
+        result = {'error': str(error)}
+    return dict(result, path=path)
+
+
+# ============================================================================
+# Dateien sammeln und verteilen
+# ============================================================================
+
+def collect_files(paths: List[str], pattern: str = '*') -> List[str]:
+    """
+    Dateien aus den Argumenten; Verzeichnisse rekursiv und sortiert,
+    gefiltert nach `pattern` (Dateien, die direkt genannt sind, immer)
+    """
+    files = []
+    for path in paths:
+        if not os.path.isdir(path):
+            files.append(path)
+            continue
+        for root, directories, names in os.walk(path):
+            directories.sort()
+            files.extend(os.path.join(root, name) for name in sorted(names)
+                         if fnmatch.fnmatch(name, pattern))
+    return files
+
+
+def run_files(command: str, files: List[str], options: Dict[str, Any],
+              workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Ergebnisse in der Reihenfolge der Dateien
+    Ab zwei Dateien und mehr als einem Worker in einem Prozess-Pool
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(files) < 2:
+        for path in files:
+            yield run_command(command, path, options)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(files))) as executor:
+        yield from executor.map(run_command, [command] * len(files), files,
+                                [options] * len(files))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Text Analyzer für lokale Dateien')
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('paths', nargs='+', help='Dateien oder Verzeichnisse')
+    common.add_argument('--pattern', default='*', help='Dateimuster in Verzeichnissen (Standard: *)')
+    common.add_argument('--encoding', default='utf-8')
+    common.add_argument('--workers', type=int, default=None,
+                        help='Prozesse für mehrere Dateien (Standard: CPU-Anzahl)')
+
+    commands = parser.add_subparsers(dest='command', required=True)
+    analyze = commands.add_parser('analyze', parents=[common], help='Wie POST /analyze')
+    analyze.add_argument('--top-n', type=int, default=5)
+    analyze.add_argument('--min-length', type=int, default=5)
+    analyze.add_argument('--approximate', action='store_true',
+                         help='Top-Wörter und Kardinalität aus Sketches (siehe sketches.py)')
+    analyze.add_argument('--error', type=float, default=DEFAULT_ERROR)
+
+    filter_command = commands.add_parser('filter', parents=[common], help='Wie POST /filter')
+    filter_command.add_argument('--min-length', type=int, default=0)
+    filter_command.add_argument('--max-length', type=int, default=100)
+    filter_command.add_argument('--remove-duplicates', action='store_true')
+
+    transform = commands.add_parser('transform', parents=[common], help='Wie POST /transform')
+    transform.add_argument('--type', default='uppercase')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == 'analyze' and args.approximate and not MIN_ERROR <= args.error < 1:
+        print('--error muss zwischen %g und 1 liegen' % MIN_ERROR, file=sys.stderr)
+        return 2
+    options = {key: value for key, value in vars(args).items()
+               if key not in ('command', 'paths', 'pattern', 'workers')}
+
+    failed = False
+    for result in run_files(args.command, collect_files(args.paths, args.pattern), options,
+                            args.workers):
+        failed = failed or 'error' in result
+        print(json.dumps(result, ensure_ascii=False, sort_keys=True), flush=True)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
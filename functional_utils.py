@@ -3,7 +3,22 @@ Functional Utilities - Höherwertige Funktionen, Closures, Funktionen als Objekt
 Implementiert B2G, B2F, B2E Kompetenzfelder
 """
 
-from typing import List, Callable, Dict, Any
+import atexit
+import copy
+import hashlib
+import multiprocessing
+import os
+import random
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial, reduce, wraps
+from itertools import chain, islice
+from typing import List, Callable, Dict, Any, Iterable, Iterator, Optional, Sequence, Tuple
 
 
 # ============================================================================
@@ -49,44 +64,556 @@ def apply_transformations(text: str, funcs: List[Callable[[str], str]]) -> str:
     """
     B2F: Funktionen als Argumente für andere Funktionen
     Wendet mehrere Transformationen nacheinander an
+    (kompiliert via compile_pipeline, redundante Schritte entfallen)
     """
-    result = text
-    for func in funcs:
-        result = func(result)
-    return result
+    return compile_pipeline(funcs)(text)
 
 
 def compose(*functions: Callable) -> Callable:
     """
     B2F: Funktionen-Komposition - erstellt neue Funktion aus mehreren
+    Die Kette wird einmal kompiliert und fusioniert (compile_pipeline)
     """
-    def composed(x):
-        result = x
-        for func in functions:
-            result = func(result)
-        return result
-    return composed
+    return compile_pipeline(functions)
 
 
 def pipe(text: str, *functions: Callable) -> str:
     """
     B2F: Pipeline-Pattern - führt Funktionen sequenziell aus
     """
-    return apply_transformations(text, list(functions))
+    return compile_pipeline(functions)(text)
 
 
-def filter_with_predicate(items: List[str], predicate: Callable[[str], bool]) -> List[str]:
+def filter_with_predicate(items: Iterable[str], predicate: Callable[[str], bool]) -> List[str]:
     """
     B2F: Höherwertige Funktion - Filter mit beliebigem Prädikat
+    Akzeptiert auch einen WordStream; nur das Ergebnis wird als Liste gebaut
     """
-    return [item for item in items if predicate(item)]
+    return WordStream.from_iterable(items).filter(predicate).to_list()
 
 
-def map_with_function(items: List[str], func: Callable[[str], Any]) -> List[Any]:
+def map_with_function(items: Iterable[str], func: Callable[[str], Any]) -> List[Any]:
     """
     B2F: Höherwertige Funktion - Map mit beliebiger Transformationsfunktion
+    Akzeptiert auch einen WordStream; nur das Ergebnis wird als Liste gebaut
     """
-    return [func(item) for item in items]
+    return WordStream.from_iterable(items).map(func).to_list()
+
+
+# ============================================================================
+# B4: Lazy Wortstrom - Map/Filter/Reduce ohne Zwischenlisten
+# ============================================================================
+
+# Entspricht exakt den Wortgrenzen von str.split() (gleiche Unicode-Whitespace-Definition)
+WORD_PATTERN = re.compile(r'\S+')
+
+
+class WordStream:
+    """
+    Lazy Folge von Wörtern
+    Über einem Text werden Wörter per re.finditer einzeln erzeugt statt mit
+    text.split() eine komplette Liste zu bauen. map/filter/take liefern neue
+    WordStreams ohne etwas zu berechnen; erst to_list()/reduce()/Iteration
+    (in app.py: die JSON-Serialisierung) werten die Kette aus.
+    Ein WordStream kann mehrfach durchlaufen werden.
+    """
+
+    __slots__ = ('_iterate',)
+
+    def __init__(self, text: str = ''):
+        self._iterate = partial(_iter_words, text)
+
+    @classmethod
+    def from_iterable(cls, items: Iterable[Any]) -> 'WordStream':
+        """WordStream über bereits zerlegte Elemente (Liste, Generator, WordStream)"""
+        if isinstance(items, WordStream):
+            return items
+        return cls._from_factory(partial(iter, items))
+
+    @classmethod
+    def _from_factory(cls, factory: Callable[[], Iterator[Any]]) -> 'WordStream':
+        stream = cls.__new__(cls)
+        stream._iterate = factory
+        return stream
+
+    def __iter__(self) -> Iterator[Any]:
+        return self._iterate()
+
+    def map(self, func: Callable[[Any], Any]) -> 'WordStream':
+        """Lazy map"""
+        return WordStream._from_factory(lambda: map(func, self._iterate()))
+
+    def filter(self, predicate: Callable[[Any], bool]) -> 'WordStream':
+        """Lazy filter"""
+        return WordStream._from_factory(lambda: filter(predicate, self._iterate()))
+
+    def take(self, count: int) -> 'WordStream':
+        """Lazy: nur die ersten count Elemente - der Rest wird nie erzeugt"""
+        return WordStream._from_factory(lambda: islice(self._iterate(), count))
+
+    def reduce(self, func: Callable[[Any, Any], Any], initial: Any) -> Any:
+        """Wertet den Strom aus und reduziert ihn auf einen Wert"""
+        return reduce(func, self._iterate(), initial)
+
+    def to_list(self) -> List[Any]:
+        """Materialisiert den Strom als Liste"""
+        return list(self._iterate())
+
+
+def _iter_words(text: str) -> Iterator[str]:
+    return map(re.Match.group, WORD_PATTERN.finditer(text))
+
+
+def iter_word_spans(text: str) -> Iterator[Tuple[int, int]]:
+    """
+    Start- und End-Offsets aller Wörter, ohne Teil-Strings zu erzeugen
+    """
+    return (match.span() for match in WORD_PATTERN.finditer(text))
+
+
+# ============================================================================
+# Pipeline-Compiler - fusioniert Transformationsketten
+# ============================================================================
+
+class WordStep:
+    """
+    Wort-Schritt einer Pipeline: map oder filter über text.split()
+    Einzeln aufgerufen verhält er sich wie eine Text-Transformation
+    (Wörter verarbeiten, mit Leerzeichen verbinden). In einer kompilierten
+    Pipeline werden aufeinanderfolgende Wort-Schritte in einem Durchlauf
+    pro Token ausgeführt, ohne Zwischen-Strings.
+    """
+
+    __slots__ = ('kind', 'func')
+
+    def __init__(self, kind: str, func: Callable):
+        self.kind = kind
+        self.func = func
+
+    def __call__(self, text: str) -> str:
+        words = text.split()
+        if self.kind == 'map':
+            return ' '.join(map(self.func, words))
+        return ' '.join(filter(self.func, words))
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, WordStep) and (self.kind, self.func) == (other.kind, other.func)
+
+    def __hash__(self) -> int:
+        return hash((self.kind, self.func))
+
+    def __repr__(self) -> str:
+        return 'WordStep(%r, %r)' % (self.kind, self.func)
+
+
+def map_words(func: Callable[[str], str]) -> WordStep:
+    """
+    B2F: Wort-Schritt - wendet func auf jedes Wort an
+    """
+    return WordStep('map', func)
+
+
+def filter_words(predicate: Callable[[str], bool]) -> WordStep:
+    """
+    B2F: Wort-Schritt - behält nur Wörter, für die predicate True liefert
+    """
+    return WordStep('filter', predicate)
+
+
+# Bekannte Text-Schritte (aus TEXT_TRANSFORMATIONS)
+_CASE_STEPS = frozenset([str.upper, str.lower, str.capitalize, str.title])
+
+
+def _is_known(step: Any, candidates: frozenset) -> bool:
+    try:
+        return step in candidates
+    except TypeError:
+        return False
+
+
+class _CaseRun:
+    """
+    Direkt aufeinanderfolgende Case-Schritte (z.B. lower -> upper)
+    Bei reinem ASCII-Text bestimmt nur der letzte das Ergebnis. Für Unicode
+    gilt das nicht ('ß'.upper() == 'SS'), dort läuft die ganze Kette.
+    Geprüft wird der Zwischenwert, den die Stufe erhält - frühere Schritte
+    können Nicht-ASCII-Zeichen hinzufügen.
+    """
+
+    __slots__ = ('steps',)
+
+    def __init__(self, steps: List[Callable]):
+        self.steps = tuple(steps)
+
+    def __call__(self, value: Any) -> Any:
+        if isinstance(value, str) and value.isascii():
+            return self.steps[-1](value)
+        for step in self.steps:
+            value = step(value)
+        return value
+
+
+def _simplify_steps(steps: tuple) -> List[Callable]:
+    """
+    Entfernt redundante Schritte
+    - strip direkt nach strip ist wirkungslos (idempotent)
+    - direkt aufeinanderfolgende Case-Schritte werden zu einem _CaseRun
+    """
+    simplified: List[Callable] = []
+    case_run: List[Callable] = []
+    for step in steps + (None,):
+        if step is not None and _is_known(step, _CASE_STEPS):
+            case_run.append(step)
+            continue
+        if case_run:
+            simplified.append(case_run[0] if len(case_run) == 1 else _CaseRun(case_run))
+            case_run = []
+        if step is None:
+            break
+        if step is str.strip and simplified and simplified[-1] is str.strip:
+            continue
+        simplified.append(step)
+    return simplified
+
+
+def _fuse_word_steps(steps: List[Callable]) -> List[Callable]:
+    """
+    Fasst aufeinanderfolgende WordSteps zu einer Funktion zusammen
+    """
+    stages: List[Callable] = []
+    run: List[WordStep] = []
+    for step in steps + [None]:
+        if isinstance(step, WordStep):
+            run.append(step)
+            continue
+        if run:
+            stages.append(run[0] if len(run) == 1 else _make_word_pass(tuple(run)))
+            run = []
+        if step is not None:
+            stages.append(step)
+    return stages
+
+
+def _make_word_pass(word_steps: tuple) -> Callable[[str], str]:
+    """
+    Ein Durchlauf über die Tokens für mehrere Wort-Schritte
+    Folgt ein Schritt auf ein map, werden dessen Ergebnisse erneut zerlegt -
+    das entspricht exakt dem Zerlegen des verbundenen Zwischen-Strings.
+    """
+    def word_pass(text: str) -> str:
+        words = iter(text.split())
+        after_map = False
+        for step in word_steps:
+            if after_map:
+                words = chain.from_iterable(map(str.split, words))
+            if step.kind == 'map':
+                words = map(step.func, words)
+            else:
+                words = filter(step.func, words)
+            after_map = step.kind == 'map'
+        return ' '.join(words)
+    return word_pass
+
+
+class CompiledPipeline:
+    """
+    Kompilierte Transformationskette
+    Ein Plan mit fusionierten Wort-Schritten; Case-Schritte werden nur
+    vereinfacht, wenn der Zwischenwert an dieser Stelle ASCII ist (_CaseRun)
+    """
+
+    __slots__ = ('steps', '_stages')
+
+    def __init__(self, steps: tuple):
+        self.steps = steps
+        self._stages = _fuse_word_steps(_simplify_steps(steps))
+
+    def __call__(self, value: Any) -> Any:
+        result = value
+        for stage in self._stages:
+            result = stage(result)
+        return result
+
+
+@lru_cache(maxsize=256)
+def _compile_cached(steps: tuple) -> CompiledPipeline:
+    return CompiledPipeline(steps)
+
+
+def compile_pipeline(steps: Any) -> CompiledPipeline:
+    """
+    B2F: Kompiliert eine Liste von Transformationen
+    Gleiche Ketten werden nur einmal kompiliert (LRU-Cache). Nicht hashbare
+    Schritte verhindern nur das Caching, nicht die Kompilierung.
+    """
+    steps = tuple(steps)
+    try:
+        return _compile_cached(steps)
+    except TypeError:
+        return CompiledPipeline(steps)
+
+
+# ============================================================================
+# Memoization - Closure mit Cache für pure functions
+# ============================================================================
+
+def _update_digest(digest: Any, value: Any) -> None:
+    """
+    Schreibt ein Argument typisiert und längen-präfixiert in den Hash
+    Objekte mit cache_key() liefern ihren eigenen stabilen Schlüssel
+    """
+    if isinstance(value, str):
+        tag, data = b's', value.encode('utf-8', 'surrogatepass')
+    elif isinstance(value, (bytes, bytearray)):
+        tag, data = b'b', bytes(value)
+    elif hasattr(value, 'cache_key'):
+        tag, data = b'k', value.cache_key().encode('utf-8')
+    else:
+        tag, data = b'r', (type(value).__qualname__ + ':' + repr(value)).encode('utf-8')
+    digest.update(tag)
+    digest.update(len(data).to_bytes(8, 'big'))
+    digest.update(data)
+
+
+def digest_arguments(args: tuple, kwargs: Dict[str, Any]) -> bytes:
+    """
+    Fester 16-Byte-Schlüssel für beliebige Argumente
+    Grosse Strings werden nur gehasht, nicht als Schlüssel festgehalten
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for value in args:
+        _update_digest(digest, value)
+    for name in sorted(kwargs):
+        _update_digest(digest, name)
+        _update_digest(digest, kwargs[name])
+    return digest.digest()
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Ungefährer Speicherbedarf eines Ergebnisses inklusive Inhalt
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item) for item in value)
+    return size
+
+
+def memoize(max_bytes: int = 32 * 1024 * 1024, ttl: Optional[float] = None) -> Callable:
+    """
+    B2E: Höherwertige Funktion - cached Ergebnisse einer pure function
+    Schlüssel ist ein Digest der Argumente, verdrängt wird nach LRU bis die
+    Ergebnisse zusammen höchstens max_bytes belegen. Einträge älter als
+    ttl Sekunden gelten als abgelaufen. Thread-sicher für den Flask-Server.
+    Veränderbare Ergebnisse (dict, list) werden flach kopiert zurückgegeben,
+    damit Aufrufer den Cache nicht verändern können.
+    """
+    def decorator(func: Callable) -> Callable:
+        entries: 'OrderedDict[bytes, tuple]' = OrderedDict()
+        lock = threading.Lock()
+        stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expired': 0, 'bytes': 0}
+
+        def evict(key: bytes) -> None:
+            _, size, _ = entries.pop(key)
+            stats['bytes'] -= size
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = digest_arguments(args, kwargs)
+            now = time.monotonic()
+            with lock:
+                entry = entries.get(key)
+                if entry is not None:
+                    if entry[0] is not None and entry[0] <= now:
+                        evict(key)
+                        stats['expired'] += 1
+                    else:
+                        entries.move_to_end(key)
+                        stats['hits'] += 1
+                        return copy.copy(entry[2])
+                stats['misses'] += 1
+
+            result = func(*args, **kwargs)
+            size = estimate_size(result)
+            if size > max_bytes:
+                return result
+
+            expires_at = now + ttl if ttl is not None else None
+            with lock:
+                if key in entries:
+                    evict(key)
+                entries[key] = (expires_at, size, result)
+                stats['bytes'] += size
+                while stats['bytes'] > max_bytes:
+                    evict(next(iter(entries)))
+                    stats['evictions'] += 1
+            return copy.copy(result)
+
+        def cache_info() -> Dict[str, Any]:
+            """Trefferzähler und Füllstand des Caches"""
+            with lock:
+                return dict(stats, entries=len(entries), max_bytes=max_bytes, ttl=ttl)
+
+        def cache_clear() -> None:
+            """Leert den Cache"""
+            with lock:
+                entries.clear()
+                stats['bytes'] = 0
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
+
+
+# ============================================================================
+# Mehrfach-Suche: viele Wörter in einem Durchlauf (Aho-Corasick)
+# ============================================================================
+
+# Ab so vielen erforderlichen Wörtern sucht create_text_validator mit einem
+# Automaten statt mit einer Substring-Suche (in C) pro Wort. Gemessen mit
+# benchmarks/bench_keywords.py (1.4 MB Text): bei 128 Wörtern ist die
+# Substring-Suche noch gleich schnell oder schneller, ab 256 der Automat
+AUTOMATON_THRESHOLD = int(os.environ.get('TEXT_ANALYZER_AUTOMATON_THRESHOLD', 256))
+
+# Obergrenze für alle zwischengespeicherten Regelsätze zusammen (ein Automat
+# über 2000 Wörter belegt etwa 14 MB)
+REQUIRED_WORDS_CACHE_BYTES = int(os.environ.get('TEXT_ANALYZER_REQUIRED_WORDS_CACHE_BYTES',
+                                                64 * 1024 * 1024))
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick-Automat über einer festen Menge von Wörtern
+    Die Fehler-Übergänge sind beim Aufbau in die Übergangstabellen
+    eingerechnet (ein Dictionary pro Zustand): der Suchlauf braucht einen
+    Zugriff pro Zeichen, unabhängig von der Anzahl Wörter. Treffer werden
+    als Bitmaske über die Positionen in `words` gesammelt.
+    """
+
+    __slots__ = ('words', '_transitions', '_outputs', '_complete', '_size')
+
+    def __init__(self, words: Sequence[str]):
+        self.words = tuple(words)
+        goto: List[Dict[str, int]] = [{}]
+        outputs = [0]
+        for position, word in enumerate(self.words):
+            state = 0
+            for char in word:
+                following = goto[state].get(char)
+                if following is None:
+                    following = len(goto)
+                    goto[state][char] = following
+                    goto.append({})
+                    outputs.append(0)
+                state = following
+            outputs[state] |= 1 << position
+        
+        # Breitensuche: der Fehler-Zustand liegt immer näher an der Wurzel
+        # und ist deshalb schon vollständig, wenn er gebraucht wird
+        fail = [0] * len(goto)
+        transitions: List[Optional[Dict[str, int]]] = [None] * len(goto)
+        transitions[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            fallback = fail[state]
+            outputs[state] |= outputs[fallback]
+            transitions[state] = {**transitions[fallback], **goto[state]}
+            for char, following in goto[state].items():
+                fail[following] = transitions[fallback].get(char, 0) if state else 0
+                queue.append(following)
+        
+        self._transitions = transitions
+        self._outputs = outputs
+        self._complete = (1 << len(self.words)) - 1
+        self._size = (object.__sizeof__(self) + estimate_size(self.words)
+                      + sys.getsizeof(transitions) + sum(map(sys.getsizeof, transitions))
+                      + sys.getsizeof(outputs) + sum(map(sys.getsizeof, outputs)))
+
+    def __sizeof__(self) -> int:
+        """Speicherbedarf inklusive Übergangstabellen (für den Cache der Regelsätze)"""
+        return self._size
+
+    def found(self, text: str) -> int:
+        """Bitmaske der Wörter, die in text vorkommen (ein Durchlauf, endet, sobald alle gefunden sind)"""
+        transitions = self._transitions
+        outputs = self._outputs
+        complete = self._complete
+        state = 0
+        # Leere Wörter sind in jedem Text enthalten (Ausgabe der Wurzel)
+        found = outputs[0]
+        for char in text:
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                found |= outputs[state]
+                if found == complete:
+                    break
+        return found
+
+    def contains_all(self, text: str) -> bool:
+        return self.found(text) == self._complete
+
+
+class RequiredWords:
+    """
+    Kompilierte required_words-Regel für create_text_validator
+    Vergleich wie bisher ohne Gross-/Kleinschreibung als Teilstring
+    (required_word.lower() in text.lower()). Kleine Regelsätze prüft die
+    Substring-Suche in C schneller als ein Durchlauf in Python; ab
+    AUTOMATON_THRESHOLD Wörtern sucht ein KeywordAutomaton alle auf einmal.
+    """
+
+    __slots__ = ('words', '_patterns', '_automaton')
+
+    def __init__(self, words: Iterable[str]):
+        # Wörter mit gleicher Kleinschreibung nur einmal (erste Schreibweise gewinnt)
+        unique = {}
+        for word in words:
+            unique.setdefault(word.lower(), word)
+        self.words = tuple(unique.values())
+        self._patterns = tuple(unique)
+        self._automaton = (KeywordAutomaton(self._patterns)
+                           if len(self._patterns) >= AUTOMATON_THRESHOLD else None)
+
+    def missing(self, text: str) -> List[str]:
+        """Fehlende Wörter in der Reihenfolge der Regel"""
+        text_lower = text.lower()
+        if self._automaton is None:
+            return [word for word, pattern in zip(self.words, self._patterns)
+                    if pattern not in text_lower]
+        found = self._automaton.found(text_lower)
+        return [word for position, word in enumerate(self.words) if not found >> position & 1]
+
+    def __sizeof__(self) -> int:
+        automaton = sys.getsizeof(self._automaton) if self._automaton is not None else 0
+        return (object.__sizeof__(self) + estimate_size(self.words)
+                + estimate_size(self._patterns) + automaton)
+
+    def contains_all(self, text: str) -> bool:
+        """True, wenn alle Wörter vorkommen; bricht beim ersten fehlenden bzw. letzten gefundenen ab"""
+        text_lower = text.lower()
+        if self._automaton is None:
+            return all(pattern in text_lower for pattern in self._patterns)
+        return self._automaton.contains_all(text_lower)
+
+
+@memoize(max_bytes=REQUIRED_WORDS_CACHE_BYTES)
+def _compile_required_words_cached(words: tuple) -> RequiredWords:
+    return RequiredWords(words)
+
+
+def compile_required_words(words: Iterable[str]) -> RequiredWords:
+    """
+    Kompiliert eine required_words-Regel
+    Gleiche Regelsätze werden prozessweit wiederverwendet, auch über
+    Validatoren und Requests hinweg; der Cache ist nach Speicherbedarf der
+    Automaten begrenzt (REQUIRED_WORDS_CACHE_BYTES, LRU)
+    """
+    return _compile_required_words_cached(tuple(words))
 
 
 # ============================================================================
@@ -100,35 +627,51 @@ def create_text_processor(config: Dict[str, Any]) -> Callable[[str], str]:
     Die Konfiguration wird in der Closure gespeichert
     """
     case_mode = config.get('case', 'none')  # 'upper', 'lower', 'none'
-    remove_spaces = config.get('remove_spaces', False)
+    remove_spaces = bool(config.get('remove_spaces', False))
     min_length = config.get('min_length', 0)
     
+    # Gleiche Konfiguration, gleiche kompilierte Pipeline (auch über Requests)
+    try:
+        pipeline = _text_processor_pipeline(case_mode, remove_spaces, min_length)
+    except TypeError:
+        pipeline = _build_text_processor_pipeline(case_mode, remove_spaces, min_length)
+    
     def process(text: str) -> str:
         """
-        Closure hat Zugriff auf case_mode, remove_spaces, min_length
+        Closure hat Zugriff auf die aus case_mode, remove_spaces und
+        min_length kompilierte Pipeline
         """
-        result = text
-        
-        # Wende Case-Transformation an
-        if case_mode == 'upper':
-            result = result.upper()
-        elif case_mode == 'lower':
-            result = result.lower()
-        
-        # Entferne Leerzeichen falls konfiguriert
-        if remove_spaces:
-            result = result.replace(' ', '')
-        
-        # Filtere nach Mindestlänge
-        words = result.split()
-        filtered_words = [w for w in words if len(w) >= min_length]
-        result = ' '.join(filtered_words)
-        
-        return result
+        return pipeline(text)
     
     return process
 
 
+def _build_text_processor_pipeline(case_mode: Any, remove_spaces: bool,
+                                   min_length: Any) -> CompiledPipeline:
+    """Übersetzt die Konfiguration von create_text_processor in eine Pipeline"""
+    steps: List[Callable] = []
+    if case_mode == 'upper':
+        steps.append(str.upper)
+    elif case_mode == 'lower':
+        steps.append(str.lower)
+    if remove_spaces:
+        steps.append(_remove_spaces)
+    steps.append(filter_words(lambda w: len(w) >= min_length))
+    return CompiledPipeline(tuple(steps))
+
+
+@lru_cache(maxsize=256)
+def _text_processor_pipeline(case_mode: Any, remove_spaces: bool,
+                             min_length: Any) -> CompiledPipeline:
+    # Schlüssel ist das Konfigurations-Tupel: der Längenfilter entsteht pro
+    # Konfiguration nur einmal, statt bei jedem Aufruf als neues Lambda
+    return _build_text_processor_pipeline(case_mode, remove_spaces, min_length)
+
+
+def _remove_spaces(text: str) -> str:
+    return text.replace(' ', '')
+
+
 def create_word_filter(min_length: int, max_length: int) -> Callable[[str], List[str]]:
     """
     B2E: Closure - erstellt Filter-Funktion mit gespeicherten Parametern
@@ -160,11 +703,13 @@ def create_counter() -> Callable[[], int]:
 def create_text_validator(rules: Dict[str, Any]) -> Callable[[str], bool]:
     """
     B2E: Closure - erstellt Validator mit gespeicherten Regeln
+    validate.missing_words(text) listet die fehlenden required_words
     """
     min_words = rules.get('min_words', 0)
     max_words = rules.get('max_words', float('inf'))
     min_chars = rules.get('min_chars', 0)
-    required_words = rules.get('required_words', [])
+    # Regelsatz einmal kompilieren (bei vielen Wörtern: ein Automat für alle)
+    required_words = compile_required_words(rules.get('required_words', []))
     
     def validate(text: str) -> bool:
         """
@@ -182,13 +727,10 @@ def create_text_validator(rules: Dict[str, Any]) -> Callable[[str], bool]:
             return False
         
         # Prüfe erforderliche Wörter
-        text_lower = text.lower()
-        for required_word in required_words:
-            if required_word.lower() not in text_lower:
-                return False
-        
-        return True
+        return required_words.contains_all(text)
     
+    # Welche erforderlichen Wörter einem Text fehlen: validate.missing_words(text)
+    validate.missing_words = required_words.missing
     return validate
 
 
@@ -200,15 +742,235 @@ def create_transformation_chain(transformations: List[Callable[[str], str]]) ->
     def transform(text: str) -> str:
         """
         Closure hat Zugriff auf transformations-Liste
+        Die Kette wird kompiliert; wiederholte Aufrufe treffen den Compiler-Cache
         """
-        result = text
-        for transform_func in transformations:
-            result = transform_func(result)
-        return result
+        return compile_pipeline(transformations)(text)
     
     return transform
 
 
+# ============================================================================
+# Adaptive Prädikate: Konjunktion, billige und selektive Prädikate zuerst
+# ============================================================================
+
+# Jede wievielte Auswertung als Stichprobe gemessen wird (Kosten und Trefferquote)
+PREDICATE_SAMPLE_INTERVAL = int(os.environ.get('TEXT_ANALYZER_PREDICATE_SAMPLE_INTERVAL', 64))
+
+# Stichproben, bevor die Reihenfolge zum ersten Mal angepasst wird
+PREDICATE_MIN_SAMPLES = 8
+
+# Höchstens so viele kompilierte Prädikat-Listen samt Statistik werden behalten
+COMPILED_PREDICATES_MAX = 256
+
+
+def _describe(func: Callable) -> str:
+    """Lesbarer Name für die Statistik; Lambdas und lokale Funktionen mit Fundstelle"""
+    name = getattr(func, '__qualname__', None) or repr(func)
+    code = getattr(func, '__code__', None)
+    if code is not None and ('<lambda>' in name or '<locals>' in name):
+        name = '%s (%s:%d)' % (name, os.path.basename(code.co_filename), code.co_firstlineno)
+    return name
+
+
+class PredicateStats:
+    """Gemessene Stichproben eines Prädikats: Laufzeit und wie oft es zutraf"""
+
+    __slots__ = ('name', 'samples', 'passed', 'seconds')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.samples = 0
+        self.passed = 0
+        self.seconds = 0.0
+
+    @property
+    def rank(self) -> float:
+        """
+        Erwartete Kosten pro Ablehnung (kleiner = früher auswerten)
+        Für unabhängige Prädikate minimiert diese Reihenfolge die erwarteten
+        Gesamtkosten einer Konjunktion; Prädikate, die nie ablehnen, zuletzt
+        """
+        rejected = self.samples - self.passed
+        if not rejected:
+            return float('inf')
+        return self.seconds / rejected
+
+
+class AdaptivePredicate:
+    """
+    Konjunktion mehrerer Prädikate, kompiliert zu einem Prädikat
+    Jede PREDICATE_SAMPLE_INTERVAL-te Auswertung ist eine Stichprobe: alle
+    Prädikate laufen einzeln gemessen, danach wird die Reihenfolge nach
+    PredicateStats.rank neu bestimmt. Alle anderen Auswertungen brechen in
+    der aktuellen Reihenfolge beim ersten False ab; filter() kettet dafür
+    eingebaute filter()-Stufen, Builtins wie str.isalpha laufen so ganz in C.
+
+    Voraussetzung für das Umordnen sind pure functions. Wirft ein Prädikat,
+    gilt ab dann wieder die Reihenfolge des Aufrufers, und der Wert wird in
+    dieser Reihenfolge neu ausgewertet - das Ergebnis (oder die Exception)
+    ist dasselbe wie ohne Umordnen.
+    """
+
+    def __init__(self, predicates: Sequence[Callable[[Any], bool]], label: str = ''):
+        self.predicates = tuple(predicates)
+        self.label = label
+        self.stats = [PredicateStats(_describe(predicate)) for predicate in self.predicates]
+        self.order = tuple(range(len(self.predicates)))
+        self.adaptive = len(self.predicates) > 1
+        self.evaluations = 0
+        self.reorders = 0
+        self._ordered = self.predicates
+        self._lock = threading.Lock()
+
+    def _sample(self, value: Any) -> bool:
+        """Alle Prädikate einzeln gemessen; danach ggf. neue Reihenfolge"""
+        results = []
+        timings = []
+        try:
+            for predicate in self.predicates:
+                start = time.perf_counter()
+                results.append(bool(predicate(value)))
+                timings.append(time.perf_counter() - start)
+        except Exception:
+            return self._fall_back(value)
+        with self._lock:
+            for stats, passed, seconds in zip(self.stats, results, timings):
+                stats.samples += 1
+                stats.passed += passed
+                stats.seconds += seconds
+            if self.stats[0].samples >= PREDICATE_MIN_SAMPLES:
+                order = tuple(sorted(self.order, key=lambda position: self.stats[position].rank))
+                if order != self.order:
+                    self.order = order
+                    self._ordered = tuple(self.predicates[position] for position in order)
+                    self.reorders += 1
+        return all(results)
+
+    def _keep_caller_order(self) -> None:
+        # Ein Prädikat hat geworfen: Reihenfolge des Aufrufers, nicht mehr umordnen
+        with self._lock:
+            self.adaptive = False
+            self.order = tuple(range(len(self.predicates)))
+            self._ordered = self.predicates
+
+    def _fall_back(self, value: Any) -> bool:
+        self._keep_caller_order()
+        return all(predicate(value) for predicate in self.predicates)
+
+    def __call__(self, value: Any) -> bool:
+        with self._lock:
+            self.evaluations += 1
+            sample = self.adaptive and self.evaluations % PREDICATE_SAMPLE_INTERVAL == 1
+        if sample:
+            return self._sample(value)
+        ordered = self._ordered
+        try:
+            for predicate in ordered:
+                if not predicate(value):
+                    return False
+            return True
+        except Exception:
+            if ordered is self.predicates:
+                raise
+            return self._fall_back(value)
+
+    def filter(self, items: Iterable[Any]) -> Iterator[Any]:
+        """
+        Lazy: Elemente, für die alle Prädikate zutreffen
+        Blockweise je PREDICATE_SAMPLE_INTERVAL Elemente, das erste jedes
+        Blocks ist die Stichprobe
+        """
+        iterator = iter(items)
+        while True:
+            block = list(islice(iterator, PREDICATE_SAMPLE_INTERVAL))
+            if not block:
+                return
+            with self._lock:
+                self.evaluations += len(block)
+                sample = self.adaptive
+            start = 0
+            if sample:
+                if self._sample(block[0]):
+                    yield block[0]
+                start = 1
+            ordered = self._ordered
+            try:
+                passed = _filter_all(ordered, islice(block, start, None))
+            except Exception:
+                if ordered is self.predicates:
+                    raise
+                self._keep_caller_order()
+                passed = _filter_all(self.predicates, islice(block, start, None))
+            yield from passed
+
+    def report(self) -> Dict[str, Any]:
+        """Statistik für /pipeline/stats; Prädikate in der aktuellen Reihenfolge"""
+        with self._lock:
+            predicates = []
+            for position in self.order:
+                stats = self.stats[position]
+                predicates.append({
+                    'name': stats.name,
+                    'caller_position': position,
+                    'samples': stats.samples,
+                    'pass_rate': round(stats.passed / stats.samples, 4) if stats.samples else None,
+                    'mean_cost_us': (round(stats.seconds / stats.samples * 1e6, 3)
+                                     if stats.samples else None)
+                })
+            return {
+                'label': self.label,
+                'evaluations': self.evaluations,
+                'reorders': self.reorders,
+                'adaptive': self.adaptive,
+                'predicates': predicates
+            }
+
+
+def _filter_all(predicates: Sequence[Callable[[Any], bool]], items: Iterable[Any]) -> List[Any]:
+    # Eine filter()-Stufe pro Prädikat: spätere Stufen sehen nur die Treffer der früheren
+    for predicate in predicates:
+        items = filter(predicate, items)
+    return list(items)
+
+
+_compiled_predicates: 'OrderedDict[tuple, AdaptivePredicate]' = OrderedDict()
+_compiled_predicates_lock = threading.Lock()
+
+
+def compile_predicates(predicates: Iterable[Callable[[Any], bool]], label: str = '') -> AdaptivePredicate:
+    """
+    B2F: Kompiliert eine Liste von Prädikaten zu einer adaptiven Konjunktion
+    Listen derselben Funktionsobjekte werden nur einmal kompiliert, die
+    Statistik sammelt sich über alle Aufrufe (LRU, COMPILED_PREDICATES_MAX).
+    Bei jedem Aufruf neu erzeugte Lambdas passen sich nur innerhalb des
+    Aufrufs an; nicht hashbare Prädikate verhindern nur das Caching.
+    """
+    predicates = tuple(predicates)
+    if not predicates:
+        return AdaptivePredicate(predicates, label)
+    key = (label,) + predicates
+    try:
+        hash(key)
+    except TypeError:
+        return AdaptivePredicate(predicates, label)
+    with _compiled_predicates_lock:
+        compiled = _compiled_predicates.get(key)
+        if compiled is None:
+            compiled = _compiled_predicates[key] = AdaptivePredicate(predicates, label)
+            if len(_compiled_predicates) > COMPILED_PREDICATES_MAX:
+                _compiled_predicates.popitem(last=False)
+        else:
+            _compiled_predicates.move_to_end(key)
+    return compiled
+
+
+def predicate_stats() -> List[Dict[str, Any]]:
+    """Statistik aller kompilierten Prädikat-Listen, zuletzt verwendete zuerst"""
+    with _compiled_predicates_lock:
+        compiled = list(_compiled_predicates.values())
+    return [predicate.report() for predicate in reversed(compiled)]
+
+
 # ============================================================================
 # Kombinierte höherwertige Funktionen
 # ============================================================================
@@ -222,6 +984,8 @@ def process_text_with_pipeline(
     """
     B2E: Komplexe Anwendung von Closures und höherwertigen Funktionen
     Pipeline mit Validierung, Transformation und Filterung
+    Validatoren und Filter werden als adaptive Konjunktionen kompiliert,
+    Statistik unter predicate_stats() bzw. /pipeline/stats
     """
     result = {
         'original': text,
@@ -230,8 +994,8 @@ def process_text_with_pipeline(
         'filtered_words': []
     }
     
-    # Validierung
-    is_valid = all(validator(text) for validator in validators)
+    # Validierung - eine Konjunktion, billige und oft ablehnende Validatoren zuerst
+    is_valid = compile_predicates(validators, 'validators')(text)
     result['valid'] = is_valid
     
     if not is_valid:
@@ -243,12 +1007,406 @@ def process_text_with_pipeline(
         transformed = transformer(transformed)
     result['transformed'] = transformed
     
-    # Filterung
-    words = transformed.split()
-    filtered = [word for word in words 
-                if all(filter_func(word) for filter_func in filters)]
+    # Filterung - Wörter werden lazy erzeugt, nur die Treffer als Liste gebaut;
+    # die Filter laufen als eine adaptive Konjunktion (siehe AdaptivePredicate)
+    filtered = list(compile_predicates(filters, 'filters').filter(WordStream(transformed)))
     result['filtered_words'] = filtered
     
     return result
 
 
+# ============================================================================
+# Parallele Map/Filter/Reduce mit Prozess-Pool
+# ============================================================================
+
+# Anzahl Worker-Prozesse; Standard 1 = kein Pool. Jeder Server-Worker bekäme
+# sonst einen eigenen Pool mit cpu_count Prozessen
+PARALLEL_WORKERS = int(os.environ.get('TEXT_ANALYZER_PARALLEL_WORKERS', 1))
+
+# Startmethode der Worker: fork aus einem mehrfädigen Server kann Locks
+# anderer Threads im Kind gesperrt zurücklassen, deshalb forkserver/spawn
+PARALLEL_START_METHOD = os.environ.get(
+    'TEXT_ANALYZER_PARALLEL_START_METHOD',
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn')
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_workers = 1
+_process_pool_lock = threading.Lock()
+
+
+def start_process_pool(workers: int = PARALLEL_WORKERS) -> Optional[ProcessPoolExecutor]:
+    """
+    Startet den gemeinsamen Prozess-Pool (beim Programmstart aufrufen, nicht
+    aus einem Request). Bei workers <= 1 bleibt es beim seriellen Pfad.
+    """
+    global _process_pool, _process_pool_workers
+    with _process_pool_lock:
+        if _process_pool is None and workers > 1:
+            context = multiprocessing.get_context(PARALLEL_START_METHOD)
+            _process_pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            _process_pool_workers = workers
+            atexit.register(_process_pool.shutdown)
+        return _process_pool
+
+
+def get_process_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Der mit start_process_pool gestartete Pool oder None
+    Wird nie nebenbei gestartet: ohne Pool laufen die parallel_*-Funktionen seriell
+    """
+    return _process_pool
+
+
+def split_into_chunks(items: Sequence, chunk_count: int) -> List[Sequence]:
+    """
+    Teilt eine Sequenz in höchstens chunk_count zusammenhängende Stücke
+    Die Reihenfolge bleibt erhalten, damit Teilergebnisse geordnet kombiniert werden
+    """
+    chunk_size = max(1, -(-len(items) // max(1, chunk_count)))
+    return [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+
+def _map_chunk(func: Callable, chunk: Sequence) -> List:
+    return list(map(func, chunk))
+
+
+def _filter_chunk(predicate: Callable, chunk: Sequence) -> List:
+    return list(filter(predicate, chunk))
+
+
+def _reduce_chunk(func: Callable, initial: Any, chunk: Sequence) -> Any:
+    return reduce(func, chunk, initial)
+
+
+def _concat(acc: List, part: List) -> List:
+    acc.extend(part)
+    return acc
+
+
+def parallel_map_reduce(chunk_func: Callable[[Sequence], Any], items: Sequence,
+                        combiner: Callable[[Any, Any], Any], initial: Any) -> Any:
+    """
+    Wendet chunk_func auf jeden Chunk an (parallel im Prozess-Pool) und
+    kombiniert die Teilergebnisse der Reihe nach mit combiner
+    chunk_func muss picklebar sein (Funktion auf Modulebene oder partial davon),
+    combiner muss assoziativ sein und initial sein neutrales Element.
+    Ohne gestarteten Pool läuft alles seriell im aufrufenden Prozess. Die
+    Chunks werden zu den Workern gepickelt: für billige chunk_func (z.B.
+    Längen summieren) kostet das mehr als die Arbeit selbst, siehe
+    benchmarks/bench_parallel.py.
+    """
+    pool = get_process_pool()
+    chunks = split_into_chunks(items, _process_pool_workers)
+    if pool is not None and len(chunks) > 1:
+        partials = pool.map(chunk_func, chunks)
+    else:
+        partials = map(chunk_func, chunks)
+    return reduce(combiner, partials, initial)
+
+
+def parallel_map(func: Callable[[Any], Any], items: Sequence) -> List[Any]:
+    """
+    Parallele Variante von list(map(func, items))
+    """
+    return parallel_map_reduce(partial(_map_chunk, func), items, _concat, [])
+
+
+def parallel_filter(predicate: Callable[[Any], bool], items: Sequence) -> List[Any]:
+    """
+    Parallele Variante von list(filter(predicate, items))
+    """
+    return parallel_map_reduce(partial(_filter_chunk, predicate), items, _concat, [])
+
+
+def parallel_reduce(func: Callable[[Any, Any], Any], items: Sequence, initial: Any,
+                    combiner: Optional[Callable[[Any, Any], Any]] = None) -> Any:
+    """
+    Parallele Variante von reduce(func, items, initial)
+    Jeder Worker reduziert seinen Chunk ab initial, die Teilergebnisse werden
+    mit combiner zusammengeführt (Standard: func selbst, falls assoziativ)
+    """
+    return parallel_map_reduce(
+        partial(_reduce_chunk, func, initial),
+        items,
+        combiner or func,
+        initial
+    )
+
+
+# ============================================================================
+# Feldauswahl - Antwortfelder nur berechnen, wenn sie angefragt sind
+# ============================================================================
+
+# Felder, die jede projizierte Antwort behält (Status und Zuordnung)
+ALWAYS_INCLUDED_FIELDS = frozenset(('success', 'error', 'id', 'document_id'))
+
+
+class Lazy:
+    """
+    B2E: Verzögerte Berechnung (Thunk) für ein Antwortfeld
+    Läuft beim ersten Aufruf und merkt sich das Ergebnis; mehrere Felder
+    können so eine gemeinsame Vorstufe (z.B. TokenIndex) teilen
+    """
+
+    __slots__ = ('_func', '_value', '_done')
+
+    def __init__(self, func: Callable[[], Any]):
+        self._func = func
+        self._value = None
+        self._done = False
+
+    def __call__(self) -> Any:
+        if not self._done:
+            self._value = self._func()
+            self._done = True
+            self._func = None
+        return self._value
+
+
+def lazy(func: Callable[[], Any]) -> Lazy:
+    """Kurzform für Lazy(func), auch als Decorator für lokale Funktionen"""
+    return Lazy(func)
+
+
+def resolve(value: Any) -> Any:
+    """Wertet alle Lazy-Werte aus, auch in verschachtelten Dictionaries"""
+    if isinstance(value, Lazy):
+        value = value()
+    if isinstance(value, dict):
+        return {key: resolve(item) for key, item in value.items()}
+    return value
+
+
+class FieldSelection:
+    """
+    Ausgewählte Antwortfelder als Baum gepunkteter Pfade
+    ["analysis.word_count", "word_frequencies"] wählt aus "analysis" nur
+    word_count und "word_frequencies" vollständig. Ohne Auswahl (None)
+    wird alles geliefert.
+    """
+
+    __slots__ = ('tree',)
+
+    def __init__(self, paths: Optional[Iterable[str]] = None):
+        self.tree: Optional[Dict[str, Any]] = None
+        if paths is not None:
+            self.tree = {}
+            for path in paths:
+                node = self.tree
+                *parents, leaf = path.split('.')
+                for part in parents:
+                    if node.get(part) == {}:
+                        break  # Ein kürzerer Pfad wählt das Feld bereits ganz
+                    node = node.setdefault(part, {})
+                else:
+                    node[leaf] = {}
+
+    @classmethod
+    def parse(cls, value: Any) -> 'FieldSelection':
+        """
+        Aus dem Request-Parameter: Liste von Pfaden oder kommagetrennter String
+        ValueError bei anderen Typen oder leeren Pfadteilen
+        """
+        if value is None:
+            return cls()
+        if isinstance(value, str):
+            value = [part.strip() for part in value.split(',') if part.strip()]
+        if not isinstance(value, list) or not all(isinstance(path, str) for path in value):
+            raise ValueError('fields muss eine Liste von Feldnamen sein')
+        if any(not part for path in value for part in path.split('.')):
+            raise ValueError('Ungültiger Feldname in fields')
+        return cls(value)
+
+    @property
+    def selects_all(self) -> bool:
+        return self.tree is None
+
+    def wants(self, path: str) -> bool:
+        """Wird das Feld (oder ein Teil davon) ausgeliefert?"""
+        node = self.tree
+        for part in path.split('.'):
+            if node is None or node == {}:
+                return True
+            if part not in node:
+                return False
+            node = node[part]
+        return True
+
+    def project(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        """Antwort mit den ausgewählten Feldern; nur deren Lazy-Werte laufen"""
+        if self.tree is None:
+            return resolve(response)
+        return self._project(response, self.tree, top_level=True)
+
+    def _project(self, response: Dict[str, Any], tree: Dict[str, Any],
+                 top_level: bool = False) -> Dict[str, Any]:
+        projected = {}
+        for key, value in response.items():
+            if key not in tree and not (top_level and key in ALWAYS_INCLUDED_FIELDS):
+                continue
+            subtree = tree.get(key)
+            if isinstance(value, Lazy):
+                value = value()
+            if subtree and isinstance(value, dict):
+                projected[key] = self._project(value, subtree)
+            else:
+                projected[key] = resolve(value)
+        return projected
+
+
+# Alle Felder (Standard ohne fields-Parameter)
+ALL_FIELDS = FieldSelection()
+
+
+# ============================================================================
+# Instrumentierung - Laufzeit-Histogramme pro Stufe und Endpoint
+# ============================================================================
+
+# Anteil der Aufrufe, deren Laufzeit gemessen wird (Aufrufe werden immer gezählt)
+METRICS_SAMPLE_RATE = float(os.environ.get('TEXT_ANALYZER_METRICS_SAMPLE_RATE', 1.0))
+
+# Obergrenzen der Histogramm-Buckets in Sekunden
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class LatencyHistogram:
+    """
+    Histogramm mit festen Buckets plus Aufrufzähler
+    """
+
+    __slots__ = ('calls', 'counts', 'total', 'observations', '_lock')
+
+    def __init__(self):
+        self.calls = 0
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.observations = 0
+        self._lock = threading.Lock()
+
+    def count_call(self) -> None:
+        with self._lock:
+            self.calls += 1
+
+    def observe(self, seconds: float) -> None:
+        index = bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += seconds
+            self.observations += 1
+
+    def snapshot(self) -> Tuple[int, List[int], float, int]:
+        """(calls, counts, total, observations) als konsistente Kopie"""
+        with self._lock:
+            return self.calls, list(self.counts), self.total, self.observations
+
+
+class MetricsRegistry:
+    """
+    Sammelt Histogramme je (Metrik, Label) und rendert sie im Prometheus-Textformat
+    """
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], LatencyHistogram] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, help_text: str, **labels: str) -> LatencyHistogram:
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+                self._help.setdefault(name, help_text)
+        return histogram
+
+    def render_prometheus(self) -> str:
+        """
+        Prometheus-Textformat (Version 0.0.4)
+        Pro Metrik: <name>_bucket/_sum/_count und <name>_calls_total
+        Histogramme werden unter dem Lock kopiert: Requests legen parallel
+        neue an (z.B. pro Route), gerendert wird aus der Kopie
+        """
+        with self._lock:
+            items = sorted(self._histograms.items())
+            help_texts = dict(self._help)
+
+        lines: List[str] = []
+        by_name: Dict[str, List] = {}
+        for (name, labels), histogram in items:
+            by_name.setdefault(name, []).append((labels, histogram.snapshot()))
+
+        for name, entries in by_name.items():
+            lines.append('# HELP %s %s' % (name, help_texts[name]))
+            lines.append('# TYPE %s histogram' % name)
+            for labels, (_, counts, total, observations) in entries:
+                label_text = ','.join('%s="%s"' % (k, _escape_label(v)) for k, v in labels)
+                prefix = label_text + ',' if label_text else ''
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + (float('inf'),), counts):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append('%s_bucket{%sle="%s"} %d' % (name, prefix, le, cumulative))
+                lines.append('%s_sum{%s} %.9f' % (name, label_text, total))
+                lines.append('%s_count{%s} %d' % (name, label_text, observations))
+            lines.append('# TYPE %s_calls_total counter' % name)
+            for labels, (calls, _, _, _) in entries:
+                label_text = ','.join('%s="%s"' % (k, _escape_label(v)) for k, v in labels)
+                lines.append('%s_calls_total{%s} %d' % (name, label_text, calls))
+        return '\n'.join(lines) + '\n'
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# Globale Registry für Stufen (Funktionen) und Endpoints
+METRICS = MetricsRegistry()
+
+
+def sample_metrics() -> bool:
+    """Ob dieser Aufruf gemessen wird (Anteil METRICS_SAMPLE_RATE)"""
+    return METRICS_SAMPLE_RATE >= 1.0 or random.random() < METRICS_SAMPLE_RATE
+
+
+def timed(stage: str, registry: MetricsRegistry = METRICS) -> Callable:
+    """
+    B2F: Höherwertige Funktion - misst die Laufzeit einer Stufe
+    Jeder Aufruf wird gezählt, gemessen wird nur ein Anteil von
+    METRICS_SAMPLE_RATE der Aufrufe (niedriger Overhead im Produktivbetrieb)
+    """
+    def decorator(func: Callable) -> Callable:
+        histogram = registry.histogram(
+            'text_analyzer_stage_seconds', 'Laufzeit pro Verarbeitungsstufe', stage=stage
+        )
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            histogram.count_call()
+            if not sample_metrics():
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def instrument_functions(namespace: Dict[str, Any], prefix: str = '') -> None:
+    """
+    Ersetzt alle öffentlichen Funktionen eines Moduls durch timed-Varianten
+    Aufruf am Modulende mit globals(); private Funktionen (_name) und
+    Klassen bleiben unverändert. Die Wrapper behalten __qualname__ und
+    __module__, bleiben also picklebar (z.B. für den Prozess-Pool).
+    """
+    module_name = namespace.get('__name__')
+    for name, value in list(namespace.items()):
+        if name.startswith('_') or not callable(value) or isinstance(value, type):
+            continue
+        if getattr(value, '__module__', None) != module_name:
+            continue
+        namespace[name] = timed(prefix + name)(value)
@@ -0,0 +1,368 @@
+"""
+Incremental Analysis - Analyse-Sitzungen für bearbeitete Dokumente
+Der Server hält pro Dokument den Text in Blöcken (an Leerraum getrennt, je
+etwa BLOCK_CHARS Zeichen) mit ihren Kennzahlen. Eine Änderung zerlegt nur
+die betroffenen Blöcke und ihre Nachbarn neu und verrechnet deren Kennzahlen
+mit der Summe. Aufwand pro Änderung: Grösse der Änderung plus wenige Blöcke,
+dazu ein Durchlauf über die Blockliste (Offsets, längstes/kürzestes Wort) -
+der Text selbst wird weder kopiert noch erneut gelesen. Die Top-Wörter
+kommen aus einem nach Häufigkeit geordneten Index; bei Gleichstand
+entscheidet das erste Vorkommen (Block, Rang im Block), das pro Wort
+mitgeführt wird.
+"""
+
+import heapq
+import os
+import re
+import threading
+import time
+import uuid
+from bisect import bisect_right, insort
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from analysis_engine import TextStatistics, compute_statistics
+
+
+# Zielgrösse eines Blocks in Zeichen (Blöcke enden an Leerraum, ein
+# überlanges Wort bleibt ganz)
+BLOCK_CHARS = int(os.environ.get('TEXT_ANALYZER_SESSION_BLOCK_CHARS', 8192))
+
+_WHITESPACE = re.compile(r'\s')
+
+# Kennzahlen, die sich über Blöcke aufsummieren
+_SUMMED = ('word_count', 'character_count', 'space_count', 'sentence_marks',
+           'total_length', 'long_words_length')
+
+
+class EditError(ValueError):
+    """Ungültige Änderung (Offset ausserhalb des Texts, falscher Typ)"""
+
+
+def _split_blocks(text: str) -> List[str]:
+    """Teilt den Text nach je BLOCK_CHARS Zeichen am nächsten Leerraum"""
+    parts = []
+    start = 0
+    while len(text) - start > BLOCK_CHARS:
+        cut = _WHITESPACE.search(text, start + BLOCK_CHARS - 1)
+        if cut is None:
+            break
+        parts.append(text[start:cut.end()])
+        start = cut.end()
+    if start < len(text):
+        parts.append(text[start:])
+    return parts
+
+
+def _common(words: Set[str], order: Dict[str, int]) -> List[str]:
+    """Wörter aus `words`, die im Block vorkommen (läuft über die kleinere Menge)"""
+    if len(words) < len(order):
+        return [word for word in words if word in order]
+    return [word for word in order if word in words]
+
+
+class _Block:
+    """
+    Ein Textabschnitt mit seinen Kennzahlen
+    order: Rang des ersten Vorkommens jedes Worts im Block (Einfügereihenfolge
+    der Frequenz-Tabelle); index: Position in der Blockliste
+    """
+
+    __slots__ = ('text', 'statistics', 'order', 'index')
+
+    def __init__(self, text: str, min_length: int):
+        self.text = text
+        self.statistics = compute_statistics(text, min_length)
+        self.order = {word: rank for rank, word in enumerate(self.statistics.frequencies)}
+        self.index = 0
+
+
+class AnalysisSession:
+    """
+    Analyse-Zustand eines Dokuments
+    - statistics: TextStatistics wie bei compute_statistics (gleiche Kennzahlen)
+    - Blöcke mit eigenen Kennzahlen; Wörter überspannen nie eine Blockgrenze
+    - Häufigkeits-Index (Häufigkeit -> Wörter) und erster Block pro Wort
+      für die Top-Wörter ohne Durchlauf über Text oder Vokabular
+    """
+
+    def __init__(self, text: str, min_length: int = 5):
+        self.version = 0
+        self.min_length = min_length
+        self.statistics = TextStatistics(min_length)
+        self._blocks: List[_Block] = []
+        self._starts: List[int] = []
+        self._length = 0
+        self._first_block: Dict[str, _Block] = {}
+        self._by_count: Dict[int, Set[str]] = {}
+        self._counts: List[int] = []
+        self._longest: Optional[_Block] = None
+        self._shortest: Optional[_Block] = None
+        self._replace_blocks(0, 0, text)
+        self.last_access = time.monotonic()
+        self.lock = threading.Lock()
+
+    @property
+    def text(self) -> str:
+        """Aktueller Text (wird aus den Blöcken zusammengesetzt)"""
+        return ''.join(block.text for block in self._blocks)
+
+    # ------------------------------------------------------------------------
+    # Änderungen
+    # ------------------------------------------------------------------------
+
+    def apply_edit(self, offset: int, deleted: int, inserted: str) -> None:
+        """
+        Ersetzt text[offset:offset + deleted] durch inserted
+        Offsets zählen Unicode-Codepoints wie Python-Strings
+        """
+        if not isinstance(inserted, str):
+            raise EditError('inserted muss ein String sein')
+        if not all(isinstance(value, int) and not isinstance(value, bool) for value in (offset, deleted)):
+            raise EditError('offset und deleted müssen Ganzzahlen sein')
+        if offset < 0 or deleted < 0 or offset + deleted > self._length:
+            raise EditError('Änderung liegt ausserhalb des Texts (Länge %d)' % self._length)
+
+        # Jeder Block ausser dem letzten endet an Leerraum, die linke Grenze
+        # bleibt also gültig. Endet das Segment nach der Änderung nicht an
+        # Leerraum (oder ist es sehr klein), kommt der nächste Block dazu
+        first = self._locate(offset)
+        stop = (self._locate(offset + deleted - 1) if deleted else first) + 1
+        segment = ''.join(block.text for block in self._blocks[first:stop])
+        relative = offset - self._starts[first]
+        segment = segment[:relative] + inserted + segment[relative + deleted:]
+        if stop < len(self._blocks) and (
+                not segment or not segment[-1].isspace() or len(segment) < BLOCK_CHARS // 2):
+            segment += self._blocks[stop].text
+            stop += 1
+        self._replace_blocks(first, stop, segment)
+        self.version += 1
+
+    def _locate(self, offset: int) -> int:
+        """Index des Blocks, der `offset` enthält (das Textende gehört zum letzten)"""
+        return max(0, min(bisect_right(self._starts, offset), len(self._blocks)) - 1)
+
+    def _replace_blocks(self, first: int, stop: int, text: str) -> None:
+        """Ersetzt die Blöcke first..stop-1 durch die neu zerlegten Blöcke von `text`"""
+        old_blocks = self._blocks[first:stop]
+        new_blocks = [_Block(part, self.min_length) for part in _split_blocks(text)]
+        if not new_blocks and len(old_blocks) == len(self._blocks):
+            new_blocks = [_Block('', self.min_length)]
+        self._blocks[first:stop] = new_blocks
+
+        # Start-Offsets verschieben, Indizes nur bei geänderter Blockzahl
+        delta = len(text) - sum(len(block.text) for block in old_blocks)
+        position = self._starts[first] if first < len(self._starts) else 0
+        starts = []
+        for block in new_blocks:
+            starts.append(position)
+            position += len(block.text)
+        tail = self._starts[stop:]
+        self._starts[first:] = starts + ([start + delta for start in tail] if delta else tail)
+        self._length += delta
+        renumber = new_blocks if len(new_blocks) == len(old_blocks) else self._blocks[first:]
+        for index, block in enumerate(renumber, first):
+            block.index = index
+
+        statistics = self.statistics
+        for name in _SUMMED:
+            change = (sum(getattr(block.statistics, name) for block in new_blocks)
+                      - sum(getattr(block.statistics, name) for block in old_blocks))
+            setattr(statistics, name, getattr(statistics, name) + change)
+
+        changes = Counter()
+        for block in old_blocks:
+            changes.subtract(block.statistics.frequencies)
+        for block in new_blocks:
+            changes.update(block.statistics.frequencies)
+        frequencies = statistics.frequencies
+        for word, change in changes.items():
+            if change:
+                self._set_count(word, frequencies[word] + change)
+        old_ids = set(map(id, old_blocks))
+        self._update_first_blocks(changes, old_ids, first, len(new_blocks))
+        self._update_extremes(old_ids, new_blocks)
+
+    def _set_count(self, word: str, count: int) -> None:
+        """Setzt die Häufigkeit eines Worts und verschiebt es im Häufigkeits-Index"""
+        frequencies = self.statistics.frequencies
+        previous = frequencies.get(word, 0)
+        if previous:
+            bucket = self._by_count[previous]
+            bucket.discard(word)
+            if not bucket:
+                del self._by_count[previous]
+                del self._counts[bisect_right(self._counts, previous) - 1]
+        if count > 0:
+            frequencies[word] = count
+            if count not in self._by_count:
+                self._by_count[count] = set()
+                insort(self._counts, count)
+            self._by_count[count].add(word)
+        else:
+            del frequencies[word]
+
+    def _update_first_blocks(self, words: Iterable[str], old_ids: Set[int],
+                             first: int, new_count: int) -> None:
+        """
+        Ersten Block jedes Worts aus dem ersetzten Segment nachführen
+        Liegt das erste Vorkommen vor dem Segment, ändert sich nichts; sonst
+        gewinnt der erste neue Block mit dem Wort, ohne einen solchen wird
+        (nur für Wörter, deren erstes Vorkommen entfernt wurde) dahinter gesucht
+        """
+        frequencies = self.statistics.frequencies
+        pending = set()
+        removed = set()
+        for word in words:
+            current = self._first_block.get(word)
+            if word not in frequencies:
+                if current is not None:
+                    del self._first_block[word]
+            elif current is None or id(current) in old_ids:
+                pending.add(word)
+                if current is not None:
+                    removed.add(word)
+            elif current.index >= first:
+                pending.add(word)
+
+        for block in self._blocks[first:first + new_count]:
+            if not pending:
+                return
+            found = _common(pending, block.order)
+            for word in found:
+                self._first_block[word] = block
+            pending.difference_update(found)
+            removed.difference_update(found)
+
+        # Erstes Vorkommen entfernt und nicht im Segment: dahinter suchen
+        for block in self._blocks[first + new_count:]:
+            if not removed:
+                return
+            found = _common(removed, block.order)
+            for word in found:
+                self._first_block[word] = block
+            removed.difference_update(found)
+
+    def _update_extremes(self, old_ids: Set[int], new_blocks: List[_Block]) -> None:
+        """
+        Längstes/kürzestes Wort: erstes Vorkommen gewinnt, wie TextStatistics.absorb
+        Jeder Block kennt seine eigenen; verglichen werden nur die neuen Blöcke,
+        ausser der bisherige Block des Worts wurde ersetzt
+        """
+        self._longest = self._extreme_block(
+            self._longest, old_ids, new_blocks, lambda block: -len(block.statistics.longest_word))
+        self._shortest = self._extreme_block(
+            self._shortest, old_ids, new_blocks, lambda block: len(block.statistics.shortest_word))
+        self.statistics.longest_word = self._longest.statistics.longest_word if self._longest else ''
+        self.statistics.shortest_word = self._shortest.statistics.shortest_word if self._shortest else ''
+
+    def _extreme_block(self, current: Optional[_Block], old_ids: Set[int],
+                       new_blocks: List[_Block], key: Callable[[_Block], int]) -> Optional[_Block]:
+        """Block mit dem kleinsten key (bei Gleichstand der frühere) unter den Blöcken mit Wörtern"""
+        if current is None or id(current) in old_ids:
+            current, candidates = None, self._blocks
+        else:
+            candidates = new_blocks
+        for block in candidates:
+            if block.statistics.word_count and (
+                    current is None or (key(block), block.index) < (key(current), current.index)):
+                current = block
+        return current
+
+    # ------------------------------------------------------------------------
+    # Ergebnisse
+    # ------------------------------------------------------------------------
+
+    def _first_seen(self, word: str) -> Tuple[int, int]:
+        block = self._first_block[word]
+        return block.index, block.order[word]
+
+    def top_words(self, top_n: int = 5) -> List[tuple]:
+        """
+        Wie get_top_words(text, top_n), inklusive Reihenfolge bei Gleichstand
+        Liest die Häufigkeiten absteigend aus dem Index; gebraucht werden nur
+        die Wörter bis zur Häufigkeit an Platz top_n
+        """
+        frequencies = self.statistics.frequencies
+        if top_n < 0 or top_n >= len(frequencies):
+            ranked = sorted(frequencies, key=lambda word: (-frequencies[word], self._first_seen(word)))
+            return [(word, frequencies[word]) for word in ranked][:top_n]
+
+        ranked = []
+        for count in reversed(self._counts):
+            if len(ranked) >= top_n:
+                break
+            bucket = heapq.nsmallest(top_n - len(ranked), self._by_count[count], key=self._first_seen)
+            ranked.extend((word, count) for word in bucket)
+        return ranked
+
+    def result(self, top_n: int = 5) -> Dict:
+        """Gleiches Dictionary wie analyze_complete(text, top_n, min_length)"""
+        return {
+            'analysis': self.statistics.analysis(),
+            'word_frequencies': dict(self.top_words(top_n)),
+            'total_word_length': self.statistics.total_length,
+            'long_words_count': self.statistics.long_words_length
+        }
+
+
+class SessionStore:
+    """
+    Sitzungen pro Dokument-ID, begrenzt in Anzahl und Lebensdauer
+    Die am längsten ungenutzte Sitzung wird verdrängt (LRU)
+    """
+
+    def __init__(self, max_sessions: int = 256, ttl: float = 3600.0):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions: 'OrderedDict[str, AnalysisSession]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, text: str, min_length: int = 5,
+               document_id: Optional[str] = None) -> Tuple[str, AnalysisSession]:
+        session = AnalysisSession(text, min_length)
+        document_id = document_id or uuid.uuid4().hex
+        with self._lock:
+            self._sessions.pop(document_id, None)
+            self._sessions[document_id] = session
+            self._evict()
+        return document_id, session
+
+    def get(self, document_id: str) -> Optional[AnalysisSession]:
+        with self._lock:
+            self._evict()
+            session = self._sessions.get(document_id)
+            if session is not None:
+                self._sessions.move_to_end(document_id)
+                session.last_access = time.monotonic()
+            return session
+
+    def delete(self, document_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(document_id, None) is not None
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _evict(self) -> None:
+        # Aufrufer hält self._lock
+        deadline = time.monotonic() - self.ttl
+        while self._sessions:
+            document_id, session = next(iter(self._sessions.items()))
+            if len(self._sessions) <= self.max_sessions and session.last_access >= deadline:
+                break
+            del self._sessions[document_id]
+
+
+def apply_edits(session: AnalysisSession, edits: Iterable[Any]) -> None:
+    """
+    Wendet eine Folge von Änderungen an; jede bezieht sich auf den Text
+    nach der vorherigen. Eine Änderung ist {"offset", "deleted", "inserted"}.
+    Die Form aller Änderungen wird vorab geprüft; scheitert eine Änderung an
+    ihrem Offset, bleiben die vorherigen angewendet (siehe session.version).
+    """
+    edits = list(edits)
+    if not all(isinstance(edit, dict) for edit in edits):
+        raise EditError('Jede Änderung muss ein Objekt sein')
+    for edit in edits:
+        session.apply_edit(edit.get('offset', 0), edit.get('deleted', 0), edit.get('inserted', ''))
@@ -0,0 +1,126 @@
+"""
+Length Backend - Wortlängen als ein Integer-Array
+Mit NumPy laufen Summen, Mittelwert, Schwellenzählung, Bereichsmasken und
+argmax/argmin vektorisiert über ein einziges Array. Ohne NumPy (oder mit
+TEXT_ANALYZER_NUMPY=0) arbeiten dieselben Funktionen auf beliebigen
+Integer-Sequenzen (list, array('I')) mit C-Builtins - gleiche Ergebnisse.
+"""
+
+import os
+from itertools import compress
+from typing import Any, Iterable, List, Optional, Sequence
+
+try:
+    import numpy
+except ImportError:  # optionale Abhängigkeit
+    numpy = None
+
+
+# NumPy-Backend aktiv? Abschaltbar für Vergleichsmessungen
+USE_NUMPY = numpy is not None and os.environ.get('TEXT_ANALYZER_NUMPY', '1') != '0'
+
+BACKEND = 'numpy' if USE_NUMPY else 'python'
+
+
+def _is_vector(lengths: Any) -> bool:
+    return numpy is not None and isinstance(lengths, numpy.ndarray)
+
+
+def _bound(value: int) -> int:
+    # Längen sind nie negativ; negative Schwellen nicht mit uint32-Puffern vergleichen
+    return max(value, 0)
+
+
+# ============================================================================
+# Aufbau des Längen-Arrays
+# ============================================================================
+
+def length_array(words: Sequence[str]) -> Any:
+    """
+    Längen aller Wörter als ein Array
+    NumPy: int64-Vektor (ein fromiter-Durchlauf), sonst Liste
+    """
+    if USE_NUMPY:
+        return numpy.fromiter(map(len, words), dtype=numpy.int64, count=len(words))
+    return list(map(len, words))
+
+
+def as_lengths(buffer: Any) -> Any:
+    """
+    Sicht auf ein bestehendes array('I') (z.B. TokenIndex.lengths)
+    NumPy teilt sich den Puffer ohne Kopie, sonst bleibt das array unverändert
+    """
+    if not USE_NUMPY:
+        return buffer
+    if not len(buffer):
+        return numpy.zeros(0, dtype=numpy.uint32)
+    return numpy.frombuffer(buffer, dtype=numpy.uint32)
+
+
+# ============================================================================
+# Kennzahlen
+# ============================================================================
+
+def sum_lengths(lengths: Any, min_length: int = 0) -> int:
+    """Summe aller Längen >= min_length"""
+    if _is_vector(lengths):
+        if min_length > 0:
+            lengths = lengths[lengths >= min_length]
+        return int(lengths.sum(dtype=numpy.int64))
+    if min_length > 0:
+        return sum(filter(min_length.__le__, lengths))
+    return sum(lengths)
+
+
+def mean_length(lengths: Any) -> float:
+    """
+    Durchschnittliche Länge, 0.0 für leere Eingaben
+    Ganzzahlige Summe / Anzahl wie sum(...) / len(...), bitgleich in beiden Backends
+    """
+    if not len(lengths):
+        return 0.0
+    return sum_lengths(lengths) / len(lengths)
+
+
+def count_at_least(lengths: Any, min_length: int) -> int:
+    """Anzahl Längen >= min_length"""
+    if _is_vector(lengths):
+        return int(numpy.count_nonzero(lengths >= _bound(min_length)))
+    return sum(map(min_length.__le__, lengths))
+
+
+def positions_in_range(lengths: Any, min_length: int,
+                       max_length: Optional[int] = None) -> Iterable[int]:
+    """
+    Positionen mit min_length <= Länge (<= max_length), aufsteigend
+    NumPy: eine Bereichsmaske und flatnonzero
+    """
+    if _is_vector(lengths):
+        mask = lengths >= _bound(min_length)
+        if max_length is not None:
+            if max_length < 0:
+                return []
+            mask &= lengths <= max_length
+        return numpy.flatnonzero(mask).tolist()
+    if max_length is None:
+        return compress(range(len(lengths)), map(min_length.__le__, lengths))
+    return [i for i, length in enumerate(lengths) if min_length <= length <= max_length]
+
+
+def longest_position(lengths: Any) -> int:
+    """Position der grössten Länge, erstes Vorkommen (wie max(words, key=len))"""
+    if _is_vector(lengths):
+        return int(lengths.argmax())
+    return lengths.index(max(lengths))
+
+
+def shortest_position(lengths: Any) -> int:
+    """Position der kleinsten Länge, erstes Vorkommen (wie min(words, key=len))"""
+    if _is_vector(lengths):
+        return int(lengths.argmin())
+    return lengths.index(min(lengths))
+
+
+def select_words(words: Sequence[str], positions: Iterable[int]) -> List[str]:
+    """Wörter an den gegebenen Positionen"""
+    return list(map(words.__getitem__, positions))
@@ -0,0 +1,183 @@
+"""
+Measurement - Laufzeit, Allokationen und Durchsatz unter einem Zeitbudget
+Für den Benchmark-Modus von /paradigms/compare und /refactoring/demo:
+jede Variante läuft mit Aufwärmen und Wiederholungen über den Text des
+Requests, solange ihr Anteil am Budget reicht. Ein Lauf wird nie
+abgebrochen - das Budget begrenzt die zusätzlichen Wiederholungen, der
+erste Messlauf entspricht der Arbeit, die der Endpoint ohnehin leistet.
+Der Server ist mehrfädig: Garbage Collection und tracemalloc werden im
+Request nicht umgeschaltet, weil das alle parallelen Requests träfe.
+Allokationen gibt es nur, wenn tracemalloc beim Start des Prozesses
+aktiviert wurde (PYTHONTRACEMALLOC=1). Pro Prozess misst höchstens ein
+Request; ist die Messung belegt, wird nicht gewartet (BenchmarkBusy).
+"""
+
+import math
+import os
+import statistics
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Obergrenze für die Messdauer eines Requests in Sekunden (alle Varianten zusammen)
+BENCHMARK_BUDGET = float(os.environ.get('TEXT_ANALYZER_BENCHMARK_BUDGET', 2.0))
+
+# Obergrenze für die Wiederholungen pro Variante
+BENCHMARK_MAX_REPEAT = int(os.environ.get('TEXT_ANALYZER_BENCHMARK_MAX_REPEAT', 100))
+
+# Wartezeit in Sekunden auf eine laufende Messung, bevor BenchmarkBusy folgt
+BENCHMARK_WAIT = float(os.environ.get('TEXT_ANALYZER_BENCHMARK_WAIT', 0.0))
+
+DEFAULT_REPEAT = 10
+DEFAULT_WARMUP = 1
+
+# Höchstens eine Messung pro Prozess, damit sich Messungen nicht gegenseitig
+# verfälschen; wer sie belegt findet, wartet höchstens BENCHMARK_WAIT
+_benchmark_lock = threading.Lock()
+
+# Einschränkungen, die jede Benchmark-Antwort unter "limitations" mitliefert
+LIMITATIONS = [
+    'Garbage Collection bleibt während der Zeitmessung aktiv; '
+    'GC-Pausen sind in den Laufzeiten enthalten',
+    'Allokationen nur mit PYTHONTRACEMALLOC=1 beim Start des Servers, '
+    'dann prozessweit gemessen inklusive parallel laufender Requests',
+    'Laufzeiten enthalten die Konkurrenz paralleler Requests um die CPU und den GIL',
+    'Pro Prozess misst höchstens ein Request gleichzeitig (sonst 503)'
+]
+
+
+class BenchmarkBusy(RuntimeError):
+    """Eine andere Messung läuft bereits; retry_after schätzt die Restdauer in Sekunden"""
+
+    def __init__(self, retry_after: int):
+        super().__init__('Eine andere Messung läuft bereits')
+        self.retry_after = retry_after
+
+
+class BenchmarkOptions:
+    """
+    Geprüfte Parameter des Benchmark-Modus
+    Aus `true` oder {"repeat", "warmup", "budget"}; das Budget ist auf
+    BENCHMARK_BUDGET begrenzt, die Wiederholungen auf BENCHMARK_MAX_REPEAT
+    """
+
+    __slots__ = ('repeat', 'warmup', 'budget')
+
+    def __init__(self, repeat: int = DEFAULT_REPEAT, warmup: int = DEFAULT_WARMUP,
+                 budget: float = BENCHMARK_BUDGET):
+        self.repeat = max(1, min(repeat, BENCHMARK_MAX_REPEAT))
+        self.warmup = max(0, min(warmup, BENCHMARK_MAX_REPEAT))
+        self.budget = max(0.0, min(budget, BENCHMARK_BUDGET))
+
+    @classmethod
+    def parse(cls, value: Any) -> Optional['BenchmarkOptions']:
+        """None, wenn der Benchmark-Modus nicht angefragt ist; ValueError bei ungültigen Werten"""
+        if not value:
+            return None
+        if value is True:
+            return cls()
+        if not isinstance(value, dict):
+            raise ValueError('benchmark muss true oder ein Objekt sein')
+        options = {}
+        for name, kind in (('repeat', int), ('warmup', int), ('budget', (int, float))):
+            if name not in value:
+                continue
+            if isinstance(value[name], bool) or not isinstance(value[name], kind):
+                raise ValueError('benchmark.%s muss eine Zahl sein' % name)
+            options[name] = value[name]
+        return cls(**options)
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-Rank-Perzentil einer aufsteigend sortierten Liste"""
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _timed_run(func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _traced_run(func: Callable[[], Any]) -> Dict[str, int]:
+    """
+    Spitzen- und verbleibender Speicher eines Laufs
+    Nur aufrufen, wenn tracemalloc bereits läuft - gestartet oder gestoppt
+    wird es hier nicht (prozessweit, träfe alle parallelen Requests)
+    """
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    func()
+    after, peak = tracemalloc.get_traced_memory()
+    return {'peak_bytes': peak - before, 'retained_bytes': max(0, after - before)}
+
+
+def measure(func: Callable[[], Any], tokens: int, options: BenchmarkOptions,
+            deadline: float) -> Dict[str, Any]:
+    """
+    Misst eine Variante bis zum Ende ihrer Wiederholungen oder der Deadline
+    Reihenfolge: Aufwärmen, Zeitmessung (mindestens ein Lauf), dann - falls
+    tracemalloc läuft - ein separater Lauf für die Allokationen, damit dessen
+    Overhead die Laufzeiten nicht verfälscht. Zeiten in Millisekunden,
+    Durchsatz aus dem Median.
+    """
+    warmup_runs = 0
+    while warmup_runs < options.warmup and time.perf_counter() < deadline:
+        func()
+        warmup_runs += 1
+
+    timings = [_timed_run(func)]
+    while len(timings) < options.repeat and time.perf_counter() < deadline:
+        timings.append(_timed_run(func))
+
+    tracing = tracemalloc.is_tracing()
+    allocations = _traced_run(func) if tracing and time.perf_counter() < deadline else None
+    timings.sort()
+    median = statistics.median(timings)
+    return {
+        'runs': len(timings),
+        'warmup_runs': warmup_runs,
+        'min_ms': round(timings[0] * 1000, 4),
+        'median_ms': round(median * 1000, 4),
+        'p95_ms': round(percentile(timings, 0.95) * 1000, 4),
+        'tokens_per_s': round(tokens / median) if median > 0 else None,
+        'allocations': allocations,
+        'budget_exhausted': len(timings) < options.repeat or (tracing and allocations is None)
+    }
+
+
+def benchmark_variants(variants: Dict[str, Callable[[], Any]], tokens: int,
+                       options: BenchmarkOptions) -> Dict[str, Any]:
+    """
+    Misst alle Varianten nacheinander
+    Jede bekommt den noch verbleibenden Anteil des Budgets, eine schnelle
+    Variante gibt ihre Restzeit an die folgenden weiter. Läuft bereits eine
+    Messung, wird höchstens BENCHMARK_WAIT gewartet, danach BenchmarkBusy.
+    """
+    requested = time.perf_counter()
+    if not _benchmark_lock.acquire(timeout=BENCHMARK_WAIT):
+        raise BenchmarkBusy(max(1, math.ceil(BENCHMARK_BUDGET)))
+    try:
+        start = time.perf_counter()
+        end = start + options.budget
+        results = {}
+        for position, (name, func) in enumerate(variants.items()):
+            remaining = max(0.0, end - time.perf_counter())
+            deadline = time.perf_counter() + remaining / (len(variants) - position)
+            results[name] = measure(func, tokens, options, deadline)
+        elapsed = time.perf_counter() - start
+    finally:
+        _benchmark_lock.release()
+    return {
+        'tokens': tokens,
+        'repeat': options.repeat,
+        'warmup': options.warmup,
+        'budget_s': options.budget,
+        'elapsed_s': round(elapsed, 4),
+        'waited_s': round(start - requested, 4),
+        'limitations': LIMITATIONS,
+        'results': results
+    }
@@ -0,0 +1,101 @@
+"""
+Normalizer - Einmal aufgebaute Wort-Normalisierung
+Gross-/Kleinschreibung (lower oder casefold), optionale Unicode-Normalform
+(z.B. NFKC) und das Entfernen von Satzzeichen an den Wortgrenzen werden beim
+Erzeugen zu C-Funktionen zusammengesetzt. Frequenzanalyse und Duplikat-
+Entfernung verwenden dieselbe Instanz, also dieselbe Definition von "gleich".
+"""
+
+import os
+import unicodedata
+from functools import lru_cache, partial
+from itertools import count, repeat
+from typing import Callable, Iterable, Iterator, List, Optional
+
+
+# Satzzeichen, die an den Wortgrenzen entfernt werden
+PUNCTUATION = '.,!?;:()[]{}"\''
+
+CASE_FUNCTIONS = {
+    'lower': str.lower,
+    'casefold': str.casefold,
+}
+
+UNICODE_FORMS = ('NFC', 'NFKC', 'NFD', 'NFKD')
+
+
+class Normalizer:
+    """
+    Normalisierung eines Worts: Unicode-Normalform -> Schreibweise -> strip
+    - fold(word): nur Normalform und Schreibweise (Schlüssel für Duplikate)
+    - normalize(word): zusätzlich Satzzeichen an den Rändern entfernen
+    Alle Stufen sind str-Methoden bzw. partials, map() ruft sie ohne
+    Python-Frame pro Wort auf.
+    """
+
+    __slots__ = ('punctuation', 'case', 'unicode_form', 'fold')
+
+    def __init__(self, punctuation: str = PUNCTUATION, case: str = 'lower',
+                 unicode_form: Optional[str] = None):
+        if case not in CASE_FUNCTIONS:
+            raise ValueError('Unbekannte Schreibweise: %s' % case)
+        if unicode_form is not None and unicode_form not in UNICODE_FORMS:
+            raise ValueError('Unbekannte Unicode-Normalform: %s' % unicode_form)
+        self.punctuation = punctuation
+        self.case = case
+        self.unicode_form = unicode_form
+        self.fold: Callable[[str], str] = self._build_fold()
+
+    def _build_fold(self) -> Callable[[str], str]:
+        case_function = CASE_FUNCTIONS[self.case]
+        if self.unicode_form is None:
+            return case_function
+        normalize_form = partial(unicodedata.normalize, self.unicode_form)
+
+        def fold(word: str) -> str:
+            return case_function(normalize_form(word))
+
+        return fold
+
+    def __repr__(self) -> str:
+        return 'Normalizer(punctuation=%r, case=%r, unicode_form=%r)' % (
+            self.punctuation, self.case, self.unicode_form)
+
+    def normalize(self, word: str) -> str:
+        """Ein Wort normalisieren (leerer String, wenn nur Satzzeichen)"""
+        return self.fold(word).strip(self.punctuation)
+
+    def normalize_words(self, words: Iterable[str]) -> Iterator[str]:
+        """
+        Normalisierte Wörter ohne leere Ergebnisse, lazy
+        """
+        return filter(None, map(str.strip, map(self.fold, words), repeat(self.punctuation)))
+
+    def unique_sorted(self, words: List[str]) -> List[str]:
+        """
+        Nach (Länge, fold) sortiert, pro fold-Schlüssel nur das erste Wort
+        Jeder Schlüssel wird einmal berechnet; die Position als dritter
+        Tupel-Eintrag hält die Sortierung stabil wie sorted(key=...)
+        """
+        unique_words = []
+        seen = set()
+        for _, key, position in sorted(zip(map(len, words), map(self.fold, words), count())):
+            if key not in seen:
+                seen.add(key)
+                unique_words.append(words[position])
+        return unique_words
+
+
+@lru_cache(maxsize=32)
+def get_normalizer(punctuation: str = PUNCTUATION, case: str = 'lower',
+                   unicode_form: Optional[str] = None) -> Normalizer:
+    """Eine Instanz pro Konfiguration, einmal aufgebaut"""
+    return Normalizer(punctuation, case, unicode_form)
+
+
+# Prozessweite Standard-Normalisierung, konfigurierbar über Umgebungsvariablen
+DEFAULT_NORMALIZER = get_normalizer(
+    os.environ.get('TEXT_ANALYZER_PUNCTUATION', PUNCTUATION),
+    os.environ.get('TEXT_ANALYZER_CASE', 'lower'),
+    os.environ.get('TEXT_ANALYZER_UNICODE_FORM') or None,
+)
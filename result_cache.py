@@ -0,0 +1,217 @@
+"""
+Result Cache - Inhaltsadressierter Cache für Endpoint-Ergebnisse
+Alle Analysefunktionen sind pure functions: gleiche Eingabe, gleiches Ergebnis.
+Deshalb kann die fertige JSON-Antwort unter einem Hash von
+(Endpoint, Text, Parameter) wiederverwendet werden.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+# Fliesst in jeden Schlüssel ein: erhöhen, wenn sich Antwortformat oder
+# Analyse-Ergebnisse ändern, damit die Festplatten-Stufe nach einem Deploy
+# keine veralteten Antworten mehr liefert (alte Dateien verdrängt das Aufräumen)
+CACHE_VERSION = '2'
+
+# Zusätzlicher Salt aus der Umgebung, z. B. Commit-Hash oder Release-Nummer
+CACHE_SALT = os.environ.get('TEXT_ANALYZER_CACHE_SALT', '')
+
+
+class ResultCache:
+    """
+    LRU-Cache für serialisierte Antworten, begrenzt durch Bytes statt Einträge
+    Optional mit Festplatten-Stufe, damit der Cache einen Neustart überlebt.
+    Auch die Festplatten-Stufe ist durch Bytes begrenzt (disk_max_bytes):
+    Lesen aktualisiert die Änderungszeit einer Datei, beim Überschreiten
+    werden die am längsten ungenutzten Dateien gelöscht (bis DISK_LOW_WATERMARK).
+    """
+
+    # Nach dem Aufräumen belegt die Festplatten-Stufe höchstens diesen Anteil
+    DISK_LOW_WATERMARK = 0.9
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, directory: Optional[str] = None,
+                 disk_max_bytes: int = 512 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.disk_max_bytes = disk_max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.disk_evictions = 0
+        self._entries: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._size = 0
+        self._disk_size = 0
+        self._lock = threading.Lock()
+        self._sweep_lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            # Bestand aus früheren Läufen erfassen (und ggf. gleich aufräumen)
+            self._sweep_disk()
+
+    @staticmethod
+    def make_key(endpoint: str, text: str, params: Dict[str, Any]) -> str:
+        """
+        Inhaltsadresse: SHA-256 über Cache-Version, Endpoint, Parameter und Text
+        Die Parameter werden kanonisch (sortierte Schlüssel) serialisiert
+        """
+        digest = hashlib.sha256()
+        version = CACHE_VERSION + ':' + CACHE_SALT
+        for part in (version, endpoint, json.dumps(params, sort_keys=True, default=str), text):
+            encoded = part.encode('utf-8', 'surrogatepass')
+            digest.update(len(encoded).to_bytes(8, 'big'))
+            digest.update(encoded)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Sucht zuerst im Speicher, dann auf der Festplatte
+        Treffer auf der Festplatte werden in den Speicher übernommen
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._store(key, value)
+        return value
+
+    def put(self, key: str, value: bytes) -> None:
+        """
+        Speichert eine Antwort und verdrängt die am längsten ungenutzten Einträge
+        """
+        with self._lock:
+            self._store(key, value)
+        self._write_disk(key, value)
+
+    def clear(self) -> None:
+        """Leert die Speicher-Stufe (die Festplatten-Stufe bleibt bestehen)"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Trefferzähler und Füllstand"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'disk_hits': self.disk_hits,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'disk_enabled': bool(self.directory),
+                'disk_bytes': self._disk_size,
+                'disk_max_bytes': self.disk_max_bytes,
+                'disk_evictions': self.disk_evictions
+            }
+
+    def _store(self, key: str, value: bytes) -> None:
+        # Aufrufer hält self._lock
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+        if len(value) > self.max_bytes:
+            return
+        self._entries[key] = value
+        self._size += len(value)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + '.json')
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        if not self.directory:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as handle:
+                value = handle.read()
+        except OSError:
+            return None
+        try:
+            # Änderungszeit als Zeitpunkt der letzten Nutzung (LRU beim Aufräumen)
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def _write_disk(self, key: str, value: bytes) -> None:
+        if not self.directory or len(value) > self.disk_max_bytes:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Atomar schreiben, damit parallele Worker keine halben Dateien lesen
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, 'wb') as handle:
+                handle.write(value)
+            os.replace(temp_path, path)
+        except OSError:
+            return
+        with self._lock:
+            # Schätzung (überschriebene Dateien zählen doppelt); _sweep_disk korrigiert
+            self._disk_size += len(value)
+            over_limit = self._disk_size > self.disk_max_bytes
+        if over_limit:
+            self._sweep_disk()
+
+    def _sweep_disk(self) -> None:
+        """
+        Misst die Festplatten-Stufe neu und löscht über dem Limit die ältesten
+        Dateien. Mehrere Prozesse können dasselbe Verzeichnis teilen: deshalb
+        wird das Verzeichnis gelesen statt einem Zähler pro Prozess vertraut.
+        """
+        if not self._sweep_lock.acquire(blocking=False):
+            return
+        try:
+            files = []
+            for entry in os.scandir(self.directory):
+                if not entry.is_dir():
+                    continue
+                for item in os.scandir(entry.path):
+                    if not item.name.endswith('.json'):
+                        continue
+                    try:
+                        info = item.stat()
+                    except OSError:
+                        continue
+                    files.append((info.st_mtime, info.st_size, item.path))
+            total = sum(size for _, size, _ in files)
+            evicted = 0
+            if total > self.disk_max_bytes:
+                target = self.disk_max_bytes * self.DISK_LOW_WATERMARK
+                for _, size, path in sorted(files):
+                    if total <= target:
+                        break
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        continue
+                    total -= size
+                    evicted += 1
+            with self._lock:
+                self._disk_size = total
+                self.disk_evictions += evicted
+        except OSError:
+            pass
+        finally:
+            self._sweep_lock.release()
@@ -0,0 +1,281 @@
+"""
+Sketches - Näherungsweise Häufigkeiten mit beschränktem Speicher
+Für sehr grosse Korpora, deren exaktes Vokabular nicht in den Speicher passt:
+- Space-Saving: Kandidaten für die Top-K mit garantierter Überschätzung <= N/k
+- Count-Min Sketch: zweite, unabhängige Obergrenze pro Wort (<= eps*N mit Wahrscheinlichkeit 1-delta)
+- HyperLogLog: Anzahl verschiedener Wörter, Standardfehler 1.04/sqrt(m)
+Der Speicherbedarf hängt nur vom Fehlerparameter ab, nicht von der Eingabe.
+"""
+
+import hashlib
+import heapq
+import math
+import os
+from array import array
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Tuple
+
+from analysis_engine import (DEFAULT_CHUNK_SIZE, TextStatistics, iter_text_chunks,
+                             iter_word_batches, stream_statistics)
+from normalizer import DEFAULT_NORMALIZER
+
+
+# Standard-Fehlerparameter: Überschätzung höchstens 0.1% aller Wörter
+DEFAULT_ERROR = 0.001
+
+# Kleinster zulässiger Fehlerparameter: der Speicher wächst mit 1/error
+# (1e-5: rund 11 MB Count-Min-Zähler und 100'000 Top-K-Zähler)
+MIN_ERROR = float(os.environ.get('TEXT_ANALYZER_MIN_APPROXIMATION_ERROR', 1e-5))
+
+# Wahrscheinlichkeit, mit der die Count-Min-Schranke gilt
+DEFAULT_CONFIDENCE = 0.99
+
+# Grenzen der HyperLogLog-Präzision (2^p Register zu je einem Byte)
+HLL_MIN_PRECISION = 4
+HLL_MAX_PRECISION = 16
+
+_MASK_64 = (1 << 64) - 1
+
+
+def word_hash(word: str) -> Tuple[int, int]:
+    """
+    Zwei unabhängige 64-Bit-Hashes aus einem blake2b-Digest
+    Stabil über Prozesse und Läufe (anders als hash() mit Hash-Seed)
+    """
+    digest = hashlib.blake2b(word.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+
+class SpaceSaving:
+    """
+    Space-Saving (Metwally et al.) mit gewichteten Updates
+    Hält höchstens `capacity` Zähler. Jeder gemeldete Zähler überschätzt die
+    wahre Häufigkeit um höchstens `error` <= N/capacity; jedes Wort mit
+    Häufigkeit > N/capacity ist garantiert enthalten.
+    """
+
+    __slots__ = ('capacity', 'counters', '_heap')
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counters: Dict[str, List[int]] = {}
+        self._heap: List[Tuple[int, str]] = []
+
+    def offer(self, word: str, weight: int = 1) -> None:
+        counter = self.counters.get(word)
+        if counter is not None:
+            counter[0] += weight
+            heapq.heappush(self._heap, (counter[0], word))
+        elif len(self.counters) < self.capacity:
+            self.counters[word] = [weight, 0]
+            heapq.heappush(self._heap, (weight, word))
+        else:
+            minimum, evicted = self._pop_minimum()
+            del self.counters[evicted]
+            self.counters[word] = [minimum + weight, minimum]
+            heapq.heappush(self._heap, (minimum + weight, word))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(counter[0], key) for key, counter in self.counters.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_minimum(self) -> Tuple[int, str]:
+        # Lazy Heap: veraltete Einträge (Zähler inzwischen grösser) überspringen
+        while True:
+            count, word = heapq.heappop(self._heap)
+            counter = self.counters.get(word)
+            if counter is not None and counter[0] == count:
+                return count, word
+
+    def top(self, top_n: int) -> List[Tuple[str, int, int]]:
+        """(Wort, Zähler, maximale Überschätzung), absteigend nach Zähler"""
+        ranked = heapq.nlargest(top_n, self.counters.items(), key=lambda item: item[1][0])
+        return [(word, count, error) for word, (count, error) in ranked]
+
+
+class CountMinSketch:
+    """
+    Count-Min Sketch: width = ceil(e/eps), depth = ceil(ln(1/delta))
+    Schätzung >= wahre Häufigkeit, Überschätzung <= eps*N mit Wahrscheinlichkeit 1-delta
+    """
+
+    __slots__ = ('width', 'depth', 'rows')
+
+    def __init__(self, error: float, confidence: float):
+        self.width = math.ceil(math.e / error)
+        self.depth = math.ceil(math.log(1.0 / (1.0 - confidence)))
+        self.rows = [array('Q', bytes(8 * self.width)) for _ in range(self.depth)]
+
+    def _columns(self, hashes: Tuple[int, int]) -> Iterable[int]:
+        first, second = hashes
+        width = self.width
+        # Kirsch-Mitzenmacher: depth Hashfunktionen aus zwei Hashes
+        return ((first + i * second) % width for i in range(self.depth))
+
+    def add(self, hashes: Tuple[int, int], weight: int = 1) -> None:
+        for row, column in zip(self.rows, self._columns(hashes)):
+            row[column] += weight
+
+    def estimate(self, hashes: Tuple[int, int]) -> int:
+        return min(row[column] for row, column in zip(self.rows, self._columns(hashes)))
+
+
+class HyperLogLog:
+    """
+    HyperLogLog mit 2^precision Registern und Korrektur für kleine Mengen
+    """
+
+    __slots__ = ('precision', 'registers')
+
+    def __init__(self, precision: int):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    @classmethod
+    def for_error(cls, error: float) -> 'HyperLogLog':
+        """Präzision so, dass 1.04/sqrt(m) <= error (begrenzt auf 4..16)"""
+        precision = math.ceil(math.log2((1.04 / error) ** 2))
+        return cls(min(HLL_MAX_PRECISION, max(HLL_MIN_PRECISION, precision)))
+
+    def add(self, hashed: int) -> None:
+        index = hashed >> (64 - self.precision)
+        remaining = (hashed << self.precision) & _MASK_64
+        rank = 64 - self.precision + 1 if not remaining else 65 - remaining.bit_length()
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    @property
+    def standard_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m) if m >= 128 else {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        raw = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return round(m * math.log(m / zeros))
+        return round(raw)
+
+
+class ApproximateFrequencies:
+    """
+    Näherungsweise Wortfrequenzen für beliebig grosse Eingaben
+    Wörter werden blockweise exakt vorgezählt (Counter, in C) und pro
+    verschiedenem Wort eines Blocks einmal gehasht und in die Sketches
+    übernommen - der Aufwand in Python wächst mit dem Vokabular pro Block.
+    """
+
+    def __init__(self, error: float = DEFAULT_ERROR, confidence: float = DEFAULT_CONFIDENCE):
+        if not MIN_ERROR <= error < 1 or not 0 < confidence < 1:
+            raise ValueError('error muss zwischen %g und 1 liegen, confidence zwischen 0 und 1'
+                             % MIN_ERROR)
+        self.error = error
+        self.confidence = confidence
+        self.total = 0
+        self.space_saving = SpaceSaving(math.ceil(1.0 / error))
+        self.count_min = CountMinSketch(error, confidence)
+        self.distinct = HyperLogLog.for_error(error)
+
+    def update(self, words: Iterable[str]) -> None:
+        """Zählt einen Block Wörter (Rohform, wird wie bei count_frequencies normalisiert)"""
+        batch = Counter(DEFAULT_NORMALIZER.normalize_words(words))
+        self.total += sum(batch.values())
+        for word, count in batch.items():
+            hashed = word_hash(word)
+            self.distinct.add(hashed[0])
+            self.count_min.add(hashed, count)
+            self.space_saving.offer(word, count)
+
+    def top_words(self, top_n: int = 5) -> List[Dict[str, Any]]:
+        """
+        Top N mit Fehlerschranken
+        count: obere Schranke (Minimum aus Space-Saving und Count-Min)
+        error: maximale Überschätzung, die wahre Häufigkeit liegt in [count - error, count]
+        (untere Grenze aus Space-Saving, gilt deterministisch)
+        """
+        ranked = []
+        for word, count, error in self.space_saving.top(max(top_n, 0)):
+            estimate = min(count, self.count_min.estimate(word_hash(word)))
+            ranked.append({
+                'word': word,
+                'count': estimate,
+                'error': estimate - (count - error)
+            })
+        ranked.sort(key=lambda entry: entry['count'], reverse=True)
+        return ranked
+
+    def report(self, top_n: int = 5) -> Dict[str, Any]:
+        """Top-Wörter, Anzahl verschiedener Wörter und die Fehlerschranken"""
+        return {
+            'approximate': True,
+            'total_words': self.total,
+            'top_words': self.top_words(top_n),
+            'distinct_words': {
+                'estimate': self.distinct.estimate(),
+                'relative_standard_error': round(self.distinct.standard_error, 6)
+            },
+            'error_bounds': {
+                'epsilon': self.error,
+                'confidence': self.confidence,
+                'max_overcount': math.floor(self.error * self.total),
+                'guaranteed_above': math.floor(self.total / self.space_saving.capacity)
+            },
+            'memory': {
+                'top_k_counters': self.space_saving.capacity,
+                'count_min_cells': self.count_min.width * self.count_min.depth,
+                'hyperloglog_registers': len(self.distinct.registers)
+            }
+        }
+
+
+class ApproximateStatistics(TextStatistics):
+    """
+    TextStatistics, deren Frequenz-Tabelle durch Sketches ersetzt ist
+    Alle übrigen Kennzahlen bleiben exakt
+    """
+
+    def __init__(self, min_length: int = 5, error: float = DEFAULT_ERROR,
+                 confidence: float = DEFAULT_CONFIDENCE):
+        super().__init__(min_length)
+        self.sketch = ApproximateFrequencies(error, confidence)
+
+    def _count_words(self, words: List[str]) -> None:
+        self.sketch.update(words)
+
+
+def approximate_statistics(source: Any, min_length: int = 5, error: float = DEFAULT_ERROR,
+                           chunk_size: int = DEFAULT_CHUNK_SIZE) -> ApproximateStatistics:
+    """
+    Wie stream_statistics, aber mit Sketches statt exakter Frequenz-Tabelle
+    source: String, Datei-Objekt oder Iterable von Chunks
+    """
+    return stream_statistics(source, min_length, chunk_size,
+                             statistics=ApproximateStatistics(min_length, error))
+
+
+def approximate_result(source: Any, top_n: int = 5, min_length: int = 5,
+                       error: float = DEFAULT_ERROR) -> Dict[str, Any]:
+    """
+    Ergebnis im Format von /analyze; word_frequencies näherungsweise,
+    dazu word_frequencies_error und die Schranken unter approximation
+    """
+    statistics = approximate_statistics(source, min_length, error)
+    report = statistics.sketch.report(top_n)
+    top_words = report.pop('top_words')
+    return {
+        'analysis': statistics.analysis(),
+        'word_frequencies': {entry['word']: entry['count'] for entry in top_words},
+        'word_frequencies_error': {entry['word']: entry['error'] for entry in top_words},
+        'total_word_length': statistics.total_length,
+        'long_words_count': statistics.long_words_length,
+        'approximation': report
+    }
+
+
+def approximate_top_words(source: Any, top_n: int = 5,
+                          error: float = DEFAULT_ERROR) -> List[Tuple[str, int]]:
+    """Top N als (Wort, Häufigkeit) wie get_top_words, Häufigkeit als obere Schranke"""
+    sketch = ApproximateFrequencies(error)
+    for words in iter_word_batches(iter_text_chunks(source)):
+        sketch.update(words)
+    return [(entry['word'], entry['count']) for entry in sketch.top_words(top_n)]
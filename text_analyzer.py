@@ -3,8 +3,37 @@ Text Analyzer - Funktionale Textverarbeitungs-Logik
 Implementiert alle funktionalen Programmierkonzepte für Modul 323
 """
 
+from collections import Counter
 from functools import reduce
-from typing import Dict, List, Callable
+from typing import Any, Dict, List, Callable, Union
+
+from analysis_engine import SharedText, compute_statistics, stream_statistics, count_frequencies, top_items
+from functional_utils import (
+    WordStream,
+    apply_transformation,
+    instrument_functions,
+    lazy,
+    memoize
+)
+from length_backend import (
+    USE_NUMPY,
+    count_at_least,
+    length_array,
+    longest_position,
+    mean_length,
+    positions_in_range,
+    select_words,
+    shortest_position,
+    sum_lengths
+)
+from normalizer import DEFAULT_NORMALIZER
+from sketches import DEFAULT_ERROR, approximate_top_words
+from token_index import TokenIndex
+
+
+# Cache-Grenzen für die memoisierten Analysefunktionen
+MEMOIZE_MAX_BYTES = 16 * 1024 * 1024
+MEMOIZE_TTL = 600.0
 
 
 # ============================================================================
@@ -53,6 +82,8 @@ def average_word_length(text: str) -> float:
     words = text.split()
     if not words:
         return 0.0
+    if USE_NUMPY:
+        return mean_length(length_array(words))
     total_length = sum(len(word) for word in words)
     return total_length / len(words)
 
@@ -94,21 +125,16 @@ def transform_text(text: str, func: Callable[[str], str]) -> str:
 # B1G, B1F, B1E: Algorithmen - Zerlegung in funktionale Teilstücke
 # ============================================================================
 
+@memoize(max_bytes=MEMOIZE_MAX_BYTES, ttl=MEMOIZE_TTL)
 def analyze_text(text: str) -> Dict:
     """
     Haupt-Algorithmus für Textanalyse
-    Zerlegt in funktionale Teilstücke (B1F, B1E)
-    Jede Berechnung ist eine separate pure function
+    Zerlegt in funktionale Teilstücke (B1F, B1E): count_words, count_sentences,
+    average_word_length, find_longest_word, ... beschreiben je eine Kennzahl.
+    Berechnet werden alle gemeinsam von der Single-Pass-Engine
+    (analysis_engine), damit der Text nur einmal zerlegt wird.
     """
-    return {
-        'word_count': count_words(text),
-        'character_count': count_characters(text),
-        'character_count_no_spaces': count_characters_no_spaces(text),
-        'sentence_count': count_sentences(text),
-        'average_word_length': round(average_word_length(text), 2),
-        'longest_word': find_longest_word(text),
-        'shortest_word': find_shortest_word(text)
-    }
+    return compute_statistics(text).analysis()
 
 
 def find_longest_word(text: str) -> str:
@@ -118,6 +144,8 @@ def find_longest_word(text: str) -> str:
     words = text.split()
     if not words:
         return ""
+    if USE_NUMPY:
+        return words[longest_position(length_array(words))]
     return max(words, key=len)
 
 
@@ -128,6 +156,8 @@ def find_shortest_word(text: str) -> str:
     words = text.split()
     if not words:
         return ""
+    if USE_NUMPY:
+        return words[shortest_position(length_array(words))]
     return min(words, key=len)
 
 
@@ -140,38 +170,52 @@ def transform_words_map(text: str, transformation: Callable[[str], str]) -> List
     B4G: Map einzeln anwenden
     Transformiert jedes Wort mit einer Funktion
     """
-    words = text.split()
-    return list(map(transformation, words))
+    return WordStream(text).map(transformation).to_list()
 
 
-def filter_words_by_length(text: str, min_length: int) -> List[str]:
+def filter_words_by_length(text: Union[str, TokenIndex], min_length: int) -> List[str]:
     """
     B4G: Filter einzeln anwenden
     Filtert Wörter nach Mindestlänge
+    Lazy: es wird keine Liste aller Wörter gebaut, nur die Treffer
+    Mit TokenIndex: Filter auf dem Längen-Array ohne erneute Zerlegung
+    Mit NumPy: eine Längenmaske statt eines Lambda-Aufrufs pro Wort
     """
-    words = text.split()
-    return list(filter(lambda w: len(w) >= min_length, words))
+    if isinstance(text, TokenIndex):
+        return text.filter_by_length(min_length)
+    if USE_NUMPY:
+        words = text.split()
+        return select_words(words, positions_in_range(length_array(words), min_length))
+    return WordStream(text).filter(lambda w: len(w) >= min_length).to_list()
 
 
 def calculate_total_word_length_reduce(text: str) -> int:
     """
     B4G: Reduce einzeln anwenden
     Berechnet Gesamtlänge aller Wörter
+    Mit NumPy genügt eine vektorisierte Summe
     """
     words = text.split()
     if not words:
         return 0
+    if USE_NUMPY:
+        return sum_lengths(length_array(words))
     return reduce(lambda acc, w: acc + len(w), words, 0)
 
 
-def count_long_words_combined(text: str, min_length: int) -> int:
+def count_long_words_combined(text: Union[str, TokenIndex], min_length: int) -> int:
     """
     B4F: Map, Filter und Reduce kombiniert
     Zählt Wörter mit Mindestlänge und summiert deren Längen
+    Mit TokenIndex: Summe direkt über das Längen-Array
     """
+    if isinstance(text, TokenIndex):
+        return text.total_length(min_length)
     words = text.split()
     if not words:
         return 0
+    if USE_NUMPY:
+        return sum_lengths(length_array(words), min_length)
     
     # Kombiniert: Filter -> Map -> Reduce
     long_words = filter(lambda w: len(w) >= min_length, words)
@@ -180,40 +224,69 @@ def count_long_words_combined(text: str, min_length: int) -> int:
     return total_length
 
 
+@memoize(max_bytes=MEMOIZE_MAX_BYTES, ttl=MEMOIZE_TTL)
 def analyze_word_frequencies(text: str) -> Dict[str, int]:
     """
     B4E: Komplexe Datenverarbeitung mit Map, Filter, Reduce
     Erstellt Wörterbuch mit Wortfrequenzen
     """
-    words = text.lower().split()
+    return dict(_word_frequencies(text))
+
+
+def _word_frequencies(text: str) -> Counter:
+    """Frequenz-Tabelle als Counter (für get_top_words ohne Kopie)"""
+    words = text.split()
     if not words:
-        return {}
+        return Counter()
     
-    # Normalisiere Wörter (entferne Satzzeichen)
-    normalized = map(lambda w: w.strip('.,!?;:()[]{}"\''), words)
-    # Filtere leere Strings
-    valid_words = filter(lambda w: len(w) > 0, normalized)
-    
-    # Reduziere zu Frequenz-Dictionary
-    def update_freq(acc: Dict, word: str) -> Dict:
-        acc[word] = acc.get(word, 0) + 1
-        return acc
-    
-    return reduce(update_freq, valid_words, {})
+    # Normalisiere Wörter (Kleinschreibung, Satzzeichen entfernen), filtere
+    # leere Strings und zähle mit Counter in C statt per Lambda und reduce
+    return count_frequencies(words)
 
 
-def get_top_words(text: str, top_n: int = 5) -> List[tuple]:
+def get_top_words(text: str, top_n: int = 5, approximate: bool = False,
+                  error: float = DEFAULT_ERROR) -> List[tuple]:
     """
     B4E: Komplexe Transformation - Top N häufigste Wörter
     Verwendet Map, Filter, Reduce für komplette Pipeline
+    approximate=True: Sketches mit beschränktem Speicher statt exakter Zählung,
+    Häufigkeiten sind obere Schranken (siehe sketches.approximate_result)
     """
-    frequencies = analyze_word_frequencies(text)
+    if approximate:
+        return approximate_top_words(text, top_n, error)
+    frequencies = _word_frequencies(text)
     if not frequencies:
         return []
     
-    # Sortiere nach Häufigkeit (Reduce für Sortierung)
-    sorted_items = sorted(frequencies.items(), key=lambda x: x[1], reverse=True)
-    return sorted_items[:top_n]
+    # Partielle Auswahl per Heap statt das ganze Vokabular zu sortieren
+    return top_items(frequencies, top_n)
+
+
+# ============================================================================
+# Streaming-Varianten für Eingaben grösser als der Arbeitsspeicher
+# ============================================================================
+
+def analyze_text_stream(source: Any) -> Dict:
+    """
+    Wie analyze_text, aber für ein Iterable von Chunks (str oder bytes)
+    oder ein Datei-Objekt. Wörter über Chunk-Grenzen werden korrekt erkannt.
+    """
+    return stream_statistics(source).analysis()
+
+
+def analyze_word_frequencies_stream(source: Any) -> Dict[str, int]:
+    """
+    Wie analyze_word_frequencies, aber chunkweise
+    Speicherbedarf ist durch die Grösse des Vokabulars begrenzt
+    """
+    return dict(stream_statistics(source).frequencies)
+
+
+def get_top_words_stream(source: Any, top_n: int = 5) -> List[tuple]:
+    """
+    Wie get_top_words, aber chunkweise
+    """
+    return stream_statistics(source).top_words(top_n)
 
 
 # ============================================================================
@@ -232,21 +305,31 @@ def get_simple_lambda_transformations() -> Dict[str, Callable]:
     }
 
 
-def filter_words_with_lambda(text: str, min_length: int, max_length: int) -> List[str]:
+def filter_words_with_lambda(text: Union[str, TokenIndex], min_length: int, max_length: int) -> List[str]:
     """
     B3F: Lambda mit mehreren Argumenten (via functools.partial oder Closure)
     Filtert Wörter nach Längenbereich
     """
-    words = text.split()
+    if isinstance(text, TokenIndex):
+        return text.filter_by_length(min_length, max_length)
+    if USE_NUMPY:
+        words = text.split()
+        return select_words(words, positions_in_range(length_array(words), min_length, max_length))
     # Lambda verwendet min_length und max_length aus Closure
-    return list(filter(lambda w: min_length <= len(w) <= max_length, words))
+    # Lazy: es wird keine Liste aller Wörter gebaut, nur die Treffer
+    return WordStream(text).filter(lambda w: min_length <= len(w) <= max_length).to_list()
 
 
-def sort_words_by_criteria(text: str, criteria: str = 'length') -> List[str]:
+@memoize(max_bytes=MEMOIZE_MAX_BYTES, ttl=MEMOIZE_TTL)
+def sort_words_by_criteria(text: Union[str, TokenIndex], criteria: str = 'length') -> List[str]:
     """
     B3E: Lambda für Programmfluss-Steuerung (Sortierung)
     Sortiert Wörter nach verschiedenen Kriterien
+    Mit TokenIndex: Sortierung über Integer-Ränge des Vokabulars
     """
+    if isinstance(text, TokenIndex):
+        return _sort_token_index(text, criteria)
+    
     words = text.split()
     if not words:
         return []
@@ -264,26 +347,87 @@ def sort_words_by_criteria(text: str, criteria: str = 'length') -> List[str]:
         return words
 
 
-def remove_duplicates_sorted(text: str) -> List[str]:
+def _sort_token_index(index: TokenIndex, criteria: str) -> List[str]:
+    if criteria == 'length':
+        return index.sorted_by_length()
+    elif criteria == 'length_desc':
+        return index.sorted_by_length_desc()
+    elif criteria == 'alphabetical':
+        return index.sorted_alphabetically()
+    else:
+        return index.words()
+
+
+@memoize(max_bytes=MEMOIZE_MAX_BYTES, ttl=MEMOIZE_TTL)
+def remove_duplicates_sorted(text: Union[str, TokenIndex]) -> List[str]:
     """
     B3E: Lambda für komplexe Sortierung und Deduplizierung
+    Mit TokenIndex: sortiert wird nur das Vokabular statt aller Tokens
     """
+    if isinstance(text, TokenIndex):
+        return text.unique_sorted()
+    
     words = text.split()
     if not words:
         return []
     
     # Sortiere nach Länge und alphabetisch, dann entferne Duplikate
-    unique_words = []
-    seen = set()
-    sorted_words = sorted(words, key=lambda w: (len(w), w.lower()))
+    # Der Vergleichsschlüssel (Kleinschreibung) wird pro Wort nur einmal gebildet
+    return DEFAULT_NORMALIZER.unique_sorted(words)
+
+
+# ============================================================================
+# Ergebnisse von /transform und /filter (Web-Interface und Kommandozeile)
+# ============================================================================
+
+def build_transform_result(text: str, transform_func, transformation_type: str,
+                           shared: SharedText = None) -> dict:
+    """
+    Ergebnis von /transform für einen Text (auch für /transform/batch und /analyze/all)
+    Felder sind Lazy-Werte, ausgewertet von FieldSelection.project
+    shared: gemeinsame Zerlegung, deren Wortliste wiederverwendet wird
+    """
+    # Zusätzliche Transformationen mit Map
+    if shared is None:
+        transformed_words = lazy(lambda: transform_words_map(text, transform_func))
+    else:
+        transformed_words = lazy(lambda: list(map(transform_func, shared.words())))
     
-    for word in sorted_words:
-        word_lower = word.lower()
-        if word_lower not in seen:
-            seen.add(word_lower)
-            unique_words.append(word)
+    return {
+        'success': True,
+        'original': text,
+        # B2F: Funktion als Argument verwenden
+        'transformed': lazy(lambda: apply_transformation(text, transform_func)),
+        'transformed_words': transformed_words,
+        'transformation_type': transformation_type
+    }
+
+
+def build_filter_result(text: str, min_length: int, max_length: int,
+                        remove_duplicates: bool, shared: SharedText = None) -> dict:
+    """
+    Ergebnis von /filter für einen Text (auch für /filter/batch und /analyze/all)
+    Felder sind Lazy-Werte, nur die ausgewählten Listen werden berechnet
+    """
+    # Token-Tabelle einmal pro Text (erst bei Bedarf), alle Funktionen arbeiten darauf
+    shared = shared or SharedText(text)
+    index = shared.index
     
-    return unique_words
+    return {
+        'success': True,
+        'original': text,
+        # B4G: Filter einzeln anwenden
+        'filtered_by_min_length': lazy(lambda: filter_words_by_length(index(), min_length)),
+        # B3F: Lambda mit mehreren Argumenten (via Closure)
+        'filtered_by_range': lazy(lambda: filter_words_with_lambda(index(), min_length, max_length)),
+        # B3E: Lambda für Sortierung
+        'sorted_by_length': lazy(lambda: sort_words_by_criteria(index(), criteria='length')),
+        # Entferne Duplikate wenn gewünscht
+        # B3E: Lambda für komplexe Sortierung und Deduplizierung
+        'unique_words': lazy(lambda: remove_duplicates_sorted(index()) if remove_duplicates else None),
+        # B4F: Kombinierte Map, Filter, Reduce
+        'long_words_total_length': lazy(lambda: count_long_words_combined(index(), min_length))
+    }
 
 
 # ============================================================================
@@ -338,6 +482,9 @@ def count_long_words_functional(text: str, min_length: int) -> int:
     - Bessere Testbarkeit (pure function)
     """
     words = text.split()
+    if USE_NUMPY:
+        # Gleiche Semantik, Filter und Zählung als eine Vektor-Operation
+        return count_at_least(length_array(words), min_length)
     return reduce(
         lambda acc, w: acc + 1,
         filter(lambda w: len(w) >= min_length, words),
@@ -486,3 +633,7 @@ class TextProcessor:
             'average': sum(len(w) for w in self.words) / len(self.words) if self.words else 0,
             'long_words': [w for w in self.words if len(w) >= min_length]
         }
+
+
+# Laufzeit-Histogramme für alle öffentlichen Funktionen (siehe /metrics)
+instrument_functions(globals())
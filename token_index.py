@@ -0,0 +1,178 @@
+"""
+Token Index - Kompakte, einmal pro Request aufgebaute Token-Tabelle
+Speichert Offsets und Längen aller Wörter in array('I')-Puffern und
+jedes verschiedene Wort nur einmal im Vokabular. Längenfilter und
+Sortierungen arbeiten auf Integer-Arrays statt auf Listen von Strings.
+Für Längenbereiche und Längensortierung gibt es zusätzlich einen
+Bucket-Index (Counting-Sort-Prinzip): pro Wortlänge die Positionen.
+"""
+
+import hashlib
+import heapq
+import math
+import operator
+import re
+from array import array
+from collections import Counter
+from itertools import chain
+from typing import Iterator, List, Optional
+
+from functional_utils import WORD_PATTERN
+from length_backend import USE_NUMPY, as_lengths, positions_in_range, sum_lengths
+from normalizer import DEFAULT_NORMALIZER
+
+
+class TokenIndex:
+    """
+    Token-Tabelle eines Texts
+    - starts/ends/lengths: Offsets und Länge jedes Tokens (array('I'))
+    - token_ids: Index jedes Tokens ins Vokabular (array('I'))
+    - vocabulary: jedes verschiedene Wort einmal, in Reihenfolge des ersten Vorkommens
+    Tokens entsprechen exakt text.split().
+    """
+
+    __slots__ = ('text', 'vocabulary', 'token_ids', 'lengths', 'starts', 'ends',
+                 '_cache_key', '_length_buckets')
+
+    def __init__(self, text: str, words: Optional[List[str]] = None):
+        # words: bereits vorhandenes text.split() (z.B. aus SharedText), spart die Zerlegung
+        if words is None:
+            words = text.split()
+        self.text = text
+        self.vocabulary: List[str] = list(dict.fromkeys(words))
+        vocabulary_ids = {word: i for i, word in enumerate(self.vocabulary)}
+        self.token_ids = array('I', map(vocabulary_ids.__getitem__, words))
+        self.lengths = array('I', map(len, words))
+        self.starts = array('I', map(re.Match.start, WORD_PATTERN.finditer(text)))
+        self.ends = array('I', map(operator.add, self.starts, self.lengths))
+        self._cache_key: Optional[str] = None
+        self._length_buckets: Optional[List[array]] = None
+
+    def __len__(self) -> int:
+        return len(self.token_ids)
+
+    def cache_key(self) -> str:
+        """Stabiler Schlüssel für memoize: Digest des Texts"""
+        if self._cache_key is None:
+            digest = hashlib.blake2b(self.text.encode('utf-8', 'surrogatepass'), digest_size=16)
+            self._cache_key = 'TokenIndex:' + digest.hexdigest()
+        return self._cache_key
+
+    # ------------------------------------------------------------------------
+    # Zugriff auf Wörter
+    # ------------------------------------------------------------------------
+
+    def words(self) -> List[str]:
+        """Alle Tokens in Textreihenfolge (wie text.split())"""
+        return self._lookup(self.token_ids)
+
+    def _lookup(self, token_ids) -> List[str]:
+        return list(map(self.vocabulary.__getitem__, token_ids))
+
+    def _positions_to_words(self, positions) -> List[str]:
+        return self._lookup(map(self.token_ids.__getitem__, positions))
+
+    # ------------------------------------------------------------------------
+    # Längenoperationen auf Integer-Arrays
+    # ------------------------------------------------------------------------
+
+    def length_buckets(self) -> List[array]:
+        """
+        Bucket-Index: buckets[n] enthält die Positionen aller Tokens der
+        Länge n in Textreihenfolge. Wird beim ersten Gebrauch einmal in O(n)
+        aufgebaut und danach für alle Längenabfragen wiederverwendet.
+        """
+        if self._length_buckets is None:
+            max_length = max(self.lengths, default=0)
+            buckets = [array('I') for _ in range(max_length + 1)]
+            appenders = [bucket.append for bucket in buckets]
+            for position, length in enumerate(self.lengths):
+                appenders[length](position)
+            self._length_buckets = buckets
+        return self._length_buckets
+
+    def filter_by_length(self, min_length: int, max_length: Optional[int] = None) -> List[str]:
+        """
+        Tokens mit min_length <= Länge (<= max_length), in Textreihenfolge
+        Berührt nur die Buckets im Bereich; deren Positionslisten sind
+        sortiert und werden per k-Wege-Merge in Textreihenfolge gebracht.
+        Mit NumPy: eine Bereichsmaske direkt über dem Längen-Puffer
+        """
+        if USE_NUMPY:
+            return self._positions_to_words(
+                positions_in_range(as_lengths(self.lengths), min_length, max_length)
+            )
+        buckets = self.length_buckets()
+        # Grenzen aus JSON können Zahlen mit Nachkommastellen sein: ganzzahlige Bucket-Grenzen
+        low = max(math.ceil(min_length), 0)
+        high = len(buckets) - 1 if max_length is None else min(math.floor(max_length), len(buckets) - 1)
+        selected = [bucket for bucket in buckets[low:high + 1] if bucket]
+        if not selected:
+            return []
+        positions = selected[0] if len(selected) == 1 else heapq.merge(*selected)
+        return self._positions_to_words(positions)
+
+    def total_length(self, min_length: int = 0) -> int:
+        """Summe der Längen aller Tokens mit Mindestlänge"""
+        return sum_lengths(as_lengths(self.lengths), min_length)
+
+    def sorted_by_length(self) -> List[str]:
+        """
+        Wie sorted(words, key=lambda w: (len(w), w)) in O(n + L)
+        Buckets aufsteigend; innerhalb eines Buckets werden nur die
+        verschiedenen Wörter sortiert und jeweils so oft ausgegeben,
+        wie sie vorkommen
+        """
+        vocabulary = self.vocabulary
+        result: List[str] = []
+        for bucket in self.length_buckets():
+            if not bucket:
+                continue
+            counts = Counter(map(self.token_ids.__getitem__, bucket))
+            for word_id in sorted(counts, key=vocabulary.__getitem__):
+                result.extend([vocabulary[word_id]] * counts[word_id])
+        return result
+
+    def sorted_by_length_desc(self) -> List[str]:
+        """
+        Wie sorted(words, key=len, reverse=True) in O(n + L)
+        Buckets absteigend, innerhalb eines Buckets Textreihenfolge (stabil)
+        """
+        return self._positions_to_words(chain.from_iterable(reversed(self.length_buckets())))
+
+    def sorted_alphabetically(self) -> List[str]:
+        """
+        Wie sorted(words, key=lambda w: w.lower())
+        """
+        rank = self._vocabulary_rank(str.lower)
+        return self._lookup(sorted(self.token_ids, key=rank.__getitem__))
+
+    def unique_sorted(self) -> List[str]:
+        """
+        Wie remove_duplicates_sorted: nach (Länge, Kleinschreibung) sortiert,
+        pro Kleinschreibung nur das erste Wort. Das Vokabular ist bereits in
+        Reihenfolge des ersten Vorkommens, eine stabile Sortierung darüber
+        ergibt dieselbe Auswahl wie über alle Tokens.
+        """
+        return DEFAULT_NORMALIZER.unique_sorted(self.vocabulary)
+
+    def _vocabulary_rank(self, key) -> array:
+        """
+        Dichter Rang jedes Vokabular-Eintrags nach key
+        Gleiche Schlüssel erhalten denselben Rang, damit die Token-Sortierung
+        bei Gleichstand die Textreihenfolge behält
+        """
+        rank = array('I', [0]) * len(self.vocabulary)
+        previous = None
+        current = -1
+        for word_id in sorted(range(len(self.vocabulary)), key=lambda i: key(self.vocabulary[i])):
+            word_key = key(self.vocabulary[word_id])
+            if current < 0 or word_key != previous:
+                current += 1
+                previous = word_key
+            rank[word_id] = current
+        return rank
+
+    def iter_spans(self) -> Iterator[tuple]:
+        """(start, end) aller Tokens"""
+        return zip(self.starts, self.ends)